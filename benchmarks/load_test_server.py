@@ -0,0 +1,103 @@
+"""
+Load test for the quiz server (main.py serve).
+
+Start a server, then run from the project root:
+
+    poetry run python benchmarks/load_test_server.py --clients 1000
+
+Every client is a bot learner on its own connection that plays whole quizzes,
+answering at random until each round is cleared. Reports sessions and answers
+per second and request latency percentiles.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from typing import List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import SERVER_HOST, SERVER_PORT
+
+
+async def connect(args: argparse.Namespace):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix)
+    return await asyncio.open_connection(args.host, args.port)
+
+
+async def run_client(
+    args: argparse.Namespace, seed: int, latencies: List[float]
+) -> int:
+    """Play args.quizzes quizzes on one connection and return the answers sent."""
+    rng = random.Random(seed)
+    reader, writer = await connect(args)
+
+    async def request(message: dict) -> dict:
+        start = time.perf_counter()
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if not response["ok"]:
+            raise RuntimeError(response["error"])
+        return response
+
+    answers = 0
+    for _ in range(args.quizzes):
+        start = {
+            "op": "start",
+            "questions": args.questions,
+            "difficulty": args.difficulty,
+        }
+        question = (await request(start))["question"]
+        while question is not None:
+            choice = rng.randrange(len(question["options"]))
+            question = (await request({"op": "answer", "choice": choice}))["question"]
+            answers += 1
+    writer.write(b'{"op": "quit"}\n')
+    writer.close()
+    await writer.wait_closed()
+    return answers
+
+
+async def run(args: argparse.Namespace) -> None:
+    latencies: List[float] = []
+    start = time.perf_counter()
+    answers = await asyncio.gather(
+        *(run_client(args, seed, latencies) for seed in range(args.clients))
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    sessions = args.clients * args.quizzes
+    print(f"{args.clients} clients, {sessions} quizzes in {elapsed:.2f}s")
+    print(
+        f"  {sessions / elapsed:,.0f} quizzes/s, {sum(answers) / elapsed:,.0f} answers/s"
+    )
+    for pct in (50, 90, 99):
+        latency = latencies[min(len(latencies) * pct // 100, len(latencies) - 1)]
+        print(f"  p{pct} latency: {latency * 1000:.2f} ms")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the quiz server")
+    parser.add_argument("--host", default=SERVER_HOST, help="Server address")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="TCP port")
+    parser.add_argument("--unix", metavar="PATH", help="Connect to a Unix socket")
+    parser.add_argument(
+        "--clients", type=int, default=100, help="Concurrent learner connections"
+    )
+    parser.add_argument(
+        "--quizzes", type=int, default=5, help="Quizzes played per client"
+    )
+    parser.add_argument("--questions", type=int, default=14, help="Questions per quiz")
+    parser.add_argument("--difficulty", default="medium", help="Quiz difficulty")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,288 @@
+"""
+Benchmarks for the load, filter, threshold and quiz-generation hot paths.
+
+Run from the project root:
+
+    poetry run python benchmarks/run_benchmarks.py
+
+Synthetic 17lands-shaped CSVs are generated for each size, every benchmark
+is timed (best of several repeats) and the run is appended to a JSON file
+together with the current git commit, so results can be compared over time.
+"""
+
+import argparse
+import csv
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from typing import Callable, Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from config import (
+    CARD_NAME,
+    CARD_RARITY,
+    CARD_OHWR,
+    DIFFICULTY_SEGMENTS,
+)
+from src.cards import PackGenerator, filter_cards_by_rarity, get_winrate_order
+from src.data import load_card_data, convert_keys_to_float
+from src.distribution import RatingDistribution
+from src.deck import DeckEstimator
+from src.draft import POD_SEATS, PodDraft, make_policies
+from src.game_logic import evaluate_picks
+from src.index import CardIndex
+from src.quiz import make_question, generate_questions
+
+DEFAULT_SIZES = [300, 3000, 30000]
+DEFAULT_OUTPUT = os.path.join(ROOT, "benchmarks", "results.json")
+BENCH_SET = "bench"
+
+# Column layout of a 17lands card-ratings export
+HEADER = [
+    "Name",
+    "Color",
+    "Rarity",
+    "# Seen",
+    "ALSA",
+    "# Picked",
+    "ATA",
+    "# GP",
+    "% GP",
+    "GP WR",
+    "# OH",
+    "OH WR",
+    "# GD",
+    "GD WR",
+    "# GIH",
+    "GIH WR",
+    "# GNS",
+    "GNS WR",
+    "IWD",
+]
+COLORS = ["W", "U", "B", "R", "G", "WU", "UB", "BR", "RG", "GW", ""]
+RARITIES = ["C"] * 5 + ["U"] * 3 + ["R", "M"]
+
+
+def _percent(rng: random.Random, low: float, high: float) -> str:
+    return f"{rng.uniform(low, high):.1f}%"
+
+
+def write_fixture(directory: str, rows: int, seed: int = 0) -> str:
+    """Write a synthetic card-ratings CSV dated today and return its path."""
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(
+        directory, f"card-ratings-{datetime.now().strftime('%Y-%m-%d')}.csv"
+    )
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f, quoting=csv.QUOTE_ALL)
+        writer.writerow(HEADER)
+        for i in range(rows):
+            writer.writerow(
+                [
+                    f"Synthetic Card {i}",
+                    rng.choice(COLORS),
+                    rng.choice(RARITIES),
+                    rng.randint(1000, 90000),
+                    f"{rng.uniform(1, 14):.2f}",
+                    rng.randint(100, 9000),
+                    f"{rng.uniform(1, 14):.2f}",
+                    rng.randint(100, 50000),
+                    _percent(rng, 1, 95),
+                    _percent(rng, 45, 65),
+                    rng.randint(100, 9000),
+                    "" if rng.random() < 0.03 else _percent(rng, 45, 65),
+                    rng.randint(100, 20000),
+                    _percent(rng, 45, 65),
+                    rng.randint(100, 30000),
+                    "" if rng.random() < 0.03 else _percent(rng, 45, 65),
+                    rng.randint(100, 20000),
+                    _percent(rng, 45, 65),
+                    f"{rng.uniform(-5, 8):.1f}pp",
+                ]
+            )
+    return path
+
+
+def time_call(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """Time func, scaling the loop count so each repeat lasts at least ~50ms."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= 0.05 or number >= 1 << 20:
+            break
+        number *= 2
+    timings = [elapsed / number]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        timings.append((time.perf_counter() - start) / number)
+    return {
+        "best": min(timings),
+        "mean": sum(timings) / len(timings),
+        "loops": number,
+        "repeat": repeat,
+    }
+
+
+def compute_thresholds(cards: List[Dict[str, object]], rating_key: str) -> None:
+    """The threshold computation main.main performs, for every difficulty level."""
+    distribution = RatingDistribution.from_cards(cards, rating_key)
+    for segments in DIFFICULTY_SEGMENTS.values():
+        distribution.thresholds(segments)
+
+
+def run_size(rows: int, repeat: int) -> Dict[str, Dict[str, float]]:
+    """Run every benchmark against a fixture with the given number of rows."""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        write_fixture(os.path.join(tmp, "resources", "sets", BENCH_SET), rows)
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            results["load_card_data"] = time_call(
+                lambda: load_card_data(BENCH_SET, use_cache=False), repeat
+            )
+            table = load_card_data(BENCH_SET)
+            results["load_card_data_cached"] = time_call(
+                lambda: load_card_data(BENCH_SET), repeat
+            )
+        finally:
+            os.chdir(cwd)
+
+    # Legacy dict rows with percentage strings, as convert_keys_to_float expects
+    raw_rows = [
+        {
+            CARD_NAME: c[CARD_NAME],
+            CARD_RARITY: c[CARD_RARITY],
+            CARD_OHWR: f"{c[CARD_OHWR]}%",
+        }
+        for c in table
+    ]
+    results["convert_keys_to_float"] = time_call(
+        lambda: convert_keys_to_float([dict(r) for r in raw_rows]), repeat
+    )
+    results["filter_cards_by_rarity"] = time_call(
+        lambda: filter_cards_by_rarity(table, "C"), repeat
+    )
+    quiz_cards = filter_cards_by_rarity(table, "C") + filter_cards_by_rarity(table, "U")
+    results["thresholds"] = time_call(
+        lambda: compute_thresholds(quiz_cards, CARD_OHWR), repeat
+    )
+
+    distribution = RatingDistribution.from_cards(quiz_cards, CARD_OHWR)
+    low, high = distribution.min, distribution.max
+    rng = random.Random(1)
+    results["make_question"] = time_call(
+        lambda: make_question(rng.choice(quiz_cards), CARD_OHWR, low, high, rng=rng),
+        repeat,
+    )
+    count = min(len(quiz_cards), 14)
+    results["generate_questions"] = time_call(
+        lambda: generate_questions(quiz_cards, CARD_OHWR, low, high, count, rng=rng),
+        repeat,
+    )
+
+    def score_random_pack():
+        pack = rng.sample(quiz_cards, 15)
+        lookup = {i + 1: card for i, card in enumerate(pack)}
+        evaluate_picks(rng.sample(range(1, 16), 5), lookup, get_winrate_order(pack))
+
+    results["evaluate_picks"] = time_call(score_random_pack, repeat)
+
+    generator = PackGenerator(CardIndex(table), seed=1)
+    pod = make_policies(generator, ["rating", "colors"] * (POD_SEATS // 2), CARD_OHWR)
+    results["draft_pod"] = time_call(
+        lambda: PodDraft(generator, pod, CARD_OHWR).run(), repeat
+    )
+
+    estimator = DeckEstimator(table)
+    pools = PodDraft(generator, pod, CARD_OHWR).run()
+    results["deck_estimate"] = time_call(
+        lambda: [estimator.win_rate(pool) for pool in pools], repeat
+    )
+    return results
+
+
+def git_commit() -> str:
+    """Return the current commit hash, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def load_history(path: str) -> List[Dict[str, object]]:
+    """Load previously recorded runs."""
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def print_results(run: Dict[str, object], previous: Dict[str, object]) -> None:
+    """Print best times per benchmark, with the change against the previous run."""
+    before = previous["results"] if previous else {}
+    print(f"Commit {run['commit']} ({run['python']})")
+    for size, benchmarks in run["results"].items():
+        print(f"\n{size} rows:")
+        for name, timing in benchmarks.items():
+            line = f"  {name:<24} {timing['best'] * 1e6:>12.1f} us"
+            old = before.get(size, {}).get(name)
+            if old:
+                change = 100 * (timing["best"] - old["best"]) / old["best"]
+                line += f"  ({change:+.1f}% vs {previous['commit']})"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the trainer hot paths")
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        type=int,
+        default=DEFAULT_SIZES,
+        help="Fixture sizes in rows",
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=5, help="Timed repeats per benchmark"
+    )
+    parser.add_argument(
+        "--output", default=DEFAULT_OUTPUT, help="JSON file the run is appended to"
+    )
+    args = parser.parse_args()
+
+    run = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "results": {str(size): run_size(size, args.repeat) for size in args.sizes},
+    }
+    history = load_history(args.output)
+    print_results(run, history[-1] if history else None)
+    history.append(run)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(history, f, indent=2)
+    print(f"\nResults appended to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,8 +18,52 @@ CARD_NGIH = "# GIH"
 CARD_GIHWR = "GIH WR"
 CARD_OHWR = "OH WR"
 CARD_PERCENT_GP = "% GP"
+# Set code column added when several sets are merged into one card table
+CARD_SET = "Set"
 
 # Quiz configuration
 CARDS_IN_QUIZ = 14
 QUIZ_RARITIES = ["C", "U"]  # Default rarities to include in quiz
 QUIZ_RATING_KEY = CARD_OHWR  # Default rating field to quiz on
+
+# Difficulty levels: number of rating segments (easy=tertiles, medium=quartiles, hard=quintiles)
+DIFFICULTY_SEGMENTS = {"easy": 3, "medium": 4, "hard": 5}
+# Answer labels and colors; a level with N segments uses the first N entries
+SEGMENT_LABELS = ["bad", "okay", "good", "great", "amazing"]
+SEGMENT_COLORS = ["red", "yellow", "green", "blue", "magenta"]
+
+# Booster pack layout used by the pack generator
+PACK_COMMONS = 11
+PACK_UNCOMMONS = 3
+PACK_RARES = 1
+MYTHIC_UPGRADE_ODDS = 1 / 8  # Chance that the rare slot holds a mythic instead
+
+# Default address of the quiz server (main.py serve)
+SERVER_HOST = "127.0.0.1"
+SERVER_PORT = 8765
+# Seconds between the server's checks for a newer card-ratings CSV
+SERVER_REFRESH_SECONDS = 60
+
+# SQLite file holding every learner's spaced-repetition review state (main.py --learner)
+REVIEW_DB_PATH = "resources/reviews.db"
+
+# Per-learner answer logs (JSON Lines) and how many answers are buffered per write
+ANSWER_LOG_DIR = "resources/answers"
+ANSWER_LOG_BATCH = 256
+
+# Difficulty calibration (main.py calibrate): rating estimates of the reference
+# simulated learner are off by this many points (standard deviation), and the
+# first-round accuracy each difficulty level and the rating question aim for
+CALIBRATION_NOISE = 2.0
+CALIBRATION_TARGETS = {"easy": 0.75, "medium": 0.6, "hard": 0.5}
+CALIBRATION_QUESTION_TARGET = 0.6
+
+# Adaptive quiz (main.py --adaptive): learner skills and card difficulties,
+# the success rate questions aim for and Elo step sizes
+SKILL_DB_PATH = "resources/skills.db"
+ADAPTIVE_TARGET = 0.7
+ADAPTIVE_LEARNER_K = 0.3
+ADAPTIVE_CARD_K = 0.1
+# Extra difficulty (in logits) of each segment count, from calibrated
+# first-round accuracy (main.py calibrate) relative to quartiles
+ADAPTIVE_SEGMENT_OFFSETS = {3: -0.6, 4: 0.0, 5: 0.4}
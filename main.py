@@ -2,86 +2,132 @@
 MTG Limited Trainer - Card Rating Quiz with difficulty selection
 """
 import argparse
-import random
+import getpass
 import os
 import sys
+import time
+from contextlib import ExitStack
 
 from config import (
     MAGIC_SET,
     QUIZ_RARITIES,
     QUIZ_RATING_KEY,
     CARDS_IN_QUIZ,
+    CARD_NAME,
     CARD_COLOR,
-    CARD_RARITY,
+    CARD_SET,
+    CARD_PERCENT_GP,
+    CARD_NGIH,
+    DIFFICULTY_SEGMENTS,
+    SEGMENT_LABELS,
+    SEGMENT_COLORS,
+    SERVER_HOST,
+    SERVER_PORT,
+    CALIBRATION_NOISE,
+    CALIBRATION_TARGETS,
+    CALIBRATION_QUESTION_TARGET,
+    ADAPTIVE_TARGET,
 )
-from src.data import load_card_data, load_exclude_list, convert_keys_to_float
-from src.cards import filter_cards_by_rarity
-from src.display import format_card_line, get_color_code, cprint
-
-
-def ask_question(
-    card: dict,
-    idx: int,
-    thresholds: list[float],
-    labels: list[str],
-    colors: list[str],
-    rating_key: str,
-) -> tuple[bool, int]:
-    """Display one question and return True if the user answers correctly."""
-    # Show question header
-    cprint(f"{idx}. {format_card_line(card, False)}", get_color_code(card[CARD_COLOR]))
-    # Show options based on difficulty segments
-    for i, label in enumerate(labels):
-        cprint(f"  {i+1}) {label}", colors[i])
+from src.data import (
+    discover_sets,
+    load_card_data,
+    load_exclude_list,
+    load_multi_set,
+    refresh_snapshot,
+)
+from src.index import CardIndex
+from src.distribution import get_rating_distribution
+from src.display import format_card_line, get_color_code, cprint, write_screen
+from src.session import QuizSession, correct_option
+from src.answer_log import AnswerLog, get_answer_log_path
+
+# Only the modules the interactive quiz needs are imported above; subcommands
+# and --learner import theirs when they run, so asyncio, sqlite3 and process
+# pools never slow down the time to the first question
+
+
+def ask_question(card: dict, idx: int, labels: list[str], colors: list[str]) -> int:
+    """Display one question and return the 0-based index of the chosen answer."""
+    # Question header and the options for the difficulty segments, in one write
+    lines = [
+        (f"{idx}. {format_card_line(card, False)}", get_color_code(card[CARD_COLOR]))
+    ]
+    lines += [(f"  {i+1}) {label}", colors[i]) for i, label in enumerate(labels)]
+    write_screen(lines)
 
     # Prompt until valid
     valid = [str(i + 1) for i in range(len(labels))]
     while True:
         ans = input(f"Your answer ({'/'.join(valid)}): ").strip()
         if ans in valid:
-            chosen = int(ans) - 1
-            val = float(card[rating_key])
-            # Determine correct segment
-            correct_idx = len(thresholds)
-            for i, th in enumerate(thresholds):
-                if val < th:
-                    correct_idx = i
-                    break
-            return chosen == correct_idx, chosen
+            return int(ans) - 1
         print("Invalid choice, please try again.")
 
 
-def main():
-    parser = argparse.ArgumentParser(
-        description="Run a rating quiz on MTG cards with adjustable difficulty ranges"
-    )
+def add_card_selection_args(parser: argparse.ArgumentParser) -> None:
+    """Add the options that choose which cards and rating to quiz on."""
     parser.add_argument(
         "--rarities",
         nargs="+",
         default=QUIZ_RARITIES,
         help="Card rarities to include (e.g. C U)",
     )
+    parser.add_argument(
+        "--colors",
+        nargs="+",
+        default=None,
+        help="Card colors to include: W U B R G, M (multicolor), C (colorless)",
+    )
     parser.add_argument(
         "--rating-key",
         default=QUIZ_RATING_KEY,
         help="Rating field to quiz on (e.g. CARD_OHWR)",
     )
     parser.add_argument(
-        "--num-questions",
-        type=int,
-        default=CARDS_IN_QUIZ,
-        help="Number of questions in the quiz",
+        "--sets",
+        nargs="+",
+        default=None,
+        help=f"Set codes to quiz across, or 'all' for every set in resources/sets/ (default: {MAGIC_SET})",
     )
+
+
+# Card columns --weight-by can weight the draw by; 'errors' uses the answer log
+WEIGHT_COLUMNS = {"gp": CARD_PERCENT_GP, "gih": CARD_NGIH}
+
+
+def add_weight_arg(parser: argparse.ArgumentParser) -> None:
+    """Add the option that weights which cards are drawn."""
     parser.add_argument(
-        "--difficulty",
-        choices=["easy", "medium", "hard"],
-        default="medium",
-        help="Difficulty: easy=tertiles, medium=quartiles, hard=quintiles",
+        "--weight-by",
+        choices=[*WEIGHT_COLUMNS, "errors"],
+        default=None,
+        help="Draw cards in proportion to how much they are played (gp: %% GP, gih: # GIH) or to the learner's error rate on them (errors)",
     )
-    args = parser.parse_args()
 
-    # Ensure resources directory exists
-    resources_path = os.path.join(os.getcwd(), "resources", "sets", MAGIC_SET)
+
+def learner_error_counts(learner: str) -> dict[str, list[int]]:
+    """[answers, wrong] per card name over a learner's logged first-round quiz answers."""
+    from src.stats import answer_stats
+
+    log_path = get_answer_log_path(learner)
+    if not os.path.exists(log_path):
+        return {}
+    groups = answer_stats(log_path, ["card"])["card"]
+    return {name: [g.answers, g.answers - g.correct] for name, g in groups.items()}
+
+
+def card_weights(weight_by: str, quiz_cards, error_counts=None) -> list[float]:
+    """One draw weight per quiz card for a --weight-by choice."""
+    from src.sampling import column_weights, error_weights
+
+    if weight_by == "errors":
+        return error_weights(quiz_cards, error_counts or {})
+    return column_weights(quiz_cards, WEIGHT_COLUMNS[weight_by])
+
+
+def ensure_resources(set_name: str) -> None:
+    """Exit with setup instructions if a set's resources directory is missing."""
+    resources_path = os.path.join(os.getcwd(), "resources", "sets", set_name)
     if not os.path.isdir(resources_path):
         print(f"Error: Resource directory '{resources_path}' not found.")
         print(
@@ -89,43 +135,630 @@ def main():
         )
         sys.exit(1)
 
+
+def load_quiz_cards(args: argparse.Namespace):
+    """
+    Load the configured set (or the --sets to quiz across) and select the cards to quiz on.
+    Returns the card table, its index, the selection bitmap and the selected cards.
+    """
+    set_names = [MAGIC_SET] if not args.sets else args.sets
+    if "all" in set_names:
+        set_names = discover_sets() or [MAGIC_SET]
+    for set_name in set_names:
+        ensure_resources(set_name)
+
     # Load and prepare cards
-    cards = load_card_data(MAGIC_SET)
-    convert_keys_to_float(cards)
-    exclude = load_exclude_list(MAGIC_SET)
-    # Filter by rarity and exclude list
-    quiz_cards = []
-    for r in args.rarities:
-        quiz_cards.extend(filter_cards_by_rarity(cards, r))
-    quiz_cards = [c for c in quiz_cards if c["Name"] not in exclude]
+    if len(set_names) == 1:
+        cards = load_card_data(set_names[0])
+    else:
+        cards = load_multi_set(set_names)
+    index = CardIndex(cards)
+    for set_name in set_names:
+        index.exclude(load_exclude_list(set_name), set_name=set_name)
+    selected, quiz_cards = select_quiz_cards(index, args)
+    return cards, index, selected, quiz_cards
+
+
+def select_quiz_cards(index: CardIndex, args: argparse.Namespace):
+    """Filter by rarity, color and exclude list; returns the bitmap and rated cards."""
+    selected = index.select(rarities=args.rarities, colors=args.colors)
+    quiz_cards = [c for c in index.rows(selected) if c[args.rating_key] is not None]
+    return selected, quiz_cards
+
+
+def export_questions(argv: list[str]) -> None:
+    """Headless mode: write generated questions as JSON Lines."""
+    from src.quiz import QuizEngine
+
+    parser = argparse.ArgumentParser(
+        prog="main.py export",
+        description="Generate rating questions without a terminal, for study decks and regression tests",
+    )
+    add_card_selection_args(parser)
+    parser.add_argument(
+        "--count", type=int, default=10000, help="Number of questions to generate"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for reproducible output"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Number of worker processes"
+    )
+    parser.add_argument(
+        "--step", type=float, default=0.5, help="Rounding step of answer options"
+    )
+    parser.add_argument(
+        "--output", default="-", help="Output JSON Lines file ('-' for stdout)"
+    )
+    add_weight_arg(parser)
+    args = parser.parse_args(argv)
+
+    cards, index, selected, quiz_cards = load_quiz_cards(args)
+    distribution = get_rating_distribution(cards, args.rating_key, selected)
+    weights = None
+    if args.weight_by:
+        errors = None
+        if args.weight_by == "errors":
+            errors = learner_error_counts(getpass.getuser())
+        weights = card_weights(args.weight_by, quiz_cards, errors)
+    engine = QuizEngine(
+        quiz_cards,
+        args.rating_key,
+        distribution.min,
+        distribution.max,
+        step=args.step,
+        seed=args.seed,
+        weights=weights,
+    )
+    if args.output == "-":
+        engine.write_jsonl(sys.stdout, args.count, workers=args.workers)
+    else:
+        with open(args.output, "w", encoding="utf-8") as f:
+            engine.write_jsonl(f, args.count, workers=args.workers)
+    print(f"Wrote {args.count} questions (seed {engine.seed})", file=sys.stderr)
+
+
+def show_history(argv: list[str]) -> None:
+    """Ingest new dated snapshots into the set history and answer history queries."""
+    from src.history import RatingHistory
+
+    parser = argparse.ArgumentParser(
+        prog="main.py history",
+        description="Record every dated card-ratings CSV and query rating changes over time",
+    )
+    parser.add_argument("--set", default=MAGIC_SET, help="Set code")
+    parser.add_argument(
+        "--rating-key", default=QUIZ_RATING_KEY, help="Rating field to query"
+    )
+    parser.add_argument("--card", help="Show the rating trajectory of this card")
+    parser.add_argument(
+        "--movers",
+        type=float,
+        metavar="POINTS",
+        help="List cards whose rating moved more than POINTS",
+    )
+    parser.add_argument(
+        "--days", type=int, default=7, help="Look-back window for --movers"
+    )
+    args = parser.parse_args(argv)
+
+    ensure_resources(args.set)
+    history = RatingHistory.for_set(args.set)
+    ingested = history.ingest(args.set)
+    print(
+        f"Ingested {len(ingested)} new snapshot(s), {len(history.dates)} recorded for {args.set}."
+    )
+    if args.card:
+        print(f"{args.rating_key} for {args.card}:")
+        for snapshot_date, value in history.trajectory(args.card, args.rating_key):
+            print(f"  {snapshot_date}: {value:.2f}")
+    if args.movers is not None:
+        print(
+            f"Cards whose {args.rating_key} moved more than {args.movers} in {args.days} days:"
+        )
+        for name, old, new in history.movers(args.rating_key, args.movers, args.days):
+            print(f"  {name}: {old:.2f} -> {new:.2f} ({new - old:+.2f})")
+
+
+def serve(argv: list[str]) -> None:
+    """Serve the rating quiz to many concurrent learners over a socket."""
+    import asyncio
+    from src.server import QuizServer
+
+    parser = argparse.ArgumentParser(
+        prog="main.py serve",
+        description="Run the rating quiz as a JSON-lines server over TCP or a Unix socket",
+    )
+    add_card_selection_args(parser)
+    parser.add_argument("--host", default=SERVER_HOST, help="Address to listen on")
+    parser.add_argument("--port", type=int, default=SERVER_PORT, help="TCP port")
+    parser.add_argument(
+        "--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP"
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for reproducible card draws"
+    )
+    args = parser.parse_args(argv)
+
+    cards, index, selected, quiz_cards = load_quiz_cards(args)
+    distribution = get_rating_distribution(cards, args.rating_key, selected)
+
+    def refresh():
+        """Import a newer CSV of the set, if one appeared since the last check."""
+        delta = refresh_snapshot(cards, index)
+        if delta is None:
+            return None
+        selected, quiz_cards = select_quiz_cards(index, args)
+        print(f"Loaded ratings from {delta.source}")
+        return quiz_cards, get_rating_distribution(cards, args.rating_key, selected)
+
+    # Snapshots are imported per set, so merged tables are served as loaded
+    server = QuizServer(
+        quiz_cards,
+        args.rating_key,
+        distribution,
+        seed=args.seed,
+        refresh=None if CARD_SET in cards.strings else refresh,
+    )
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        print("Server stopped.")
+
+
+def play_picks(argv: list[str]) -> None:
+    """Pick game: choose the best cards of generated packs in win rate order."""
+    from src.cards import PackGenerator
+    from src.display import print_intro, print_pack, get_user_input, print_pick_summary
+    from src.session import DraftSession
+
+    parser = argparse.ArgumentParser(
+        prog="main.py picks",
+        description="Pick the top cards of booster packs in order and compare with the data",
+    )
+    parser.add_argument("--set", default=MAGIC_SET, help="Set code")
+    parser.add_argument(
+        "--rating-key", default=QUIZ_RATING_KEY, help="Rating field picks are scored on"
+    )
+    parser.add_argument("--packs", type=int, default=3, help="Number of packs")
+    parser.add_argument(
+        "--learner",
+        default=None,
+        help="Answer log to record picks in (default: user name)",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for reproducible packs"
+    )
+    args = parser.parse_args(argv)
+
+    ensure_resources(args.set)
+    index = CardIndex(load_card_data(args.set), load_exclude_list(args.set))
+    session = DraftSession(
+        PackGenerator(index, seed=args.seed), args.packs, rating_key=args.rating_key
+    )
+    print_intro()
+    with AnswerLog.for_learner(args.learner or getpass.getuser()) as answer_log:
+        while (pack := session.next_pack()) is not None:
+            print(f"Pack {session.pack_number}:")
+            print_pack(pack)
+            asked_at = time.perf_counter()
+            picks = get_user_input(pack)
+            latency = time.perf_counter() - asked_at
+            result = session.pick(picks)
+            answer_log.record_picks(
+                result.results, picks, pack, args.set, args.rating_key, latency
+            )
+            print_pick_summary(result.results, pack)
+            print(f"Score: {result.score}/{session.picks_per_pack}\n")
+    print(f"Final score: {session.score}/{session.max_score}")
+
+
+def show_stats(argv: list[str]) -> None:
+    """Report which cards, colors, rarities and rating bands a learner misjudges most."""
+    from src.stats import GROUPINGS, DEFAULT_GROUPINGS, answer_stats, worst_groups
+
+    parser = argparse.ArgumentParser(
+        prog="main.py stats",
+        description="Aggregate a learner's logged answers into accuracy reports",
+    )
+    parser.add_argument(
+        "--learner", default=None, help="Learner whose log to read (default: user name)"
+    )
+    parser.add_argument(
+        "--by",
+        nargs="+",
+        choices=GROUPINGS,
+        default=list(DEFAULT_GROUPINGS),
+        help="Groupings to report",
+    )
+    parser.add_argument(
+        "--kind", choices=["quiz", "pick"], default="quiz", help="Answers to report on"
+    )
+    parser.add_argument(
+        "--all-rounds",
+        action="store_true",
+        help="Include retried quiz rounds, not just first answers",
+    )
+    parser.add_argument(
+        "--band", type=float, default=2.5, help="Width of rating bands in points"
+    )
+    parser.add_argument(
+        "--min-answers", type=int, default=5, help="Hide groups with fewer answers"
+    )
+    parser.add_argument("--top", type=int, default=10, help="Groups shown per report")
+    args = parser.parse_args(argv)
+
+    learner = args.learner or getpass.getuser()
+    log_path = get_answer_log_path(learner)
+    if not os.path.exists(log_path):
+        print(f"No answers logged for {learner}.")
+        return
+    stats = answer_stats(
+        log_path, args.by, args.kind, not args.all_rounds, band_width=args.band
+    )
+    for grouping, groups in stats.items():
+        print(f"\nBy {grouping}, least accurate first:")
+        for label, group in worst_groups(groups, args.min_answers, args.top):
+            line = f"  {label or '-':<32} {group.answers:>7} answers {group.accuracy:>6.1f}% correct"
+            if args.kind == "quiz":
+                line += f"  bias {group.mean_error:+.2f}"
+            if grouping == "color":
+                cprint(line, label)
+            else:
+                print(line)
+
+
+def play_draft(argv: list[str]) -> None:
+    """Draft a full pod against bots, or simulate pods of bots headless."""
+    from src.cards import PackGenerator
+    from src.display import print_pack, get_pick_input, pick_summary_lines
+    from src.deck import DeckEstimator
+    from src.draft import POD_SEATS, POLICIES, PodDraft, make_policies, simulate_pods
+
+    parser = argparse.ArgumentParser(
+        prog="main.py draft",
+        description="Draft 3 packs at a table of bots, scored on every pick, or benchmark bot pick policies",
+    )
+    parser.add_argument("--set", default=MAGIC_SET, help="Set code")
+    parser.add_argument(
+        "--rating-key",
+        default=QUIZ_RATING_KEY,
+        help="Rating field bots pick by and picks are scored on",
+    )
+    parser.add_argument("--packs", type=int, default=3, help="Packs per seat")
+    parser.add_argument(
+        "--bots", choices=list(POLICIES), default="colors", help="Pick policy of bots"
+    )
+    parser.add_argument(
+        "--seat", type=int, default=1, help=f"Your seat (1-{POD_SEATS})"
+    )
+    parser.add_argument(
+        "--learner",
+        default=None,
+        help="Answer log to record picks in (default: user name)",
+    )
+    parser.add_argument(
+        "--simulate",
+        type=int,
+        metavar="PODS",
+        help="Draft this many pods of bots without a human and compare policies",
+    )
+    parser.add_argument(
+        "--policies",
+        nargs="+",
+        choices=list(POLICIES),
+        default=list(POLICIES),
+        help="Bot policies seated in turn around the table when simulating",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes when simulating",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for reproducible packs"
+    )
+    args = parser.parse_args(argv)
+    if not 1 <= args.seat <= POD_SEATS:
+        parser.error(f"--seat must be between 1 and {POD_SEATS}")
+
+    ensure_resources(args.set)
+    index = CardIndex(load_card_data(args.set), load_exclude_list(args.set))
+    generator = PackGenerator(index, seed=args.seed)
+    if args.simulate:
+        names = [args.policies[i % len(args.policies)] for i in range(POD_SEATS)]
+        started = time.perf_counter()
+        stats = simulate_pods(
+            generator,
+            names,
+            args.simulate,
+            args.rating_key,
+            args.packs,
+            seed=args.seed,
+            workers=args.workers,
+        )
+        elapsed = time.perf_counter() - started
+        print(
+            f"Drafted {args.simulate} pods in {elapsed:.1f}s "
+            f"({args.simulate / elapsed:.0f} pods/s)"
+        )
+        print(
+            f"Mean {args.rating_key} of each pool's best 23 cards, and estimated "
+            "win rate of its best two-color deck:"
+        )
+        for name, policy_stats in stats.items():
+            print(
+                f"  {name:<8} {policy_stats.mean_score:6.2f} "
+                f"{policy_stats.mean_win_rate:6.2f}% ({policy_stats.seats} pools)"
+            )
+        return
+
+    names = [args.bots] * POD_SEATS
+    names[args.seat - 1] = None
+    draft = PodDraft(
+        generator,
+        make_policies(generator, names, args.rating_key),
+        args.rating_key,
+        args.packs,
+    )
+    print(
+        f"Draft {args.packs} packs of {generator.pack_size} cards at a table of "
+        f"{POD_SEATS}; bots pick by {args.bots}. Each pick is scored against the "
+        f"best card of the pack by {args.rating_key}."
+    )
+    with AnswerLog.for_learner(args.learner or getpass.getuser()) as answer_log:
+        while (pack := draft.next_pack()) is not None:
+            rows = generator.table.rows(pack)
+            pick_in_pack = generator.pack_size - len(pack) + 1
+            print(f"\nPack {draft.pack_number}, pick {pick_in_pack}:")
+            print_pack(rows)
+            asked_at = time.perf_counter()
+            position = get_pick_input(rows)
+            latency = time.perf_counter() - asked_at
+            result = draft.pick(position)
+            answer_log.record_picks(
+                [result], [position], rows, args.set, args.rating_key, latency
+            )
+            write_screen(pick_summary_lines([result], rows)[1:])
+    print(f"\nFinal score: {draft.score}/{draft.max_score}")
+    deck = DeckEstimator(generator.table).estimate(draft.pools[draft.human])
+    print(
+        f"Best deck: {deck.pair}, {len(deck.cards)} cards, "
+        f"estimated win rate {deck.win_rate:.1f}%"
+    )
+    print(", ".join(generator.table.value(row, CARD_NAME) for row in deck.cards))
+
+
+def calibrate(argv: list[str]) -> None:
+    """Measure how hard difficulty levels and rating questions are with simulated learners."""
+    from src.calibration import (
+        Calibrator,
+        SegmentCell,
+        QuestionCell,
+        NEIGHBOR_GRID,
+        recommend_segments,
+        recommend_neighbor_prob,
+    )
+    from src.quiz import NEIGHBOR_PROBABILITY
+
+    parser = argparse.ArgumentParser(
+        prog="main.py calibrate",
+        description="Run noisy simulated learners through generated questions and recommend difficulty settings",
+    )
+    add_card_selection_args(parser)
+    parser.add_argument(
+        "--questions",
+        type=int,
+        default=100000,
+        help="Simulated answers per setting",
+    )
+    parser.add_argument(
+        "--noise",
+        nargs="+",
+        type=float,
+        default=[1.0, 2.0, 3.0, 4.0],
+        help="Rating estimate errors (standard deviation in points) to simulate",
+    )
+    parser.add_argument(
+        "--learner-noise",
+        type=float,
+        default=CALIBRATION_NOISE,
+        help="Estimate error of the learner recommendations are made for",
+    )
+    parser.add_argument(
+        "--steps",
+        nargs="+",
+        type=float,
+        default=[0.5, 1.0, 2.0],
+        help="Rating question option steps to simulate",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count(),
+        help="Number of worker processes",
+    )
+    parser.add_argument(
+        "--seed", type=int, default=None, help="Seed for reproducible results"
+    )
+    args = parser.parse_args(argv)
+
+    cards, index, selected, quiz_cards = load_quiz_cards(args)
+    distribution = get_rating_distribution(cards, args.rating_key, selected)
+    calibrator = Calibrator(
+        [card[args.rating_key] for card in quiz_cards], distribution, seed=args.seed
+    )
+    noises = sorted(set(args.noise) | {args.learner_noise})
+    segment_counts = range(2, len(SEGMENT_LABELS) + 1)
+    segment_cells = [SegmentCell(n, noise) for n in segment_counts for noise in noises]
+    question_cells = [
+        QuestionCell(step, p, args.learner_noise)
+        for step in args.steps
+        for p in NEIGHBOR_GRID
+    ]
+    started = time.perf_counter()
+    accuracy = calibrator.accuracy(
+        segment_cells + question_cells, args.questions, workers=args.workers
+    )
+    elapsed = time.perf_counter() - started
+    total = len(accuracy) * args.questions
+    print(f"Simulated {total} answers in {elapsed:.1f}s (seed {calibrator.seed})")
+
+    levels = {n: level for level, n in DIFFICULTY_SEGMENTS.items()}
+    print("\nSegment quiz, first-round accuracy by estimate error (points):")
+    print("  segments        " + "".join(f"{noise:>8.1f}" for noise in noises))
+    for n in segment_counts:
+        label = f"{n} ({levels[n]})" if n in levels else str(n)
+        row = "".join(f"{accuracy[SegmentCell(n, noise)]:>8.1%}" for noise in noises)
+        print(f"  {label:<16}{row}")
+    by_segments = {
+        n: accuracy[SegmentCell(n, args.learner_noise)] for n in segment_counts
+    }
+    print(f"\nRecommended segments for estimate error {args.learner_noise}:")
+    for level, n in recommend_segments(by_segments, CALIBRATION_TARGETS).items():
+        thresholds = ", ".join(f"{t:.2f}" for t in distribution.thresholds(n))
+        print(
+            f"  {level}: {n} segments (now {DIFFICULTY_SEGMENTS[level]}), "
+            f"{by_segments[n]:.1%} vs target {CALIBRATION_TARGETS[level]:.0%}; "
+            f"thresholds {thresholds}"
+        )
+
+    print(
+        f"\nRating question accuracy at estimate error {args.learner_noise}, by neighbor chance:"
+    )
+    print("  step  " + "".join(f"{p:>8.2f}" for p in NEIGHBOR_GRID))
+    for step in args.steps:
+        row = "".join(
+            f"{accuracy[QuestionCell(step, p, args.learner_noise)]:>8.1%}"
+            for p in NEIGHBOR_GRID
+        )
+        print(f"  {step:<6}{row}")
+    print(
+        f"\nRecommended neighbor chance for {CALIBRATION_QUESTION_TARGET:.0%} accuracy "
+        f"(now {NEIGHBOR_PROBABILITY}):"
+    )
+    for step in args.steps:
+        by_chance = {
+            p: accuracy[QuestionCell(step, p, args.learner_noise)]
+            for p in NEIGHBOR_GRID
+        }
+        chance = recommend_neighbor_prob(by_chance, CALIBRATION_QUESTION_TARGET)
+        reachable = (
+            min(by_chance.values())
+            <= CALIBRATION_QUESTION_TARGET
+            <= max(by_chance.values())
+        )
+        note = "" if reachable else " (target out of reach at this step)"
+        print(f"  step {step}: {chance:.2f}{note}")
+
+
+def play_adaptive(args: argparse.Namespace, cards, quiz_cards, distribution) -> None:
+    """Adaptive quiz: each question's card and segment count follow the learner's skill."""
+    from src.adaptive import AdaptiveQuiz, SkillStore, prior_difficulty
+
+    learner = args.learner or getpass.getuser()
+    ratings = [float(card[args.rating_key]) for card in quiz_cards]
+    keys = [
+        (card.get(CARD_SET) or cards.set_name, card[CARD_NAME]) for card in quiz_cards
+    ]
+    levels = {n: level for level, n in DIFFICULTY_SEGMENTS.items()}
+    medium = distribution.thresholds(DIFFICULTY_SEGMENTS["medium"])
+    with SkillStore() as store, AnswerLog.for_learner(learner) as answer_log:
+        known = store.difficulties(keys)
+        quiz = AdaptiveQuiz(
+            [known.get(k, prior_difficulty(r, medium)) for k, r in zip(keys, ratings)],
+            store.skill(learner),
+        )
+        print(f"\n--- Adaptive quiz: {args.num_questions} question(s) ---")
+        num_correct = 0
+        for number in range(1, args.num_questions + 1):
+            position, segments = quiz.next_question()
+            thresholds = distribution.thresholds(segments)
+            card = quiz_cards[position]
+            asked_at = time.perf_counter()
+            chosen = ask_question(
+                card, number, SEGMENT_LABELS[:segments], SEGMENT_COLORS[:segments]
+            )
+            latency = time.perf_counter() - asked_at
+            expected = correct_option(ratings[position], thresholds, range(segments))
+            quiz.update(position, segments, chosen == expected)
+            store.save(learner, quiz.skill, keys[position], quiz.difficulties[position])
+            answer_log.record_quiz(
+                card,
+                keys[position][0],
+                args.rating_key,
+                levels.get(segments, str(segments)),
+                segments,
+                chosen,
+                expected,
+                latency,
+            )
+            if chosen == expected:
+                num_correct += 1
+                cprint("Correct", "green")
+            else:
+                bounds = [distribution.min, *thresholds, distribution.max]
+                cprint(
+                    f"Wrong: {SEGMENT_LABELS[expected]} "
+                    f"({bounds[expected]:.2f} - {bounds[expected + 1]:.2f})",
+                    "red",
+                )
+    print(
+        f"\nQuiz complete! {num_correct}/{args.num_questions} correct "
+        f"(target {ADAPTIVE_TARGET:.0%}), skill estimate {quiz.skill:+.2f}"
+    )
+
+
+def main(argv: list[str] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in COMMANDS:
+        return COMMANDS[argv[0]](argv[1:])
+
+    parser = argparse.ArgumentParser(
+        description="Run a rating quiz on MTG cards with adjustable difficulty ranges",
+        epilog=f"Other commands: {', '.join(COMMANDS)} (use '<command> -h' for help)",
+    )
+    add_card_selection_args(parser)
+    parser.add_argument(
+        "--num-questions",
+        type=int,
+        default=CARDS_IN_QUIZ,
+        help="Number of questions in the quiz",
+    )
+    parser.add_argument(
+        "--difficulty",
+        choices=list(DIFFICULTY_SEGMENTS),
+        default="medium",
+        help="Difficulty: easy=tertiles, medium=quartiles, hard=quintiles",
+    )
+    parser.add_argument(
+        "--learner",
+        default=None,
+        help="Learner name: quiz on due cards by spaced repetition and log answers under it",
+    )
+    add_weight_arg(parser)
+    parser.add_argument(
+        "--adaptive",
+        action="store_true",
+        help="Pick each card and the number of segments (3-5) from the learner's skill estimate to aim at a steady success rate (ignores --difficulty)",
+    )
+    args = parser.parse_args(argv)
+
+    cards, index, selected, quiz_cards = load_quiz_cards(args)
     # Show card counts by rarity
     print("Card counts by rarity:")
-    for r in args.rarities:
-        count = sum(1 for c in quiz_cards if c[CARD_RARITY] == r)
+    for r, count in index.rarity_counts(args.rarities, selected).items():
         print(f"  {r}: {count}")
 
-    # Determine rating bounds
-    values = [float(c[args.rating_key]) for c in quiz_cards]
-    min_val, max_val = min(values), max(values)
-    sorted_vals = sorted(values)
-    n_vals = len(sorted_vals)
-    # Configure thresholds, labels, and colors for difficulty levels
-    if args.difficulty == "easy":
-        # tertiles
-        idxs = [n_vals // 3, (2 * n_vals) // 3]
-        labels = ["bad", "okay", "good"]
-        colors = ["red", "yellow", "green"]
-    elif args.difficulty == "medium":
-        # quartiles
-        idxs = [n_vals // 4, n_vals // 2, (3 * n_vals) // 4]
-        labels = ["bad", "okay", "good", "great"]
-        colors = ["red", "yellow", "green", "blue"]
-    else:
-        # hard quintiles
-        idxs = [n_vals // 5, (2 * n_vals) // 5, (3 * n_vals) // 5, (4 * n_vals) // 5]
-        labels = ["bad", "okay", "good", "great", "amazing"]
-        colors = ["red", "yellow", "green", "blue", "magenta"]
-    thresholds = [sorted_vals[i] for i in idxs]
+    # Determine rating bounds and difficulty thresholds from one sorted distribution
+    distribution = get_rating_distribution(cards, args.rating_key, selected)
+    if args.adaptive:
+        return play_adaptive(args, cards, quiz_cards, distribution)
+    min_val, max_val = distribution.min, distribution.max
+    segments = DIFFICULTY_SEGMENTS[args.difficulty]
+    thresholds = distribution.thresholds(segments)
+    labels = SEGMENT_LABELS[:segments]
     # Show rating ranges
     print(f"Rating ranges ({args.difficulty}):")
     lower = min_val
@@ -135,69 +768,104 @@ def main():
     # final segment
     print(f"  {len(thresholds)+1}) {labels[-1]}: {lower:.2f} - {max_val:.2f}")
 
-    # Generate initial question set by sampling cards and attaching full option lists
-    questions = random.sample(quiz_cards, args.num_questions)
-    # Each entry: (card, thresholds, labels, colors)
-    remaining = [
-        (
-            card,
-            thresholds.copy(),
-            labels.copy(),
-            colors.copy(),
-        )
-        for card in questions
+    # Rounds, retries and grading live in the session; this loop only does terminal I/O
+    ratings = [float(card[args.rating_key]) for card in quiz_cards]
+    keys = [
+        (card.get(CARD_SET) or cards.set_name, card[CARD_NAME]) for card in quiz_cards
     ]
-    original_card_list = remaining
-    while True:
-        round_num = 1
-        offer_retry = False
-        while remaining:
-            print(f"\n--- Round {round_num}: {len(remaining)} question(s) ---")
-            wrong = []
-            for i, (card, thr, lab, col) in enumerate(remaining, start=1):
-                correct, chosen = ask_question(card, i, thr, lab, col, args.rating_key)
-                if correct:
+    learner = args.learner or getpass.getuser()
+    # The review database (with --learner) and the answer log close together
+    with ExitStack() as stack:
+        scheduler, due, sampler, error_counts = None, None, None, None
+        if args.learner:
+            from src.scheduler import ReviewScheduler, GRADE_CORRECT, GRADE_WRONG
+
+            scheduler = stack.enter_context(ReviewScheduler())
+        if args.weight_by:
+            # A weighted draw replaces the spaced-repetition choice of cards
+            from src.sampling import FenwickSampler, error_weight
+
+            if args.weight_by == "errors":
+                error_counts = learner_error_counts(learner)
+            sampler = FenwickSampler(
+                card_weights(args.weight_by, quiz_cards, error_counts)
+            )
+            due = sampler.sample(args.num_questions)
+        elif scheduler is not None:
+            due = scheduler.select(args.learner, keys, args.num_questions)
+        session = QuizSession(
+            quiz_cards, ratings, thresholds, args.num_questions, selected=due
+        )
+        answer_log = stack.enter_context(AnswerLog.for_learner(learner))
+        while True:
+            while (prompt := session.next_question()) is not None:
+                if prompt.number == 1:
+                    print(f"\n--- Round {prompt.round}: {prompt.of} question(s) ---")
+                asked_at = time.perf_counter()
+                chosen = ask_question(
+                    prompt.card,
+                    prompt.number,
+                    [SEGMENT_LABELS[s] for s in prompt.options],
+                    [SEGMENT_COLORS[s] for s in prompt.options],
+                )
+                latency = time.perf_counter() - asked_at
+                result = session.answer(chosen)
+                set_name = keys[prompt.card_index][0]
+                answer_log.record_quiz(
+                    prompt.card,
+                    set_name,
+                    args.rating_key,
+                    args.difficulty,
+                    segments,
+                    prompt.options[chosen],
+                    prompt.options[result.expected],
+                    latency,
+                    prompt.round,
+                )
+                if scheduler is not None and prompt.round == 1:
+                    grade = GRADE_CORRECT if result.correct else GRADE_WRONG
+                    scheduler.review(args.learner, keys[prompt.card_index], grade)
+                if error_counts is not None and prompt.round == 1:
+                    # Missed cards become more likely in the next draw (on retry)
+                    counts = error_counts.setdefault(prompt.card[CARD_NAME], [0, 0])
+                    counts[0] += 1
+                    counts[1] += not result.correct
+                    sampler.update(prompt.card_index, error_weight(*counts))
+                if result.correct:
                     cprint("Correct", "green")
                 else:
                     cprint("Wrong", "red")
-                    # remove chosen wrong option for next round
-                    new_thr = thr.copy()
-                    new_lab = lab.copy()
-                    new_col = col.copy()
-                    # remove corresponding label/color and threshold
-                    new_lab.pop(chosen)
-                    new_col.pop(chosen)
-                    if len(new_thr) > chosen:
-                        new_thr.pop(chosen)
-                    else:
-                        # if removing last label, drop last threshold
-                        new_thr.pop(-1)
-                    wrong.append((card, new_thr, new_lab, new_col))
-            num = len(remaining)
-            correct_count = num - len(wrong)
-            amount_correct = 100 * correct_count / num
-            if amount_correct < 100:
-                offer_retry = True
-            print(f"You answered {amount_correct:.1f}% correct this round.")
-            if wrong:
-                print("Repeating wrong questions...\n")
-                random.shuffle(wrong)
-                remaining = wrong
-                round_num += 1
-            else:
-                break
-
-        print("\nQuiz complete!")
-        if offer_retry:
-            print("You scored below 100% in round 1.")
-            retry = input("Would you like to retry the quiz? (y/n): ").strip().lower()
-            if retry == "n":
-                pass
-            else:
-                remaining = original_card_list.copy()
-                random.shuffle(remaining)
-                continue
-        break
+                if result.summary is not None:
+                    print(
+                        f"You answered {result.summary.percent_correct:.1f}% correct this round."
+                    )
+                    if not session.complete:
+                        print("Repeating wrong questions...\n")
+
+            print("\nQuiz complete!")
+            if session.offer_retry:
+                print("You scored below 100% in round 1.")
+                retry = (
+                    input("Would you like to retry the quiz? (y/n): ").strip().lower()
+                )
+                if retry != "n":
+                    session.retry(
+                        sampler.sample(args.num_questions) if sampler else None
+                    )
+                    continue
+            break
+
+
+# Subcommands dispatched from main(); anything else runs the interactive quiz
+COMMANDS = {
+    "export": export_questions,
+    "history": show_history,
+    "serve": serve,
+    "picks": play_picks,
+    "stats": show_stats,
+    "calibrate": calibrate,
+    "draft": play_draft,
+}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,197 @@
+"""
+Adaptive rating quiz: Elo-style skill and card difficulty estimates that pick
+the next card and number of segments to hit a target success rate.
+"""
+
+import math
+import random
+import sqlite3
+from bisect import bisect_left, insort
+from collections import deque
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import (
+    ADAPTIVE_CARD_K,
+    ADAPTIVE_LEARNER_K,
+    ADAPTIVE_SEGMENT_OFFSETS,
+    ADAPTIVE_TARGET,
+    CALIBRATION_NOISE,
+    SKILL_DB_PATH,
+)
+from .scheduler import CardKey
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS learners (
+    learner TEXT PRIMARY KEY,
+    skill REAL NOT NULL,
+    answers INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS cards (
+    set_name TEXT NOT NULL,
+    card TEXT NOT NULL,
+    difficulty REAL NOT NULL,
+    answers INTEGER NOT NULL,
+    PRIMARY KEY (set_name, card)
+) WITHOUT ROWID;
+"""
+
+
+def success_chance(skill: float, difficulty: float, offset: float = 0.0) -> float:
+    """Predicted chance of a correct answer (logistic in skill minus difficulty)."""
+    return 1.0 / (1.0 + math.exp(difficulty + offset - skill))
+
+
+def prior_difficulty(
+    rating: float, thresholds: Sequence[float], noise: float = CALIBRATION_NOISE
+) -> float:
+    """
+    Starting difficulty of a card nobody has answered yet: cards rated close
+    to a segment threshold are easy to misplace, so difficulty falls by one
+    per noise points of distance to the nearest threshold.
+    """
+    distance = min((abs(rating - t) for t in thresholds), default=noise)
+    return 1.0 - distance / noise
+
+
+class SkillStore:
+    """
+    Learner skills and card difficulties in one SQLite file. Skills are per
+    learner; difficulties are shared, so every learner's answers refine them.
+    """
+
+    def __init__(self, path: str = SKILL_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "SkillStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def skill(self, learner: str) -> float:
+        """Skill of a learner, 0.0 for a new one."""
+        row = self.conn.execute(
+            "SELECT skill FROM learners WHERE learner = ?", (learner,)
+        ).fetchone()
+        return 0.0 if row is None else row[0]
+
+    def difficulties(self, keys: Sequence[CardKey]) -> Dict[CardKey, float]:
+        """Stored difficulties of the keys that have been answered before."""
+        wanted = set(keys)
+        found: Dict[CardKey, float] = {}
+        for set_name in {set_name for set_name, _ in wanted}:
+            rows = self.conn.execute(
+                "SELECT card, difficulty FROM cards WHERE set_name = ?", (set_name,)
+            )
+            for card, difficulty in rows:
+                if (set_name, card) in wanted:
+                    found[set_name, card] = difficulty
+        return found
+
+    def save(self, learner: str, skill: float, key: CardKey, difficulty: float) -> None:
+        """Store the estimates after one answer by a learner to a card."""
+        with self.conn:
+            self.conn.execute(
+                "INSERT INTO learners VALUES (?, ?, 1) ON CONFLICT (learner)"
+                " DO UPDATE SET skill = excluded.skill, answers = answers + 1",
+                (learner, skill),
+            )
+            self.conn.execute(
+                "INSERT INTO cards VALUES (?, ?, ?, 1) ON CONFLICT (set_name, card)"
+                " DO UPDATE SET difficulty = excluded.difficulty, answers = answers + 1",
+                (*key, difficulty),
+            )
+
+
+class AdaptiveQuiz:
+    """
+    Question picker for one learner over a card list (one set or several
+    merged). Card difficulties sit in an index sorted by difficulty, so the
+    cards closest to the difficulty that gives the target success rate are
+    found by bisection; each answer updates the learner's skill and the card's
+    difficulty by one Elo step and moves the card within the index.
+    """
+
+    def __init__(
+        self,
+        difficulties: Sequence[float],
+        skill: float = 0.0,
+        target: float = ADAPTIVE_TARGET,
+        segment_offsets: Dict[int, float] = ADAPTIVE_SEGMENT_OFFSETS,
+        rng: Optional[random.Random] = None,
+        spread: int = 5,
+    ):
+        self.difficulties = list(difficulties)
+        self.skill = skill
+        self.target = target
+        self.segment_offsets = dict(segment_offsets)
+        self.rng = rng or random
+        self.spread = spread
+        self._index: List[Tuple[float, int]] = sorted(
+            (d, i) for i, d in enumerate(self.difficulties)
+        )
+        # Cards asked lately are skipped so the quiz does not repeat itself
+        self.recent = deque(maxlen=min(10, len(self.difficulties) // 2))
+
+    def _nearest(self, difficulty: float) -> List[int]:
+        """Up to spread card positions nearest a difficulty, skipping recent ones."""
+        index = self._index
+        right = bisect_left(index, (difficulty, -1))
+        left = right - 1
+        found: List[int] = []
+        while len(found) < self.spread and (left >= 0 or right < len(index)):
+            take_left = right >= len(index) or (
+                left >= 0
+                and difficulty - index[left][0] <= index[right][0] - difficulty
+            )
+            if take_left:
+                position = index[left][1]
+                left -= 1
+            else:
+                position = index[right][1]
+                right += 1
+            if position not in self.recent:
+                found.append(position)
+        return found
+
+    def next_question(self) -> Tuple[int, int]:
+        """
+        Card position and segment count of the next question: for every
+        segment count the cards nearest the difficulty that gives the target
+        success rate, keeping the count whose best card comes closest.
+        """
+        logit = math.log(self.target / (1.0 - self.target))
+        best = None
+        for segments, offset in self.segment_offsets.items():
+            candidates = self._nearest(self.skill - offset - logit)
+            if not candidates:
+                continue
+            miss = min(abs(self.predict(c, segments) - self.target) for c in candidates)
+            if best is None or miss < best[0]:
+                best = (miss, segments, candidates)
+        _, segments, candidates = best
+        return self.rng.choice(candidates), segments
+
+    def predict(self, position: int, segments: int) -> float:
+        """Predicted chance the learner answers a card right with segments offered."""
+        return success_chance(
+            self.skill, self.difficulties[position], self.segment_offsets[segments]
+        )
+
+    def update(self, position: int, segments: int, correct: bool) -> float:
+        """Apply one answer and return the chance that was predicted for it."""
+        chance = self.predict(position, segments)
+        surprise = (1.0 if correct else 0.0) - chance
+        self.skill += ADAPTIVE_LEARNER_K * surprise
+        old = self.difficulties[position]
+        new = old - ADAPTIVE_CARD_K * surprise
+        self.difficulties[position] = new
+        del self._index[bisect_left(self._index, (old, position))]
+        insort(self._index, (new, position))
+        self.recent.append(position)
+        return chance
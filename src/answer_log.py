@@ -0,0 +1,250 @@
+"""
+Append-only per-learner log of quiz and pick answers.
+"""
+
+import json
+import math
+import os
+import re
+import time
+from array import array
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from config import (
+    ANSWER_LOG_DIR,
+    ANSWER_LOG_BATCH,
+    CARD_NAME,
+    CARD_COLOR,
+    CARD_RARITY,
+)
+from .chunks import ChunkFormat
+
+LOG_SUFFIX = ".jsonl"
+ROLLUP_SUFFIX = ".bin"
+
+# Record fields by type; quiz answers store segment numbers in chosen/expected,
+# pick answers store pack positions and the best card's name
+STRING_FIELDS = (
+    "kind",
+    "set",
+    "card",
+    "color",
+    "rarity",
+    "rating_key",
+    "difficulty",
+    "best",
+)
+FLOAT_FIELDS = ("ts", "rating", "latency")
+INT_FIELDS = ("segments", "chosen", "expected", "correct", "round", "pick")
+# Stored for fields a record does not have
+MISSING_INT = -1
+
+# Rollup chunks are tagged with the JSONL offset covered so far, with the
+# string dictionaries in the header and one 8-byte column per field
+_FIELDS = FLOAT_FIELDS + INT_FIELDS + STRING_FIELDS
+ROLLUP_CHUNKS = ChunkFormat("answer rollup", b"MTGA", "Q", len(_FIELDS))
+
+
+def get_answer_log_path(learner: str) -> str:
+    """Return the answer log path of a learner."""
+    safe = re.sub(r"[^\w.-]", "_", learner)
+    return os.path.join(ANSWER_LOG_DIR, safe + LOG_SUFFIX)
+
+
+def get_rollup_path(log_path: str) -> str:
+    """Return the columnar rollup path of an answer log."""
+    return log_path[: -len(LOG_SUFFIX)] + ROLLUP_SUFFIX
+
+
+class AnswerLog:
+    """
+    Buffered writer for one learner's answer log.
+    Records are kept in memory and appended as JSON Lines batch_size at a
+    time (and on close), so answering never waits on a write per question.
+    """
+
+    def __init__(self, path: str, batch_size: int = ANSWER_LOG_BATCH):
+        self.path = path
+        self.batch_size = batch_size
+        self._buffer: List[str] = []
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def for_learner(cls, learner: str) -> "AnswerLog":
+        """Open the answer log of a learner."""
+        return cls(get_answer_log_path(learner))
+
+    def __enter__(self) -> "AnswerLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def append(self, record: Dict[str, object]) -> None:
+        """Buffer one record, writing the batch once it is full."""
+        self._buffer.append(json.dumps(record, separators=(",", ":")))
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self._buffer:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    def record_quiz(
+        self,
+        card: Dict[str, object],
+        set_name: str,
+        rating_key: str,
+        difficulty: str,
+        segments: int,
+        chosen: int,
+        expected: int,
+        latency: float,
+        round_num: int = 1,
+    ) -> None:
+        """Log a rating-quiz answer; chosen and expected are segment numbers."""
+        self.append(
+            {
+                "ts": time.time(),
+                "kind": "quiz",
+                "set": set_name,
+                "card": card[CARD_NAME],
+                "color": card.get(CARD_COLOR),
+                "rarity": card.get(CARD_RARITY),
+                "rating_key": rating_key,
+                "rating": float(card[rating_key]),
+                "difficulty": difficulty,
+                "segments": segments,
+                "chosen": chosen,
+                "expected": expected,
+                "correct": int(chosen == expected),
+                "latency": latency,
+                "round": round_num,
+            }
+        )
+
+    def record_picks(
+        self,
+        pick_results: Sequence[tuple],
+        picks: Sequence[int],
+        pack_cards: Sequence[Dict[str, object]],
+        set_name: str,
+        rating_key: str,
+        latency: float,
+    ) -> None:
+        """
+        Log one pack's picks as scored by evaluate_picks, one record per pick.
+        latency is the time taken to enter the whole selection.
+        """
+        by_name = {card[CARD_NAME]: card for card in pack_cards}
+        now = time.time()
+        for result, position in zip(pick_results, picks):
+            card = by_name.get(result[1], {})
+            rating = card.get(rating_key)
+            self.append(
+                {
+                    "ts": now,
+                    "kind": "pick",
+                    "set": set_name,
+                    "card": result[1],
+                    "color": card.get(CARD_COLOR),
+                    "rarity": card.get(CARD_RARITY),
+                    "rating_key": rating_key,
+                    "rating": None if rating is None else float(rating),
+                    "pick": result[0],
+                    "chosen": position,
+                    "correct": int(result[2]),
+                    "best": result[1] if result[2] else result[3],
+                    "latency": latency,
+                }
+            )
+
+
+def iter_answers(log_path: str, start: int = 0) -> Iterator[Dict[str, object]]:
+    """Stream the records of an answer log from a byte offset."""
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def rollup(log_path: str) -> int:
+    """
+    Append the answers logged since the last rollup to the columnar rollup
+    file as one chunk, and return how many were added.
+    String fields are dictionary-encoded per chunk.
+    """
+    rollup_path = get_rollup_path(log_path)
+    start = ROLLUP_CHUNKS.last_tag(rollup_path)
+    if not os.path.exists(log_path):
+        return 0
+    with open(log_path, "rb") as f:
+        f.seek(start)
+        data = f.read()
+    # Only whole lines; a batch still being written is picked up next time
+    data = data[: data.rfind(b"\n") + 1]
+    if not data:
+        return 0
+    end = start + len(data)
+    # One parser call for the whole batch, then one pass per column
+    lines = [line for line in data.splitlines() if line.strip()]
+    records = json.loads(b"[" + b",".join(lines) + b"]")
+    rows = len(records)
+    columns = []
+    for name in FLOAT_FIELDS:
+        values = [record.get(name) for record in records]
+        columns.append(array("d", [math.nan if v is None else v for v in values]))
+    for name in INT_FIELDS:
+        values = [record.get(name) for record in records]
+        columns.append(array("q", [MISSING_INT if v is None else v for v in values]))
+    strings: Dict[str, List[str]] = {}
+    for name in STRING_FIELDS:
+        values = [record.get(name) or "" for record in records]
+        dictionary = {value: code for code, value in enumerate(dict.fromkeys(values))}
+        strings[name] = list(dictionary)
+        columns.append(array("q", map(dictionary.__getitem__, values)))
+    ROLLUP_CHUNKS.append(rollup_path, end, rows, {"strings": strings}, columns)
+    return rows
+
+
+def iter_rollup_chunks(
+    rollup_path: str, fields: Optional[Sequence[str]] = None
+) -> Iterator[Tuple[Dict[str, array], Dict[str, List[str]]]]:
+    """
+    Yield every chunk of a rollup as its columns (only fields, if given),
+    with string fields left as dictionary codes, and the chunk's string
+    dictionaries.
+    """
+    for chunk in ROLLUP_CHUNKS.read(rollup_path):
+        columns = {
+            name: chunk.column(position, "d" if name in FLOAT_FIELDS else "q")
+            for position, name in enumerate(_FIELDS)
+            if fields is None or name in fields
+        }
+        yield columns, chunk.header["strings"]
+
+
+def read_rollup(rollup_path: str) -> Dict[str, List]:
+    """
+    Load every chunk of a rollup as whole columns: float and int fields as
+    arrays, string fields as lists of strings ('' where absent).
+    """
+    columns: Dict[str, object] = {name: array("d") for name in FLOAT_FIELDS}
+    columns.update({name: array("q") for name in INT_FIELDS})
+    columns.update({name: [] for name in STRING_FIELDS})
+    for chunk, strings in iter_rollup_chunks(rollup_path):
+        for name, column in chunk.items():
+            if name in STRING_FIELDS:
+                dictionary = strings[name]
+                columns[name].extend([dictionary[code] for code in column])
+            else:
+                columns[name].extend(column)
+    return columns
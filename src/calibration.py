@@ -0,0 +1,176 @@
+"""
+Monte Carlo calibration of quiz difficulty with simulated learners.
+
+A simulated learner knows every card's rating up to Gaussian noise: it answers
+from the true rating plus a fresh error with standard deviation noise (in
+rating points). Running such learners through many generated questions shows
+how hard each difficulty level and question setting is in practice.
+"""
+
+import random
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Union
+
+from .distribution import RatingDistribution
+from .parallel import chunk_rng, chunk_sizes, resolve_seed, run_chunks
+from .quiz import DEFAULT_NUM_CHOICES, make_question
+
+# Neighbor chances of the rating question simulated by default
+NEIGHBOR_GRID = (0.0, 0.25, 0.5, 0.75, 1.0)
+# Rating key of the minimal card dicts simulated questions are built from
+_RATING = "rating"
+
+
+@dataclass(frozen=True)
+class SegmentCell:
+    """First round of the segment quiz with this many equal-count segments."""
+
+    segments: int
+    noise: float
+
+
+@dataclass(frozen=True)
+class QuestionCell:
+    """Rating question (make_question) with this step and neighbor chance."""
+
+    step: float
+    neighbor_prob: float
+    noise: float
+
+
+Cell = Union[SegmentCell, QuestionCell]
+
+
+def simulate_segments(
+    ratings: Sequence[float],
+    thresholds: Sequence[float],
+    noise: float,
+    count: int,
+    rng: random.Random,
+) -> int:
+    """
+    Correct answers out of count segment-quiz questions, each on a random card
+    placed in the segment of its noisy rating (correct_option with every
+    segment offered is bisect_right over the thresholds).
+    """
+    choice, gauss = rng.choice, rng.gauss
+    correct = 0
+    for _ in range(count):
+        rating = choice(ratings)
+        estimate = rating + gauss(0.0, noise)
+        if bisect_right(thresholds, estimate) == bisect_right(thresholds, rating):
+            correct += 1
+    return correct
+
+
+def simulate_questions(
+    ratings: Sequence[float],
+    min_val: float,
+    max_val: float,
+    cell: QuestionCell,
+    count: int,
+    rng: random.Random,
+    num_choices: int = DEFAULT_NUM_CHOICES,
+) -> int:
+    """
+    Correct answers out of count rating questions, each on a random card and
+    answered with the option nearest the learner's noisy rating.
+    """
+    cards = [{_RATING: rating} for rating in ratings]
+    correct = 0
+    for _ in range(count):
+        card = rng.choice(cards)
+        question = make_question(
+            card,
+            _RATING,
+            min_val,
+            max_val,
+            step=cell.step,
+            num_choices=num_choices,
+            rng=rng,
+            neighbor_prob=cell.neighbor_prob,
+        )
+        estimate = card[_RATING] + rng.gauss(0.0, cell.noise)
+        options = question.options
+        chosen = min(range(len(options)), key=lambda i: abs(options[i] - estimate))
+        if chosen in question.correct_indices:
+            correct += 1
+    return correct
+
+
+def _simulate_chunk(args) -> int:
+    """Worker entry point: correct answers in one chunk of one cell."""
+    calibrator, cell, chunk, count = args
+    rng = chunk_rng(calibrator.seed, cell, chunk)
+    if isinstance(cell, SegmentCell):
+        thresholds = calibrator.distribution.thresholds(cell.segments)
+        return simulate_segments(calibrator.ratings, thresholds, cell.noise, count, rng)
+    return simulate_questions(
+        calibrator.ratings,
+        calibrator.distribution.min,
+        calibrator.distribution.max,
+        cell,
+        count,
+        rng,
+        calibrator.num_choices,
+    )
+
+
+class Calibrator:
+    """
+    Accuracy of simulated learners per cell (question kind and settings).
+    Every cell is simulated in seeded chunks (see run_chunks).
+    """
+
+    def __init__(
+        self,
+        ratings: Sequence[float],
+        distribution: RatingDistribution,
+        seed: Optional[int] = None,
+        chunk_size: int = 20000,
+        num_choices: int = DEFAULT_NUM_CHOICES,
+    ):
+        self.ratings = [float(rating) for rating in ratings]
+        self.distribution = distribution
+        self.seed = resolve_seed(seed)
+        self.chunk_size = chunk_size
+        self.num_choices = num_choices
+
+    def accuracy(
+        self, cells: Sequence[Cell], count: int, workers: int = 1
+    ) -> Dict[Cell, float]:
+        """Fraction of count simulated answers per cell that were correct."""
+        jobs = [
+            (self, cell, *chunk)
+            for cell in cells
+            for chunk in chunk_sizes(count, self.chunk_size)
+        ]
+        results = run_chunks(_simulate_chunk, jobs, workers)
+        correct = dict.fromkeys(cells, 0)
+        for (_, cell, _, _), n in zip(jobs, results):
+            correct[cell] += n
+        return {cell: correct[cell] / count for cell in cells}
+
+
+def recommend_segments(
+    accuracy: Dict[int, float], targets: Dict[str, float]
+) -> Dict[str, int]:
+    """Segment count per difficulty level whose accuracy is nearest its target."""
+    return {
+        level: min(accuracy, key=lambda s: (abs(accuracy[s] - target), s))
+        for level, target in targets.items()
+    }
+
+
+def recommend_neighbor_prob(accuracy: Dict[float, float], target: float) -> float:
+    """
+    Neighbor chance expected to give the target accuracy, interpolated
+    linearly between the simulated chances; the nearest simulated chance when
+    the target is out of their range.
+    """
+    points: List = sorted(accuracy.items())
+    for (p0, a0), (p1, a1) in zip(points, points[1:]):
+        if a0 != a1 and min(a0, a1) <= target <= max(a0, a1):
+            return p0 + (target - a0) * (p1 - p0) / (a1 - a0)
+    return min(points, key=lambda point: abs(point[1] - target))[0]
@@ -2,33 +2,185 @@
 Card operations including pack generation and filtering.
 """
 
-from typing import List, Dict, Set, Optional
+import heapq
+import math
+import random
+from dataclasses import dataclass
+from itertools import islice
+from typing import List, Dict, Set, Optional, Iterator, Sequence, Tuple
 from random import shuffle
 
 from config import (
     CARD_RARITY,
     CARD_OHWR,
+    PACK_COMMONS,
+    PACK_UNCOMMONS,
+    PACK_RARES,
+    MYTHIC_UPGRADE_ODDS,
 )
+from .index import CardIndex, iter_row_ids
+from .table import CardTable, CardRow, parse_rating
+
+# Sort key given to cards without a rating so they rank below every real value
+MISSING_RANK = float("-inf")
+# Inputs at least this long use a heap for top-k instead of a full sort
+TOP_K_HEAP_MIN_SIZE = 512
+
+
+@dataclass(frozen=True)
+class PackSlot:
+    """A group of pack slots of one rarity, optionally upgraded to another rarity."""
+
+    rarity: str
+    count: int
+    upgrade_rarity: Optional[str] = None
+    upgrade_odds: float = 0.0
+
+
+DEFAULT_PACK_TEMPLATE = [
+    PackSlot("C", PACK_COMMONS),
+    PackSlot("U", PACK_UNCOMMONS),
+    PackSlot("R", PACK_RARES, upgrade_rarity="M", upgrade_odds=MYTHIC_UPGRADE_ODDS),
+]
 
 
 def filter_cards_by_rarity(
     cards: List[Dict[str, str]], rarity: str
 ) -> List[Dict[str, str]]:
-    """Filter cards by rarity."""
+    """Filter cards by rarity. A CardTable is scanned by its rarity column."""
+    if isinstance(cards, CardTable):
+        column = cards.column(CARD_RARITY)
+        return cards.rows(i for i, r in enumerate(column) if r == rarity)
     return [card for card in cards if card[CARD_RARITY] == rarity]
 
 
+def rating_rank(value) -> float:
+    """
+    Turn a rating cell into a sortable float.
+    Percentage strings are parsed; missing values (None, '', NaN, unparsable)
+    rank below every real rating.
+    """
+    if isinstance(value, str):
+        value = parse_rating(value)
+    elif value is None:
+        return MISSING_RANK
+    value = float(value)
+    return MISSING_RANK if math.isnan(value) else value
+
+
+def top_k_indices(
+    values: Sequence, k: Optional[int] = None, ranked: bool = False
+) -> List[int]:
+    """
+    Return the positions of the k highest values in one pass (all if k is None),
+    best first. Ties keep their original order and missing values come last.
+    Pass ranked=True when the values already went through rating_rank.
+    """
+    ranks = values if ranked else [rating_rank(v) for v in values]
+    positions = range(len(ranks))
+    if k is None or len(ranks) < TOP_K_HEAP_MIN_SIZE or k * 8 > len(ranks):
+        # Timsort runs in C and beats a Python-level heap on pack-sized inputs
+        order = sorted(positions, key=ranks.__getitem__, reverse=True)
+        return order if k is None else order[:k]
+    return heapq.nlargest(k, positions, key=ranks.__getitem__)
+
+
+def top_k_by_rating(
+    cards: List[Dict[str, str]],
+    k: Optional[int] = None,
+    rating_key: str = CARD_OHWR,
+    drop_missing: bool = False,
+) -> List[Dict[str, str]]:
+    """
+    Get the best k cards by any rating column, best first (all cards if k is None).
+    Cards without a rating are ordered last, or left out with drop_missing.
+    """
+    cards = list(cards)
+    order = top_k_indices([card.get(rating_key) for card in cards], k)
+    best = [cards[i] for i in order]
+    if drop_missing:
+        best = [c for c in best if rating_rank(c.get(rating_key)) != MISSING_RANK]
+    return best
+
+
 def remove_top_n_by_winrate(
     pack_cards: List[Dict[str, str]], cards_to_remove: int
 ) -> List[Dict[str, str]]:
     """Remove the top N cards by win rate from the pack."""
     if cards_to_remove > 0:
-        pack_cards = sorted(pack_cards, key=lambda x: x[CARD_OHWR], reverse=True)[
-            cards_to_remove:
-        ]
+        pack_cards = top_k_by_rating(pack_cards)[cards_to_remove:]
     return pack_cards
 
 
-def get_winrate_order(pack_cards: List[Dict[str, str]]) -> List[Dict[str, str]]:
-    """Get cards sorted by win rate in descending order."""
-    return sorted(pack_cards, key=lambda x: x[CARD_OHWR], reverse=True)
+def get_winrate_order(
+    pack_cards: List[Dict[str, str]],
+    k: Optional[int] = None,
+    rating_key: str = CARD_OHWR,
+) -> List[Dict[str, str]]:
+    """Get cards sorted by win rate in descending order, optionally only the top k."""
+    return top_k_by_rating(pack_cards, k, rating_key)
+
+
+class PackGenerator:
+    """
+    Booster pack generator over a CardIndex.
+    Per-rarity row-id pools are precomputed once; packs are lists of row ids
+    drawn with a seedable RNG, so simulations never touch card rows.
+    """
+
+    def __init__(
+        self,
+        index: CardIndex,
+        template: Optional[List[PackSlot]] = None,
+        seed: Optional[int] = None,
+        selection: Optional[int] = None,
+    ):
+        self.table = index.table
+        self.rng = random.Random(seed)
+        if selection is None:
+            selection = index.select()
+        template = DEFAULT_PACK_TEMPLATE if template is None else template
+        pools: Dict[str, Tuple[int, ...]] = {}
+        for slot in template:
+            for rarity in (slot.rarity, slot.upgrade_rarity):
+                if rarity is not None and rarity not in pools:
+                    bitmap = index.by_rarity.get(rarity, 0) & selection
+                    pools[rarity] = tuple(iter_row_ids(bitmap))
+        # Slots of the same rarity are drawn together so a pack never repeats a card
+        merged: Dict[Tuple, int] = {}
+        for slot in template:
+            upgrade = slot.upgrade_rarity if pools.get(slot.upgrade_rarity) else None
+            key = (slot.rarity, upgrade, slot.upgrade_odds if upgrade else 0.0)
+            merged[key] = merged.get(key, 0) + slot.count
+        for (rarity, upgrade, _), count in merged.items():
+            for r in (rarity, upgrade):
+                if r is not None and len(pools[r]) < count:
+                    raise ValueError(
+                        f"Not enough cards of rarity '{r}' for {count} pack slot(s)"
+                    )
+        self._pools = pools
+        self._slots = [
+            (pools[rarity], count, pools[upgrade] if upgrade else None, odds)
+            for (rarity, upgrade, odds), count in merged.items()
+        ]
+        self.pack_size = sum(merged.values())
+
+    def generate(self) -> List[int]:
+        """Generate one pack as a list of row ids."""
+        sample = self.rng.sample
+        roll = self.rng.random
+        pack = []
+        for pool, count, upgrade_pool, odds in self._slots:
+            if upgrade_pool is not None and roll() < odds:
+                pool = upgrade_pool
+            pack.extend(sample(pool, count))
+        return pack
+
+    def packs(self, count: Optional[int] = None) -> Iterator[List[int]]:
+        """Stream packs lazily; an endless stream if count is None."""
+        stream = iter(self.generate, None)
+        return stream if count is None else islice(stream, count)
+
+    def generate_rows(self) -> List[CardRow]:
+        """Generate one pack as card rows, e.g. for print_pack."""
+        return self.table.rows(self.generate())
@@ -0,0 +1,126 @@
+"""
+Append-only files of self-contained columnar chunks (rating history, answer
+rollups).
+
+A chunk is a fixed prefix (magic, one format-specific tag such as a date or a
+file offset, row count, header length), a JSON header, padding to 8 bytes,
+then the chunk's columns of 8-byte values (float64 or int64) back to back.
+"""
+
+import json
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, Iterator, Sequence, Union
+
+
+def _padding(length: int) -> int:
+    """Bytes needed to align a chunk section to 8 bytes."""
+    return -length % 8
+
+
+class Chunk:
+    """One chunk read from a file; columns are copied out on request."""
+
+    def __init__(
+        self, tag: int, rows: int, header: Dict[str, object], view, offset: int
+    ):
+        self.tag = tag
+        self.rows = rows
+        self.header = header
+        self._view = view
+        self._offset = offset
+
+    def column(self, position: int, typecode: str = "d") -> array:
+        """The chunk's column at a position, as float64 ('d') or int64 ('q')."""
+        column = array(typecode)
+        start = self._offset + position * 8 * self.rows
+        column.frombytes(self._view[start : start + 8 * self.rows])
+        if self.header["byteorder"] != sys.byteorder:
+            column.byteswap()
+        return column
+
+
+class ChunkFormat:
+    """
+    Framing of one kind of chunk file. tag is the struct code of the prefix
+    tag ('I' or 'Q'); width is the number of columns per chunk, or the header
+    key whose list names them when it varies from chunk to chunk.
+    """
+
+    def __init__(self, name: str, magic: bytes, tag: str, width: Union[int, str]):
+        self.name = name
+        self.magic = magic
+        self.prefix = struct.Struct(f"<4s{tag}II")
+        self.width = width
+
+    def pack(
+        self, tag: int, rows: int, header: Dict[str, object], columns: Sequence[array]
+    ) -> bytes:
+        """One chunk, ready to append to a file."""
+        encoded = json.dumps({**header, "byteorder": sys.byteorder}).encode("utf-8")
+        parts = [
+            self.prefix.pack(self.magic, tag, rows, len(encoded)),
+            encoded,
+            b"\0" * _padding(self.prefix.size + len(encoded)),
+        ]
+        parts.extend(column.tobytes() for column in columns)
+        return b"".join(parts)
+
+    def append(
+        self,
+        path: str,
+        tag: int,
+        rows: int,
+        header: Dict[str, object],
+        columns: Sequence[array],
+    ) -> None:
+        """Append one chunk to a file."""
+        with open(path, "ab") as f:
+            f.write(self.pack(tag, rows, header, columns))
+
+    def _width(self, header: Dict[str, object]) -> int:
+        return self.width if isinstance(self.width, int) else len(header[self.width])
+
+    def chunks(self, data: bytes) -> Iterator[Chunk]:
+        """Every chunk of a file's contents, in order."""
+        view = memoryview(data)
+        prefix, offset = self.prefix, 0
+        while offset + prefix.size <= len(data):
+            magic, tag, rows, header_len = prefix.unpack_from(data, offset)
+            if magic != self.magic:
+                raise ValueError(f"Corrupt {self.name}")
+            offset += prefix.size
+            header = json.loads(data[offset : offset + header_len])
+            offset += header_len + _padding(prefix.size + header_len)
+            yield Chunk(tag, rows, header, view, offset)
+            offset += self._width(header) * 8 * rows
+
+    def read(self, path: str) -> Iterator[Chunk]:
+        """Every chunk of a file, none if it does not exist."""
+        if not os.path.exists(path):
+            return iter(())
+        with open(path, "rb") as f:
+            return self.chunks(f.read())
+
+    def last_tag(self, path: str) -> int:
+        """
+        Tag of the last chunk of a file, 0 if it has none. Needs a fixed
+        width: only the prefixes are read, seeking over headers and columns.
+        """
+        tag = 0
+        if not os.path.exists(path):
+            return tag
+        prefix = self.prefix
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            offset = 0
+            while offset + prefix.size <= size:
+                f.seek(offset)
+                magic, tag, rows, header_len = prefix.unpack(f.read(prefix.size))
+                if magic != self.magic:
+                    raise ValueError(f"Corrupt {self.name}: {path}")
+                offset += prefix.size + header_len
+                offset += _padding(prefix.size + header_len) + self.width * 8 * rows
+        return tag
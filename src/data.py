@@ -5,12 +5,35 @@ Data management utilities for loading and validating card data.
 import csv
 import os
 import glob
+import struct
 import sys
-from datetime import datetime, timedelta
-from typing import List, Dict, Set
+from datetime import date, datetime, timedelta
+from dataclasses import dataclass, field
+from typing import List, Dict, Iterable, Iterator, Optional, Sequence, Set, Tuple
 
-from config import QUIZ_RATING_KEY, STALE_DATA_CUTOFF_DAYS, CARD_OHWR
+from config import (
+    QUIZ_RATING_KEY,
+    STALE_DATA_CUTOFF_DAYS,
+    CARD_OHWR,
+    CARD_NAME,
+    CARD_RARITY,
+    CARD_SET,
+)
 from .display import make_clickable_link
+from .index import CardIndex
+from .table import CardTable
+
+
+def get_snapshot_date(csv_file_path: str) -> date:
+    """Extract the date from a filename like 'card-ratings-2025-06-18.csv'."""
+    filename = os.path.basename(csv_file_path)
+    date_str = filename.replace("card-ratings-", "").replace(".csv", "")
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
+def list_snapshot_csvs(set_name: str) -> List[str]:
+    """Return every dated card-ratings CSV for a set, oldest first."""
+    return sorted(glob.glob(f"resources/sets/{set_name}/card-ratings-*.csv"))
 
 
 def find_most_recent_csv(set_name: str, testing=False) -> str:
@@ -29,9 +52,7 @@ def find_most_recent_csv(set_name: str, testing=False) -> str:
     # Extract date from filename and check if it's more than 1 week old
     filename = os.path.basename(most_recent_file)
     try:
-        # Extract date from filename like 'card-ratings-2025-06-18.csv'
-        date_str = filename.replace("card-ratings-", "").replace(".csv", "")
-        file_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+        file_date = get_snapshot_date(most_recent_file)
         current_date = datetime.now().date()
 
         clickable_link = make_clickable_link(
@@ -56,28 +77,283 @@ def find_most_recent_csv(set_name: str, testing=False) -> str:
     return most_recent_file
 
 
-def load_card_data(set_name: str) -> List[Dict[str, str]]:
-    """Load card data from the most recent CSV file for the given set."""
-    csv_file_path = find_most_recent_csv(set_name)
-    cards = []
+# Suffix of the binary snapshot written next to each parsed CSV
+CACHE_SUFFIX = ".cache"
+
+
+def get_cache_path(csv_file_path: str) -> str:
+    """Return the binary cache path for a card-ratings CSV."""
+    return csv_file_path + CACHE_SUFFIX
+
+
+def _source_signature(csv_file_path: str) -> Dict[str, object]:
+    """Describe the source CSV so a stale cache can be detected."""
+    stat = os.stat(csv_file_path)
+    return {
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "rating_key": QUIZ_RATING_KEY,
+    }
+
+
+def _column_position(header: List[str], column: str, csv_file_path: str) -> int:
+    """Position of a column in a CSV header, with a readable error if absent."""
+    try:
+        return header.index(column)
+    except ValueError:
+        raise ValueError(f"Column '{column}' not found in {csv_file_path}") from None
+
 
-    with open(csv_file_path, encoding="utf-8-sig") as csvfile:
+def iter_card_csv(
+    csv_file_path: str,
+    columns: Optional[Sequence[str]] = None,
+    rarities: Optional[Iterable[str]] = None,
+    exclude: Optional[Set[str]] = None,
+    rating_key: Optional[str] = QUIZ_RATING_KEY,
+) -> Iterator[Tuple[str, ...]]:
+    """
+    Stream a 17lands card-ratings CSV one row at a time.
+    The first item is the header, followed by the raw string cells of each
+    card, both restricted to columns (all columns if None, in that order).
+    Cards of other rarities, excluded names and cards without a rating_key
+    value (unless rating_key is None) are dropped while parsing, so memory
+    stays constant whatever the size of the file.
+    """
+    with open(csv_file_path, encoding="utf-8-sig", newline="") as csvfile:
         csvreader = csv.reader(csvfile, delimiter=",", quotechar='"')
+        header = next(csvreader, [])
+        if columns is None:
+            columns = header
+        positions = [_column_position(header, c, csv_file_path) for c in columns]
+        checks = []
+        if rating_key is not None:
+            # Filter out cards without OH WR data
+            rating_index = _column_position(header, rating_key, csv_file_path)
+            checks.append(lambda row: row[rating_index] != "")
+        if rarities is not None:
+            rarities = frozenset(rarities)
+            rarity_index = _column_position(header, CARD_RARITY, csv_file_path)
+            checks.append(lambda row: row[rarity_index] in rarities)
+        if exclude:
+            name_index = _column_position(header, CARD_NAME, csv_file_path)
+            checks.append(lambda row: row[name_index] not in exclude)
 
-        first = True
+        yield tuple(columns)
         for row in csvreader:
-            if first:
-                card_fields = row
-                first = False
-            else:
-                new_card = {}
-                for j in range(0, len(card_fields)):
-                    new_card[card_fields[j]] = row[j]
-                cards.append(new_card)
+            if row and all(check(row) for check in checks):
+                yield tuple([row[i] for i in positions])
+
+
+def read_card_csv(
+    csv_file_path: str,
+    set_name: str = None,
+    rating_key: str = QUIZ_RATING_KEY,
+    columns: Optional[Sequence[str]] = None,
+    rarities: Optional[Iterable[str]] = None,
+    exclude: Optional[Set[str]] = None,
+) -> CardTable:
+    """
+    Parse a 17lands card-ratings CSV into a CardTable.
+    Cards without a rating_key value are skipped unless rating_key is None;
+    columns, rarities and exclude are applied while streaming (see iter_card_csv).
+    """
+    rows = iter_card_csv(csv_file_path, columns, rarities, exclude, rating_key)
+    header = next(rows)
+    return CardTable.from_rows(header, rows, source=csv_file_path, set_name=set_name)
+
+
+def load_cached_table(csv_file_path: str) -> CardTable:
+    """
+    Load the binary snapshot for a CSV.
+    Returns None if there is no cache or the CSV changed since it was written.
+    """
+    try:
+        with open(get_cache_path(csv_file_path), "rb") as f:
+            table, meta = CardTable.from_bytes(f.read())
+    except (OSError, ValueError, KeyError, struct.error):
+        return None
+    if meta != _source_signature(csv_file_path):
+        return None
+    return table
+
+
+def write_table_cache(table: CardTable, csv_file_path: str) -> None:
+    """Write the binary snapshot for a CSV, ignoring unwritable directories."""
+    cache_path = get_cache_path(csv_file_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(table.to_bytes(_source_signature(csv_file_path)))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def load_card_data(
+    set_name: str,
+    use_cache: bool = True,
+    columns: Optional[Sequence[str]] = None,
+    rarities: Optional[Iterable[str]] = None,
+    exclude: Optional[Set[str]] = None,
+) -> CardTable:
+    """
+    Load card data from the most recent CSV file for the given set.
+    The parsed table is cached next to the CSV and reused until the CSV changes.
+    Passing columns, rarities or exclude streams a reduced table straight from
+    the CSV instead; the cache always holds the full table.
+    """
+    csv_file_path = find_most_recent_csv(set_name)
+    if columns is not None or rarities is not None or exclude:
+        return read_card_csv(
+            csv_file_path,
+            set_name,
+            columns=columns,
+            rarities=rarities,
+            exclude=exclude,
+        )
+    if use_cache:
+        table = load_cached_table(csv_file_path)
+        if table is not None:
+            table.set_name = set_name
+            return table
+
+    table = read_card_csv(csv_file_path, set_name)
+    if use_cache:
+        write_table_cache(table, csv_file_path)
+    return table
+
+
+@dataclass
+class SnapshotDelta:
+    """Differences applied to a card table by import_snapshot."""
+
+    source: str
+    changed: List[str] = field(default_factory=list)
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    # Row id -> {column: (old value, new value)} for every cell that changed
+    cells: Dict[int, Dict[str, Tuple[object, object]]] = field(default_factory=dict)
+
+
+def import_snapshot(
+    table: CardTable, csv_file_path: str = None, index: CardIndex = None
+) -> SnapshotDelta:
+    """
+    Bring a loaded table up to date with a newer card-ratings CSV in place.
+    The new snapshot is diffed against the table by card name: only changed
+    cells are written, new cards are appended and cards missing from the new
+    snapshot lose their ratings and counts (like unrated cards at load time)
+    and are removed from the index. The index and memoized rating
+    distributions are patched for the touched rows only.
+    Defaults to the most recent CSV of the table's set. Tables merged from
+    several sets are not supported: import each set before merging.
+    """
+    # Imported here because distribution builds on this module
+    from .distribution import apply_snapshot_delta
+
+    if CARD_SET in table.strings:
+        raise ValueError("Cannot import a snapshot into a table of several sets")
+    if csv_file_path is None:
+        csv_file_path = find_most_recent_csv(table.set_name)
+    delta = SnapshotDelta(source=csv_file_path)
+    if csv_file_path == table.source:
+        return delta
+
+    new = load_cached_table(csv_file_path)
+    if new is None:
+        new = read_card_csv(csv_file_path, table.set_name)
+        write_table_cache(new, csv_file_path)
+    names = table.column(CARD_NAME)
+    row_ids = {name: i for i, name in enumerate(names)}
+    columns = [c for c in table.columns if c in new.columns and c != CARD_NAME]
+
+    seen = set()
+    for new_id, name in enumerate(new.column(CARD_NAME)):
+        row_id = row_ids.get(name)
+        seen.add(row_id)
+        if row_id is None:
+            row_id = table.append_row(new[new_id])
+            delta.added.append(name)
+            delta.cells[row_id] = {c: (None, table.value(row_id, c)) for c in columns}
+            continue
+        cells = {}
+        for column in columns:
+            old_value, new_value = table.value(row_id, column), new.value(
+                new_id, column
+            )
+            if old_value != new_value:
+                table.set_value(row_id, column, new_value)
+                cells[column] = (old_value, new_value)
+        if cells:
+            delta.changed.append(name)
+            delta.cells[row_id] = cells
+
+    removed = []
+    for row_id, name in enumerate(names[: len(names) - len(delta.added)]):
+        if row_id in seen:
+            continue
+        removed.append(row_id)
+        cells = {}
+        for columns, empty in ((table.floats, None), (table.counts, 0)):
+            for column in columns:
+                old_value = table.value(row_id, column)
+                if old_value not in (None, empty):
+                    table.set_value(row_id, column, empty)
+                    cells[column] = (old_value, empty)
+        if cells:
+            delta.removed.append(name)
+            delta.cells[row_id] = cells
+
+    old_source = table.source
+    table.source = csv_file_path
+    if index is not None:
+        index.refresh(delta.cells)
+        index.remove(removed)
+    apply_snapshot_delta(table, old_source, delta)
+    return delta
+
+
+def refresh_snapshot(
+    table: CardTable, index: CardIndex = None
+) -> Optional[SnapshotDelta]:
+    """
+    Import the newest CSV of the table's set if the table was not loaded from
+    it, returning the delta, or None when there is nothing newer. Unlike
+    find_most_recent_csv this never checks for stale data or exits, so a
+    long-running server keeps serving whatever the newest snapshot is.
+    """
+    files = list_snapshot_csvs(table.set_name)
+    if not files or files[-1] == table.source:
+        return None
+    return import_snapshot(table, files[-1], index)
+
+
+def discover_sets() -> List[str]:
+    """Return the set codes under resources/sets/ that have card-ratings CSVs."""
+    pattern = "resources/sets/*/card-ratings-*.csv"
+    return sorted({os.path.basename(os.path.dirname(f)) for f in glob.glob(pattern)})
+
+
+def load_multi_set(
+    set_names: List[str] = None, max_workers: int = None, processes: bool = False
+) -> CardTable:
+    """
+    Load several sets concurrently and merge them into one CardTable whose
+    CARD_SET column tags each card with its set code. Defaults to every
+    discovered set. Threads suit cached loads; use processes to parse many
+    uncached CSVs on several cores.
+    """
+    # Imported here so single-set loads never pay for the executor machinery
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 
-    # Filter out cards without OH WR data
-    cards = [card for card in cards if card[QUIZ_RATING_KEY] != ""]
-    return cards
+    set_names = discover_sets() if not set_names else list(set_names)
+    if not set_names:
+        raise FileNotFoundError("No sets with card-ratings CSV files found")
+    executor_class = ProcessPoolExecutor if processes else ThreadPoolExecutor
+    with executor_class(max_workers=max_workers) as executor:
+        tables = list(executor.map(load_card_data, set_names))
+    return CardTable.concat(tables)
 
 
 def load_exclude_list(set_name: str) -> set:
@@ -96,10 +372,18 @@ def load_exclude_list(set_name: str) -> set:
     return exclude
 
 
-def convert_keys_to_float(cards: List[Dict[str, str]]) -> None:
-    """Convert percentage strings to float values in place."""
+def convert_keys_to_float(
+    cards: List[Dict[str, str]], keys: Iterable[str] = (QUIZ_RATING_KEY,)
+) -> None:
+    """
+    Convert percentage strings to float values in place.
+    A CardTable is already typed at load time and is left untouched.
+    """
+    if isinstance(cards, CardTable):
+        return
     for card in cards:
-        try:
-            card[QUIZ_RATING_KEY] = float(card[QUIZ_RATING_KEY].replace("%", ""))
-        except (AttributeError, ValueError):
-            pass
+        for key in keys:
+            try:
+                card[key] = float(card[key].replace("%", ""))
+            except (AttributeError, ValueError):
+                pass
@@ -0,0 +1,110 @@
+"""
+Deck estimates for drafted pools: the best 23 cards of a pool in every color
+pair and the pool's strength as the mean win rate of its best deck.
+"""
+
+import math
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Optional, Sequence, Tuple
+
+from config import CARD_COLOR, CARD_GIHWR, CARD_OHWR
+from .table import CardTable
+
+COLORS = "WUBRG"
+COLOR_PAIRS = tuple(a + b for a, b in combinations(COLORS, 2))
+# Non-land cards in a limited deck
+DECK_SPELLS = 23
+
+
+@lru_cache(maxsize=None)
+def castable_pairs(color: str) -> Tuple[int, ...]:
+    """Indexes into COLOR_PAIRS of the pairs that can cast a card of this color."""
+    colors = set(color) & set(COLORS)
+    return tuple(i for i, pair in enumerate(COLOR_PAIRS) if colors <= set(pair))
+
+
+@dataclass(frozen=True)
+class DeckEstimate:
+    """Best deck of a pool: its color pair, card row ids and mean win rate."""
+
+    pair: str
+    cards: Tuple[int, ...]
+    win_rate: float
+
+
+class DeckEstimator:
+    """
+    Scores pools of one card table. Every row's win rate (the first of keys
+    the row has a value for) and castable color pairs are worked out once, and
+    rows are ranked by win rate, so a pool is scored by sorting its ranks and
+    filling each pair's deck from the top in one pass. Unrated cards never
+    make a deck; slots a pair cannot fill count as filler, by default the
+    lowest win rate in the table.
+    """
+
+    def __init__(
+        self,
+        table: CardTable,
+        keys: Sequence[str] = (CARD_GIHWR, CARD_OHWR),
+        size: int = DECK_SPELLS,
+        filler: Optional[float] = None,
+    ):
+        self.table = table
+        self.keys = [key for key in keys if key in table.floats]
+        self.size = size
+        values = [self._win_rate(row) for row in range(len(table))]
+        rated = [row for row, value in enumerate(values) if value is not None]
+        rated.sort(key=values.__getitem__, reverse=True)
+        # Rank of every row (0 is the best), None for unrated rows
+        self._rank: List[Optional[int]] = [None] * len(table)
+        for rank, row in enumerate(rated):
+            self._rank[row] = rank
+        self._rows = rated
+        self._values = [values[row] for row in rated]
+        colors = table.column(CARD_COLOR)
+        self._pairs = [castable_pairs(colors[row]) for row in rated]
+        if filler is None:
+            filler = self._values[-1] if self._values else 0.0
+        self.filler = filler
+
+    def _win_rate(self, row: int):
+        for key in self.keys:
+            value = self.table.floats[key][row]
+            if not math.isnan(value):
+                return value
+        return None
+
+    def _fill(self, pool: Sequence[int]) -> Tuple[List[int], List[float]]:
+        """Cards taken and win rate totals per color pair, best cards first."""
+        rank = self._rank
+        ranks = sorted(r for r in (rank[row] for row in pool) if r is not None)
+        values, pairs, size = self._values, self._pairs, self.size
+        counts = [0] * len(COLOR_PAIRS)
+        totals = [0.0] * len(COLOR_PAIRS)
+        for r in ranks:
+            value = values[r]
+            for i in pairs[r]:
+                if counts[i] < size:
+                    counts[i] += 1
+                    totals[i] += value
+        return counts, totals
+
+    def win_rate(self, pool: Sequence[int]) -> float:
+        """Mean win rate of the pool's best deck."""
+        counts, totals = self._fill(pool)
+        size, filler = self.size, self.filler
+        best = max(t + (size - c) * filler for c, t in zip(counts, totals))
+        return best / size
+
+    def estimate(self, pool: Sequence[int]) -> DeckEstimate:
+        """The pool's best deck, with its cards."""
+        counts, totals = self._fill(pool)
+        size, filler = self.size, self.filler
+        scores = [t + (size - c) * filler for c, t in zip(counts, totals)]
+        best = scores.index(max(scores))
+        rank = self._rank
+        ranks = sorted(r for r in (rank[row] for row in pool) if r is not None)
+        cards = [self._rows[r] for r in ranks if best in self._pairs[r]][:size]
+        return DeckEstimate(COLOR_PAIRS[best], tuple(cards), scores[best] / size)
@@ -2,8 +2,10 @@
 Display and formatting utilities for the MTG Limited Trainer.
 """
 
-from typing import Dict, List, Tuple
-from termcolor import cprint
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+from termcolor import colored, cprint
 
 from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR
 
@@ -49,10 +51,42 @@ def format_card_line(card: Dict[str, str], show_percent: bool = False) -> str:
 
     if show_percent:
         percent = card[CARD_OHWR]
+        # Ratings are parsed to floats at load time; show them as in the CSV
+        if isinstance(percent, (int, float)):
+            percent = f"{percent:.1f}%"
         return f"{name} ({rarity}) - {link} - {percent}"
     return f"{name} ({rarity}) - {link}"
 
 
+@lru_cache(maxsize=None)
+def _ansi_wrap(color: str) -> Tuple[str, str]:
+    """
+    ANSI prefix and reset for a termcolor color, computed once per color.
+    Both are empty when termcolor would not colorize (no tty, NO_COLOR).
+    """
+    prefix, reset = colored("\0", color).split("\0")
+    return prefix, reset
+
+
+def render_lines(lines: Iterable[Tuple[str, Optional[str]]]) -> str:
+    """Join (text, termcolor color or None) lines into one block of output."""
+    out = []
+    for text, color in lines:
+        if color is None:
+            out.append(text)
+        else:
+            prefix, reset = _ansi_wrap(color)
+            out.append(prefix + text + reset)
+    out.append("")
+    return "\n".join(out)
+
+
+def write_screen(lines: Iterable[Tuple[str, Optional[str]]]) -> None:
+    """Render lines and send them to the terminal in a single write."""
+    sys.stdout.write(render_lines(lines))
+    sys.stdout.flush()
+
+
 def print_intro() -> None:
     """Print the game introduction."""
     print("Welcome to the MTG Card Selection Game!")
@@ -69,11 +103,14 @@ def print_intro() -> None:
 def print_pack(pack_cards: List[Dict[str, str]]) -> Dict[int, Dict[str, str]]:
     """Print the cards in a pack and return a lookup dictionary."""
     card_lookup_by_pack_sort = {}
+    lines = []
     for index, card in enumerate(pack_cards):
-        line_text = f"{index+1}. {format_card_line(card)}"
         card["PackIndex"] = index + 1
         card_lookup_by_pack_sort[index + 1] = card
-        cprint(line_text, get_color_code(card[CARD_COLOR]))
+        lines.append(
+            (f"{index+1}. {format_card_line(card)}", get_color_code(card[CARD_COLOR]))
+        )
+    write_screen(lines)
     return card_lookup_by_pack_sort
 
 
@@ -97,43 +134,67 @@ def get_user_input(pack_cards: List[Dict[str, str]]) -> List[int]:
             print("Invalid input. Please enter valid integers.")
 
 
-def print_pick_summary(
+def get_pick_input(pack_cards: List[Dict[str, str]]) -> int:
+    """Get the 1-based pack position of a single pick."""
+    while True:
+        user_input = input(f"Your pick (1-{len(pack_cards)}): ").strip()
+        if user_input.isdigit() and 1 <= int(user_input) <= len(pack_cards):
+            return int(user_input)
+        print(f"Invalid input. Please enter a number between 1 and {len(pack_cards)}.")
+
+
+def pick_summary_lines(
     pick_results: List[Tuple], pack_cards: List[Dict[str, str]]
-) -> None:
-    """Print a summary of the user's picks."""
-    print("Pick summary:")
+) -> List[Tuple[str, Optional[str]]]:
+    """Lines (text, color) summarizing the user's picks."""
+    by_name = {card[CARD_NAME]: card for card in pack_cards}
+    lines = [("Pick summary:", None)]
     for result in pick_results:
         pick_num = result[0]
 
         if result[2] == True:
-            card = next((c for c in pack_cards if c[CARD_NAME] == result[1]), None)
+            card = by_name[result[1]]
             card_text = format_card_line(card, True)
-            cprint(
-                f"Pick {pick_num}: {card_text} - Correct",
-                get_color_code(card[CARD_COLOR]),
+            lines.append(
+                (
+                    f"Pick {pick_num}: {card_text} - Correct",
+                    get_color_code(card[CARD_COLOR]),
+                )
             )
         elif result[1] is not None:
-            user_card = next((c for c in pack_cards if c[CARD_NAME] == result[1]), None)
-            best_card = next((c for c in pack_cards if c[CARD_NAME] == result[3]), None)
+            user_card = by_name.get(result[1])
+            best_card = by_name.get(result[3])
 
-            # Print user pick
+            # User pick
             if user_card:
                 user_str = format_card_line(user_card, True)
-                cprint(
-                    f"Pick {pick_num}: {user_str}",
-                    get_color_code(user_card[CARD_COLOR]),
+                lines.append(
+                    (
+                        f"Pick {pick_num}: {user_str}",
+                        get_color_code(user_card[CARD_COLOR]),
+                    )
                 )
             else:
-                print(f"Pick {pick_num}: {result[1]}")
+                lines.append((f"Pick {pick_num}: {result[1]}", None))
 
-            # Print best pick
+            # Best pick
             if best_card:
                 best_str = format_card_line(best_card, True)
-                cprint(
-                    f"\t - Wrong, best pick is: {best_str}",
-                    get_color_code(best_card[CARD_COLOR]),
+                lines.append(
+                    (
+                        f"\t - Wrong, best pick is: {best_str}",
+                        get_color_code(best_card[CARD_COLOR]),
+                    )
                 )
             else:
-                print(f"\t - Wrong, best pick is: {result[3]}")
+                lines.append((f"\t - Wrong, best pick is: {result[3]}", None))
         else:
-            print(f"Pick {pick_num}: Invalid selection")
+            lines.append((f"Pick {pick_num}: Invalid selection", None))
+    return lines
+
+
+def print_pick_summary(
+    pick_results: List[Tuple], pack_cards: List[Dict[str, str]]
+) -> None:
+    """Print a summary of the user's picks."""
+    write_screen(pick_summary_lines(pick_results, pack_cards))
@@ -0,0 +1,120 @@
+"""
+Rating distributions and difficulty thresholds for the rating quiz.
+"""
+
+import math
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .data import convert_keys_to_float
+from .index import iter_row_ids
+from .table import CardTable
+
+# Memoized distributions keyed by (set, csv file, selection, rating key)
+_DISTRIBUTIONS: Dict[Tuple, "RatingDistribution"] = {}
+
+
+class RatingDistribution:
+    """
+    Sorted rating values for one card selection and rating key.
+    The values are sorted once; thresholds for every difficulty level and
+    arbitrary quantiles are read from the same sorted list.
+    """
+
+    def __init__(self, values: Iterable[float]):
+        self.values = sorted(v for v in values if not math.isnan(v))
+        self._thresholds: Dict[int, List[float]] = {}
+
+    @classmethod
+    def from_cards(
+        cls, cards: List[Dict[str, object]], rating_key: str
+    ) -> "RatingDistribution":
+        """Build a distribution from card dicts or rows, skipping missing ratings."""
+        convert_keys_to_float(cards, [rating_key])
+        values = []
+        for card in cards:
+            value = card.get(rating_key)
+            if isinstance(value, (int, float)):
+                values.append(float(value))
+        return cls(values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def min(self) -> float:
+        return self.values[0]
+
+    @property
+    def max(self) -> float:
+        return self.values[-1]
+
+    def quantile(self, q: float) -> float:
+        """Return the value at fraction q of the sorted ratings (0 <= q < 1)."""
+        return self.values[min(int(q * len(self.values)), len(self.values) - 1)]
+
+    def thresholds(self, segments: int) -> List[float]:
+        """
+        Return the segments-1 boundaries splitting the ratings into equal-count
+        segments, e.g. 4 segments gives quartiles.
+        """
+        if segments not in self._thresholds:
+            n_vals = len(self.values)
+            self._thresholds[segments] = [
+                self.values[(k * n_vals) // segments] for k in range(1, segments)
+            ]
+        return list(self._thresholds[segments])
+
+    def update(self, old_value: Optional[float], new_value: Optional[float]) -> None:
+        """Replace one rating (None to only add or only remove) and drop cached thresholds."""
+        if old_value is not None and not math.isnan(old_value):
+            i = bisect_left(self.values, old_value)
+            if i < len(self.values) and self.values[i] == old_value:
+                del self.values[i]
+        if new_value is not None and not math.isnan(new_value):
+            insort(self.values, new_value)
+        self._thresholds.clear()
+
+
+def get_rating_distribution(
+    table: CardTable, rating_key: str, selection: Optional[int] = None
+) -> RatingDistribution:
+    """
+    Return the memoized distribution of a rating key over a CardIndex selection
+    bitmap (None for the whole table). Repeated calls for the same set, csv
+    file, selection and key reuse the already sorted values.
+    """
+    key = (table.set_name, table.source, selection, rating_key)
+    distribution = _DISTRIBUTIONS.get(key)
+    if distribution is None:
+        column = table.column(rating_key)
+        row_ids = range(len(table)) if selection is None else iter_row_ids(selection)
+        distribution = RatingDistribution(float(column[i]) for i in row_ids)
+        _DISTRIBUTIONS[key] = distribution
+    return distribution
+
+
+def clear_distribution_cache(source: Optional[str] = None) -> None:
+    """Forget memoized distributions, either all or those built from one csv file."""
+    if source is None:
+        _DISTRIBUTIONS.clear()
+        return
+    for key in [k for k in _DISTRIBUTIONS if k[1] == source]:
+        del _DISTRIBUTIONS[key]
+
+
+def apply_snapshot_delta(table: CardTable, old_source: str, delta) -> None:
+    """
+    Patch the memoized distributions of a table after import_snapshot updated
+    it in place, moving them from the old csv file to the table's new source.
+    Only changed ratings are re-inserted; nothing is re-sorted.
+    """
+    for key in [k for k in _DISTRIBUTIONS if k[:2] == (table.set_name, old_source)]:
+        distribution = _DISTRIBUTIONS.pop(key)
+        _, _, selection, rating_key = key
+        for row_id, cells in delta.cells.items():
+            if rating_key in cells and (selection is None or selection >> row_id & 1):
+                distribution.update(*cells[rating_key])
+        _DISTRIBUTIONS[(table.set_name, table.source, selection, rating_key)] = (
+            distribution
+        )
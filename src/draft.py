@@ -0,0 +1,278 @@
+"""
+Draft pod simulation: eight seats, packs passed around the table, bot drafters
+and an optional human seat scored on every pick.
+"""
+
+import copy
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from config import CARD_COLOR, CARD_OHWR
+from .cards import PackGenerator, get_winrate_order, rating_rank
+from .deck import DECK_SPELLS, DeckEstimator
+from .game_logic import evaluate_picks
+from .parallel import chunk_rng, chunk_sizes, resolve_seed, run_chunks
+
+# Seats at a draft table
+POD_SEATS = 8
+
+
+class RatingPolicy:
+    """
+    Takes the pack's best card by one rating column. Policies get the rank
+    (rating_rank) and the set of color letters of every row of the table, and
+    one instance drafts for one seat.
+    """
+
+    name = "rating"
+
+    def __init__(self, ranks: Sequence[float], colors: Sequence[FrozenSet[str]]):
+        self.ranks = ranks
+
+    def pick(self, pack: List[int], pool: List[int], rng: random.Random) -> int:
+        """Position in pack of the card to take."""
+        return pack.index(max(pack, key=self.ranks.__getitem__))
+
+
+class ColorPolicy(RatingPolicy):
+    """
+    Takes the best card by rating, but once it has a few picks it favors
+    cards in (or colorless to) the two colors its pool has most of.
+    """
+
+    name = "colors"
+
+    def __init__(
+        self,
+        ranks: Sequence[float],
+        colors: Sequence[FrozenSet[str]],
+        bonus: float = 3.0,
+        commit_after: int = 5,
+    ):
+        super().__init__(ranks, colors)
+        self.colors = colors
+        self.bonus = bonus
+        self.commit_after = commit_after
+        # Color counts of the seat's pool, extended by the cards added since
+        # the last pick and reset when a new draft starts with an empty pool
+        self._counts: Counter = Counter()
+        self._counted = 0
+
+    def pick(self, pack: List[int], pool: List[int], rng: random.Random) -> int:
+        if len(pool) < self._counted:
+            self._counts.clear()
+            self._counted = 0
+        for card in pool[self._counted :]:
+            self._counts.update(self.colors[card])
+        self._counted = len(pool)
+        if len(pool) < self.commit_after:
+            return super().pick(pack, pool, rng)
+        pair = {c for c, _ in self._counts.most_common(2)}
+        ranks, colors, bonus = self.ranks, self.colors, self.bonus
+        scores = [
+            ranks[card] + (bonus if colors[card] <= pair else 0.0) for card in pack
+        ]
+        return scores.index(max(scores))
+
+
+class RandomPolicy(RatingPolicy):
+    """Takes a random card; a baseline for the other policies."""
+
+    name = "random"
+
+    def pick(self, pack: List[int], pool: List[int], rng: random.Random) -> int:
+        return rng.randrange(len(pack))
+
+
+POLICIES = {policy.name: policy for policy in (RatingPolicy, ColorPolicy, RandomPolicy)}
+
+
+def rating_ranks(generator: PackGenerator, rating_key: str) -> List[float]:
+    """Sortable rating of every row of the generator's table (missing ranks last)."""
+    return [rating_rank(v) for v in generator.table.column(rating_key)]
+
+
+def make_policies(
+    generator: PackGenerator, names: Sequence[Optional[str]], rating_key: str
+) -> List[Optional[RatingPolicy]]:
+    """Policies by name for every seat; None stays None (the human seat)."""
+    ranks = rating_ranks(generator, rating_key)
+    colors = [frozenset(color) for color in generator.table.column(CARD_COLOR)]
+    return [None if name is None else POLICIES[name](ranks, colors) for name in names]
+
+
+def pool_score(
+    pool: Sequence[int], ranks: Sequence[float], size: int = DECK_SPELLS
+) -> float:
+    """Mean rating of the best size cards of a pool, ignoring unrated cards."""
+    best = sorted((ranks[card] for card in pool), reverse=True)[:size]
+    best = [rank for rank in best if rank != float("-inf")]
+    return sum(best) / len(best) if best else 0.0
+
+
+class PodDraft:
+    """
+    One pod: every seat opens num_packs packs in turn and the packs go round
+    the table until empty, left for the first and third pack and right for
+    the second. Seats with a policy pick on their own. The None seat, if any,
+    is the human seat: it picks through next_pack and pick, and every pick is
+    scored against the winrate order of the pack it came from.
+    Packs and pools are row ids of the generator's table.
+    """
+
+    def __init__(
+        self,
+        generator: PackGenerator,
+        policies: Sequence[Optional[RatingPolicy]],
+        rating_key: str = CARD_OHWR,
+        num_packs: int = 3,
+        rng: Optional[random.Random] = None,
+    ):
+        self.generator = generator
+        self.policies = list(policies)
+        self.rating_key = rating_key
+        self.num_packs = num_packs
+        self.rng = rng or generator.rng
+        self.human = self.policies.index(None) if None in self.policies else None
+        self.pools: List[List[int]] = [[] for _ in self.policies]
+        self.packs: Optional[List[List[int]]] = None
+        self.pack_number = 0
+        self.pick_number = 0
+        self.score = 0
+        self.results: List[Tuple] = []
+
+    @property
+    def complete(self) -> bool:
+        return self.packs is None and self.pack_number >= self.num_packs
+
+    @property
+    def max_score(self) -> int:
+        return self.num_packs * self.generator.pack_size
+
+    def _open_packs(self) -> None:
+        self.packs = [self.generator.generate() for _ in self.policies]
+        self.pack_number += 1
+
+    def _bots_pick_and_pass(self) -> None:
+        packs, pools, rng = self.packs, self.pools, self.rng
+        for seat, policy in enumerate(self.policies):
+            if policy is not None:
+                pack = packs[seat]
+                pools[seat].append(pack.pop(policy.pick(pack, pools[seat], rng)))
+        if not packs[0]:
+            self.packs = None
+        elif self.pack_number % 2:
+            # Pass left: every seat gets the pack of the seat on its right
+            self.packs = packs[-1:] + packs[:-1]
+        else:
+            self.packs = packs[1:] + packs[:1]
+
+    def run(self) -> List[List[int]]:
+        """Draft a pod of bots only to the end and return every seat's pool."""
+        if self.human is not None:
+            raise ValueError("A pod with a human seat is drafted with pick()")
+        while not self.complete:
+            if self.packs is None:
+                self._open_packs()
+            self._bots_pick_and_pass()
+        return self.pools
+
+    def next_pack(self) -> Optional[List[int]]:
+        """The pack in front of the human seat, None once the draft is over."""
+        if self.complete:
+            return None
+        if self.packs is None:
+            self._open_packs()
+        return self.packs[self.human]
+
+    def pick(self, position: int) -> Tuple:
+        """
+        Take the card at a 1-based position of the human seat's pack, let the
+        bots pick and pass the packs. Returns the pick's result as from
+        evaluate_picks, numbered by the pick's place in the whole draft.
+        """
+        pack = self.next_pack()
+        if pack is None:
+            raise ValueError("Draft is complete")
+        if not 1 <= position <= len(pack):
+            raise ValueError(f"Pick a position between 1 and {len(pack)}")
+        rows = self.generator.table.rows(pack)
+        lookup = {i + 1: row for i, row in enumerate(rows)}
+        order = get_winrate_order(rows, 1, self.rating_key)
+        score, results = evaluate_picks([position], lookup, order)
+        self.pick_number += 1
+        result = (self.pick_number, *results[0][1:])
+        self.score += score
+        self.results.append(result)
+        self.pools[self.human].append(pack.pop(position - 1))
+        self._bots_pick_and_pass()
+        return result
+
+
+@dataclass
+class PolicyStats:
+    """Pools drafted by one policy, their summed pool_score and deck win rate."""
+
+    seats: int = 0
+    total_score: float = 0.0
+    total_win_rate: float = 0.0
+
+    @property
+    def mean_score(self) -> float:
+        return self.total_score / self.seats if self.seats else 0.0
+
+    @property
+    def mean_win_rate(self) -> float:
+        return self.total_win_rate / self.seats if self.seats else 0.0
+
+
+def _simulate_chunk(args) -> Dict[str, PolicyStats]:
+    """Worker entry point: draft count bot pods with one chunk's RNG stream."""
+    generator, names, rating_key, num_packs, seed, chunk, count = args
+    rng = chunk_rng(seed, chunk)
+    # A copy draws from the chunk's stream; the caller's generator keeps its own
+    generator = copy.copy(generator)
+    generator.rng = rng
+    policies = make_policies(generator, names, rating_key)
+    ranks = policies[0].ranks
+    estimator = DeckEstimator(generator.table)
+    stats = {name: PolicyStats() for name in names}
+    for _ in range(count):
+        pools = PodDraft(generator, policies, rating_key, num_packs, rng).run()
+        for name, pool in zip(names, pools):
+            stats[name].seats += 1
+            stats[name].total_score += pool_score(pool, ranks)
+            stats[name].total_win_rate += estimator.win_rate(pool)
+    return stats
+
+
+def simulate_pods(
+    generator: PackGenerator,
+    names: Sequence[str],
+    count: int,
+    rating_key: str = CARD_OHWR,
+    num_packs: int = 3,
+    seed: Optional[int] = None,
+    workers: int = 1,
+    chunk_size: int = 200,
+) -> Dict[str, PolicyStats]:
+    """
+    Draft count pods of bots, seat i playing names[i], and total the pool
+    scores and best-deck win rates (DeckEstimator) of each policy. Pods are
+    drafted in seeded chunks (see run_chunks).
+    """
+    seed = resolve_seed(seed)
+    jobs = [
+        (generator, list(names), rating_key, num_packs, seed, *chunk)
+        for chunk in chunk_sizes(count, chunk_size)
+    ]
+    results = run_chunks(_simulate_chunk, jobs, workers)
+    totals = {name: PolicyStats() for name in names}
+    for chunk_stats in results:
+        for name, stats in chunk_stats.items():
+            totals[name].seats += stats.seats
+            totals[name].total_score += stats.total_score
+            totals[name].total_win_rate += stats.total_win_rate
+    return totals
@@ -2,9 +2,11 @@
 Game logic for scoring, evaluation, and game flow.
 """
 
-from typing import List, Dict, Tuple
+from array import array
+from typing import List, Dict, Sequence, Tuple
 
 from config import CARD_NAME
+from .cards import rating_rank, top_k_indices
 
 
 def evaluate_picks(
@@ -36,3 +38,40 @@ def evaluate_picks(
             pick_results.append((j + 1, user_name, False, winrate_name))
 
     return user_score, pick_results
+
+
+def evaluate_picks_batch(
+    pack_ids: Sequence[int],
+    picks: Sequence[int],
+    ratings: Sequence[float],
+    pack_size: int,
+    picks_per_pack: int = 5,
+) -> Tuple[array, array]:
+    """
+    Score many recorded pick sets at once.
+    pack_ids holds the card ids of every pack back to back (pack_size per pack),
+    picks holds the 1-based pack positions picked (picks_per_pack per pack), and
+    ratings maps card id to rating, e.g. CardTable.column(CARD_OHWR).
+    Returns per-pack scores and flat per-pick correctness (1/0), matching
+    evaluate_picks for each pack.
+    """
+    n_packs = len(pack_ids) // pack_size
+    if len(picks) != n_packs * picks_per_pack:
+        raise ValueError(
+            f"Expected {n_packs * picks_per_pack} picks for {n_packs} packs, got {len(picks)}"
+        )
+    scores = array("i", bytes(4 * n_packs))
+    correct = array("b", bytes(n_packs * picks_per_pack))
+    ranks = [rating_rank(v) for v in ratings]
+    for p in range(n_packs):
+        pack = pack_ids[p * pack_size : (p + 1) * pack_size]
+        order = top_k_indices([ranks[c] for c in pack], picks_per_pack, ranked=True)
+        base = p * picks_per_pack
+        score = 0
+        for j in range(len(order)):
+            pick = picks[base + j]
+            if 1 <= pick <= pack_size and pack[pick - 1] == pack[order[j]]:
+                correct[base + j] = 1
+                score += 1
+        scores[p] = score
+    return scores, correct
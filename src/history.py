@@ -0,0 +1,163 @@
+"""
+Append-only rating history built from every dated card-ratings snapshot of a set.
+"""
+
+import math
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from config import CARD_NAME, CARD_OHWR, CARD_GIHWR, CARD_PERCENT_GP, CARD_NGIH
+from .chunks import ChunkFormat
+from .data import get_snapshot_date, list_snapshot_csvs, read_card_csv
+from .table import CardTable, MISSING
+
+# History file kept next to the set's CSVs
+HISTORY_FILENAME = "history.bin"
+# Rating columns recorded for every snapshot (counts are stored as floats)
+HISTORY_KEYS = (CARD_OHWR, CARD_GIHWR, CARD_PERCENT_GP, CARD_NGIH)
+
+# Each snapshot is one chunk tagged with its date ordinal, with card names and
+# keys in the header and one float64 column per key
+HISTORY_CHUNKS = ChunkFormat("history file", b"MTGH", "I", "keys")
+
+
+def get_history_path(set_name: str) -> str:
+    """Return the history file path for a set."""
+    return os.path.join("resources", "sets", set_name, HISTORY_FILENAME)
+
+
+class RatingHistory:
+    """
+    Ratings indexed by (card, snapshot date).
+    Snapshots are appended to the history file as self-contained columnar chunks,
+    so ingesting a new CSV never rewrites or re-parses older ones.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.dates: List[date] = []
+        self.card_ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        # Per key, one float array per snapshot indexed by card id (NaN = absent)
+        self.values: Dict[str, List[array]] = {}
+        for chunk in HISTORY_CHUNKS.read(path):
+            columns = {
+                key: chunk.column(position)
+                for position, key in enumerate(chunk.header["keys"])
+            }
+            self._add_snapshot(
+                date.fromordinal(chunk.tag), chunk.header["names"], columns
+            )
+
+    @classmethod
+    def for_set(cls, set_name: str) -> "RatingHistory":
+        """Open the history of a set."""
+        return cls(get_history_path(set_name))
+
+    def _add_snapshot(
+        self, snapshot_date: date, names: List[str], columns: Dict[str, array]
+    ) -> None:
+        """Index one snapshot in memory, keeping dates sorted."""
+        ids = []
+        for name in names:
+            card_id = self.card_ids.get(name)
+            if card_id is None:
+                card_id = self.card_ids[name] = len(self.names)
+                self.names.append(sys.intern(name))
+            ids.append(card_id)
+        position = bisect_left(self.dates, snapshot_date)
+        self.dates.insert(position, snapshot_date)
+        for key in set(self.values) | set(columns):
+            by_card = array("d", [MISSING]) * len(self.names)
+            column = columns.get(key)
+            if column is not None:
+                for card_id, value in zip(ids, column):
+                    by_card[card_id] = value
+            snapshots = self.values.setdefault(
+                key, [array("d")] * (len(self.dates) - 1)
+            )
+            snapshots.insert(position, by_card)
+
+    def append_snapshot(self, snapshot_date: date, table: CardTable) -> None:
+        """Append one snapshot to the history file and the in-memory index."""
+        if snapshot_date in self.dates:
+            raise ValueError(f"Snapshot for {snapshot_date} already recorded")
+        names = list(table.column(CARD_NAME))
+        columns = {}
+        for key in HISTORY_KEYS:
+            if key in table.floats:
+                columns[key] = array("d", table.floats[key])
+            elif key in table.counts:
+                columns[key] = array("d", map(float, table.counts[key]))
+        HISTORY_CHUNKS.append(
+            self.path,
+            snapshot_date.toordinal(),
+            len(names),
+            {"names": names, "keys": list(columns)},
+            list(columns.values()),
+        )
+        self._add_snapshot(snapshot_date, names, columns)
+
+    def ingest(self, set_name: str) -> List[date]:
+        """Append every dated CSV of a set that is not in the history yet."""
+        ingested = []
+        for csv_file_path in list_snapshot_csvs(set_name):
+            snapshot_date = get_snapshot_date(csv_file_path)
+            if snapshot_date not in self.dates:
+                table = read_card_csv(csv_file_path, rating_key=None)
+                self.append_snapshot(snapshot_date, table)
+                ingested.append(snapshot_date)
+        return ingested
+
+    def value(
+        self, name: str, snapshot_date: date, key: str = CARD_OHWR
+    ) -> Optional[float]:
+        """Rating of a card on a snapshot date, None if absent."""
+        card_id = self.card_ids.get(name)
+        if card_id is None or snapshot_date not in self.dates:
+            return None
+        return self._at(key, self.dates.index(snapshot_date), card_id)
+
+    def _at(self, key: str, date_idx: int, card_id: int) -> Optional[float]:
+        snapshots = self.values.get(key)
+        if snapshots is None or card_id >= len(snapshots[date_idx]):
+            return None
+        value = snapshots[date_idx][card_id]
+        return None if math.isnan(value) else value
+
+    def trajectory(self, name: str, key: str = CARD_OHWR) -> List[Tuple[date, float]]:
+        """Every recorded (date, rating) of a card, oldest first."""
+        card_id = self.card_ids.get(name)
+        if card_id is None:
+            return []
+        points = []
+        for date_idx, snapshot_date in enumerate(self.dates):
+            value = self._at(key, date_idx, card_id)
+            if value is not None:
+                points.append((snapshot_date, value))
+        return points
+
+    def movers(
+        self, key: str = CARD_GIHWR, threshold: float = 2.0, days: int = 7
+    ) -> List[Tuple[str, float, float]]:
+        """
+        Cards whose rating moved more than threshold points between the latest
+        snapshot and the newest one at least days older (or the oldest one).
+        Returns (name, old, new) tuples, biggest moves first.
+        """
+        if len(self.dates) < 2 or key not in self.values:
+            return []
+        cutoff = self.dates[-1] - timedelta(days=days)
+        base_idx = max((i for i, d in enumerate(self.dates) if d <= cutoff), default=0)
+        old, new = self.values[key][base_idx], self.values[key][-1]
+        moved = []
+        for card_id in range(min(len(old), len(new))):
+            before, after = old[card_id], new[card_id]
+            if abs(after - before) > threshold:
+                moved.append((self.names[card_id], before, after))
+        moved.sort(key=lambda m: abs(m[2] - m[1]), reverse=True)
+        return moved
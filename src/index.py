@@ -0,0 +1,166 @@
+"""
+Precomputed rarity/color/exclusion index over a CardTable.
+"""
+
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_SET
+from .table import CardTable, CardRow
+
+# Single mana colors; cards are indexed under every color they contain
+MANA_COLORS = "WUBRG"
+# Pseudo colors for selecting multicolored and colorless cards
+MULTICOLOR = "M"
+COLORLESS = "C"
+
+
+def _bitmap(row_ids: Iterable[int], size: int) -> int:
+    """Pack row ids into an int bitmap (bit i set for row i)."""
+    bits = bytearray((size + 7) // 8)
+    for i in row_ids:
+        bits[i >> 3] |= 1 << (i & 7)
+    return int.from_bytes(bits, "little")
+
+
+def iter_row_ids(bitmap: int) -> Iterator[int]:
+    """Yield the row ids set in a bitmap in ascending order."""
+    bits = bin(bitmap)[:1:-1]
+    i = bits.find("1")
+    while i != -1:
+        yield i
+        i = bits.find("1", i + 1)
+
+
+class CardIndex:
+    """
+    Row-id bitmaps over a CardTable, built once after load.
+    Any combination of rarities, colors and exclusions is resolved with
+    bitwise and/or on Python ints, and counts come from popcounts.
+    """
+
+    def __init__(self, table: CardTable, exclude: Optional[Set[str]] = None):
+        self.table = table
+        self.size = 0
+        self.all = 0
+        self.by_rarity: Dict[str, int] = {}
+        self.by_color: Dict[str, int] = {c: 0 for c in MANA_COLORS}
+        self.by_color[MULTICOLOR] = 0
+        self.by_color[COLORLESS] = 0
+        self.by_set: Dict[str, int] = {}
+        self.excluded = 0
+        # Rows of cards dropped from the data (see remove)
+        self.removed = 0
+        self._exclusions: List[Tuple[Set[str], Optional[str]]] = []
+        self.refresh(range(len(table)))
+        if exclude:
+            self.exclude(exclude)
+
+    def refresh(self, row_ids: Iterable[int]) -> None:
+        """
+        (Re)index the given rows, e.g. after they were updated or appended to the
+        table. Other rows keep their bits.
+        """
+        row_ids = list(row_ids)
+        self.size = len(self.table)
+        self.all = (1 << self.size) - 1
+        keep = ~_bitmap(row_ids, self.size)
+        rarities = self.table.column(CARD_RARITY)
+        colors = self.table.column(CARD_COLOR)
+        rarity_ids: Dict[str, List[int]] = {}
+        color_ids: Dict[str, List[int]] = {c: [] for c in self.by_color}
+        for i in row_ids:
+            rarity_ids.setdefault(rarities[i], []).append(i)
+            color = colors[i]
+            for c in color:
+                if c in color_ids:
+                    color_ids[c].append(i)
+            if len(color) > 1:
+                color_ids[MULTICOLOR].append(i)
+            elif not color:
+                color_ids[COLORLESS].append(i)
+        self._merge(self.by_rarity, rarity_ids, keep)
+        self._merge(self.by_color, color_ids, keep)
+        if CARD_SET in self.table.strings:
+            set_ids: Dict[str, List[int]] = {}
+            sets = self.table.column(CARD_SET)
+            for i in row_ids:
+                set_ids.setdefault(sets[i], []).append(i)
+            self._merge(self.by_set, set_ids, keep)
+        self.excluded &= keep
+        self.removed &= keep
+        for names, set_name in self._exclusions:
+            self._apply_exclusion(names, set_name, row_ids)
+
+    def _merge(
+        self, bitmaps: Dict[str, int], ids: Dict[str, List[int]], keep: int
+    ) -> None:
+        for key in bitmaps:
+            bitmaps[key] &= keep
+        for key, row_ids in ids.items():
+            bitmaps[key] = bitmaps.get(key, 0) | _bitmap(row_ids, self.size)
+
+    def remove(self, row_ids: Iterable[int]) -> None:
+        """
+        Leave rows out of every selection, e.g. cards a newer snapshot no longer
+        rates. Refreshing a row brings it back.
+        """
+        self.removed |= _bitmap(row_ids, self.size)
+
+    def exclude(self, names: Iterable[str], set_name: Optional[str] = None) -> None:
+        """Mark cards with the given names as excluded, optionally only within one set."""
+        names = set(names)
+        self._exclusions.append((names, set_name))
+        self._apply_exclusion(names, set_name, range(self.size))
+
+    def _apply_exclusion(
+        self, names: Set[str], set_name: Optional[str], row_ids: Iterable[int]
+    ) -> None:
+        column = self.table.column(CARD_NAME)
+        ids = (i for i in row_ids if column[i] in names)
+        excluded = _bitmap(ids, self.size)
+        if set_name is not None and self.by_set:
+            excluded &= self.by_set.get(set_name, 0)
+        self.excluded |= excluded
+
+    def select(
+        self,
+        rarities: Optional[Iterable[str]] = None,
+        colors: Optional[Iterable[str]] = None,
+        include_excluded: bool = False,
+        sets: Optional[Iterable[str]] = None,
+    ) -> int:
+        """
+        Return a bitmap of cards matching any of the rarities and any of the colors.
+        Colors are W/U/B/R/G (cards containing that color), M (multicolor) or C (colorless).
+        Sets only apply to merged multi-set tables.
+        None means no restriction on that attribute.
+        """
+        selected = self.all & ~self.removed
+        if sets is not None:
+            selected &= self._union(self.by_set, sets)
+        if rarities is not None:
+            selected &= self._union(self.by_rarity, rarities)
+        if colors is not None:
+            selected &= self._union(self.by_color, colors)
+        if not include_excluded:
+            selected &= ~self.excluded
+        return selected
+
+    def rows(self, bitmap: int) -> List[CardRow]:
+        """Return row views for every card in a bitmap."""
+        return self.table.rows(iter_row_ids(bitmap))
+
+    def count(self, bitmap: int) -> int:
+        """Number of cards in a bitmap."""
+        return bitmap.bit_count()
+
+    def rarity_counts(self, rarities: Iterable[str], bitmap: int) -> Dict[str, int]:
+        """Count the cards of each rarity within a bitmap."""
+        return {r: (self.by_rarity.get(r, 0) & bitmap).bit_count() for r in rarities}
+
+    @staticmethod
+    def _union(bitmaps: Dict[str, int], keys: Iterable[str]) -> int:
+        result = 0
+        for key in keys:
+            result |= bitmaps.get(key, 0)
+        return result
@@ -0,0 +1,48 @@
+"""
+Chunked work for seeded bulk generation and simulation.
+
+Work is split into fixed-size chunks, each with its own RNG stream derived
+from the seed and the chunk's key, so results depend only on the seed and not
+on how many worker processes produced them.
+"""
+
+import random
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+Job = TypeVar("Job")
+Result = TypeVar("Result")
+
+
+def resolve_seed(seed: Optional[int]) -> int:
+    """The given seed, or a fresh random one for an unseeded run."""
+    return random.SystemRandom().getrandbits(64) if seed is None else seed
+
+
+def chunk_rng(seed: int, *key) -> random.Random:
+    """Independent RNG stream for one chunk of work, keyed by e.g. (cell, chunk)."""
+    return random.Random(":".join(str(part) for part in (seed, *key)))
+
+
+def chunk_sizes(count: int, chunk_size: int) -> List[Tuple[int, int]]:
+    """(chunk number, item count) of every chunk count items are split into."""
+    return [
+        (chunk, min(chunk_size, count - start))
+        for chunk, start in enumerate(range(0, count, chunk_size))
+    ]
+
+
+def run_chunks(
+    worker: Callable[[Job], Result], jobs: Iterable[Job], workers: int = 1
+) -> Iterator[Result]:
+    """
+    Results of worker for every job, in job order: in this process, or on a
+    pool of workers processes (worker and jobs must then pickle).
+    """
+    if workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            yield from executor.map(worker, jobs)
+    else:
+        for job in jobs:
+            yield worker(job)
@@ -1,12 +1,20 @@
 """
 Quiz generation and orchestration for MTG rating quiz.
 """
+import json
 import random
 from dataclasses import dataclass
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Iterator, Optional, TextIO, Tuple
+
+from config import CARD_NAME
+from .parallel import chunk_rng, chunk_sizes, resolve_seed, run_chunks
+from .sampling import AliasTable, FenwickSampler
 
 # Default number of choices per question
 DEFAULT_NUM_CHOICES = 5
+# Chance that a question includes a wrong option one step from the answer
+NEIGHBOR_PROBABILITY = 0.67
 
 
 def round_to_increment(value: float, step: float) -> float:
@@ -26,21 +34,15 @@ def round_to_half(value: float) -> float:
     return round_to_increment(value, 0.5)
 
 
-def make_question(
-    card: Dict[str, any],
-    rating_key: str,
-    min_val: float,
-    max_val: float,
-    step: float = 0.5,
-    num_choices: int = DEFAULT_NUM_CHOICES,
-) -> Question:
+@lru_cache(maxsize=4096)
+def _wrong_candidates(
+    true_rounded: float, min_val: float, max_val: float, step: float
+) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
     """
-    Build a multiple-choice question for a single card.
-    Choices are rounded to step increments, clamped within [min_val, max_val].
-    Correct options are those within step of the true rating.
+    Wrong answer candidates for a rounded rating: every other step value within
+    [min_val, max_val], and the ones within one step of the true value.
+    Cached because bulk generation asks for the same few dozen values repeatedly.
     """
-    true_val = float(card[rating_key])
-    true_rounded = round_to_increment(true_val, step)
     # Compute all possible rounded values within [min_val, max_val]
     # Determine index range around true_rounded
     low_i = int((min_val - true_rounded) // step)
@@ -55,24 +57,50 @@ def make_question(
     # Ensure uniqueness and include true value
     possible = sorted(set(possible))
     # Select wrong options excluding the true one
-    others = [p for p in possible if p != true_rounded]
+    others = tuple(p for p in possible if p != true_rounded)
     # Guarantee at least one wrong answer within one step of the correct answer
-    neighbors = [p for p in (true_rounded - step, true_rounded + step) if p in others]
+    neighbors = tuple(
+        p for p in (true_rounded - step, true_rounded + step) if p in others
+    )
+    return others, neighbors
+
+
+def make_question(
+    card: Dict[str, any],
+    rating_key: str,
+    min_val: float,
+    max_val: float,
+    step: float = 0.5,
+    num_choices: int = DEFAULT_NUM_CHOICES,
+    rng: Optional[random.Random] = None,
+    neighbor_prob: float = NEIGHBOR_PROBABILITY,
+) -> Question:
+    """
+    Build a multiple-choice question for a single card.
+    Choices are rounded to step increments, clamped within [min_val, max_val].
+    Correct options are those within step of the true rating. With chance
+    neighbor_prob one wrong option is a step away from the true rating.
+    Randomness comes from rng, or the global random module if None.
+    """
+    rng = rng or random
+    true_val = float(card[rating_key])
+    true_rounded = round_to_increment(true_val, step)
+    others, neighbors = _wrong_candidates(true_rounded, min_val, max_val, step)
     total_wrongs = min(len(others), num_choices - 1)
     # Chance to include a neighbor within one step; otherwise sample wrongs normally
-    if neighbors and random.random() < 0.67:
+    if neighbors and rng.random() < neighbor_prob:
         wrong = []
-        near = random.choice(neighbors)
+        near = rng.choice(neighbors)
         wrong.append(near)
         remaining = total_wrongs - 1
         if remaining > 0:
             other_candidates = [p for p in others if p != near]
-            wrong.extend(random.sample(other_candidates, remaining))
+            wrong.extend(rng.sample(other_candidates, remaining))
     else:
-        wrong = random.sample(others, total_wrongs)
+        wrong = list(rng.sample(others, total_wrongs))
     # Build final options, always include true_rounded
     options = wrong + [true_rounded]
-    random.shuffle(options)
+    rng.shuffle(options)
     correct_indices = [i for i, opt in enumerate(options) if abs(opt - true_val) < step]
     return Question(card=card, options=options, correct_indices=correct_indices)
 
@@ -84,11 +112,102 @@ def generate_questions(
     max_val: float,
     num_questions: int,
     step: float = 0.5,
+    rng: Optional[random.Random] = None,
+    weights: Optional[List[float]] = None,
 ) -> List[Question]:
     """
     Sample a set of cards and generate a Question for each.
+    Cards are drawn uniformly, or in proportion to weights (one per card).
     """
-    sampled = random.sample(cards, num_questions)
+    rng = rng or random
+    if weights is None:
+        sampled = rng.sample(cards, num_questions)
+    else:
+        positions = FenwickSampler(weights).sample(num_questions, rng)
+        sampled = [cards[i] for i in positions]
     return [
-        make_question(card, rating_key, min_val, max_val, step=step) for card in sampled
+        make_question(card, rating_key, min_val, max_val, step=step, rng=rng)
+        for card in sampled
     ]
+
+
+def question_record(question: Question, rating_key: str) -> Dict[str, object]:
+    """Flatten a Question into a JSON-serializable record."""
+    return {
+        "card": question.card[CARD_NAME],
+        "rating_key": rating_key,
+        "rating": float(question.card[rating_key]),
+        "options": question.options,
+        "correct_indices": question.correct_indices,
+    }
+
+
+def _generate_chunk(args) -> str:
+    """Worker entry point: generate one chunk of questions as JSON Lines text."""
+    engine, chunk, count = args
+    rng = engine.chunk_rng(chunk)
+    lines = [
+        json.dumps(question_record(q, engine.rating_key))
+        for q in engine.questions(count, rng)
+    ]
+    return "".join(line + "\n" for line in lines)
+
+
+class QuizEngine:
+    """
+    Headless bulk question generator, in seeded chunks (see run_chunks).
+    Cards are drawn uniformly, or by weights (one per card) through an alias
+    table.
+    """
+
+    def __init__(
+        self,
+        cards: List[Dict[str, any]],
+        rating_key: str,
+        min_val: Optional[float] = None,
+        max_val: Optional[float] = None,
+        step: float = 0.5,
+        num_choices: int = DEFAULT_NUM_CHOICES,
+        seed: Optional[int] = None,
+        chunk_size: int = 1000,
+        weights: Optional[List[float]] = None,
+    ):
+        # Keep only what a question needs so the engine pickles cheaply to workers
+        self.cards = [
+            {CARD_NAME: card[CARD_NAME], rating_key: float(card[rating_key])}
+            for card in cards
+        ]
+        values = [card[rating_key] for card in self.cards]
+        self.rating_key = rating_key
+        self.min_val = min(values) if min_val is None else min_val
+        self.max_val = max(values) if max_val is None else max_val
+        self.step = step
+        self.num_choices = num_choices
+        self.seed = resolve_seed(seed)
+        self.chunk_size = chunk_size
+        self.alias = None if weights is None else AliasTable(weights)
+
+    def chunk_rng(self, chunk: int) -> random.Random:
+        """Independent RNG stream for one chunk of work."""
+        return chunk_rng(self.seed, chunk)
+
+    def questions(self, count: int, rng: random.Random) -> Iterator[Question]:
+        """Lazily generate count questions for cards drawn with replacement."""
+        alias = self.alias
+        for _ in range(count):
+            card = self.cards[alias.draw(rng)] if alias else rng.choice(self.cards)
+            yield make_question(
+                card,
+                self.rating_key,
+                self.min_val,
+                self.max_val,
+                step=self.step,
+                num_choices=self.num_choices,
+                rng=rng,
+            )
+
+    def write_jsonl(self, stream: TextIO, count: int, workers: int = 1) -> None:
+        """Write count questions to a text stream as JSON Lines."""
+        chunks = [(self, *chunk) for chunk in chunk_sizes(count, self.chunk_size)]
+        for text in run_chunks(_generate_chunk, chunks, workers):
+            stream.write(text)
@@ -0,0 +1,145 @@
+"""
+Weighted card sampling: alias tables for fixed weights, a Fenwick tree for
+weights that change as answers come in.
+"""
+
+import random
+from typing import Dict, List, Mapping, Sequence
+
+from config import CARD_NAME
+
+
+class AliasTable:
+    """
+    Vose alias table: O(n) to build, then O(1) per draw with replacement.
+    Suited to bulk generation over weights that never change.
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        n = len(weights)
+        total = float(sum(weights))
+        if n == 0 or total <= 0:
+            raise ValueError("Weights must include a positive weight")
+        scaled = [w * n / total for w in weights]
+        self.prob = [1.0] * n
+        self.alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.prob[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+        # Whatever is left is 1 up to rounding and keeps prob 1.0
+
+    def __len__(self) -> int:
+        return len(self.prob)
+
+    def draw(self, rng: random.Random = random) -> int:
+        """One position, drawn with probability proportional to its weight."""
+        u = rng.random() * len(self.prob)
+        i = int(u)
+        return i if u - i < self.prob[i] else self.alias[i]
+
+
+class FenwickSampler:
+    """
+    Weights in a Fenwick (binary indexed) tree: O(log n) per draw and per
+    weight update, so a draw always reflects the latest weights. Draws
+    without replacement zero each drawn weight until the sample is complete.
+    """
+
+    def __init__(self, weights: Sequence[float]):
+        self.weights = [float(w) for w in weights]
+        n = len(self.weights)
+        tree = [0.0] + self.weights
+        for i in range(1, n + 1):
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+        self._top = 1 << (n.bit_length() - 1) if n else 0
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+    def total(self) -> float:
+        """Sum of all weights."""
+        tree, i, total = self._tree, len(self.weights), 0.0
+        while i:
+            total += tree[i]
+            i -= i & -i
+        return total
+
+    def update(self, position: int, weight: float) -> None:
+        """Set the weight of one position."""
+        delta = float(weight) - self.weights[position]
+        self.weights[position] = float(weight)
+        tree, i, n = self._tree, position + 1, len(self.weights)
+        while i <= n:
+            tree[i] += delta
+            i += i & -i
+
+    def _find(self, x: float) -> int:
+        """Position whose cumulative weight range contains x."""
+        tree, n = self._tree, len(self.weights)
+        position, step = 0, self._top
+        while step:
+            child = position + step
+            if child <= n and tree[child] <= x:
+                x -= tree[child]
+                position = child
+            step >>= 1
+        return position
+
+    def draw(self, rng: random.Random = random) -> int:
+        """One position, drawn with probability proportional to its weight."""
+        total = self.total()
+        # Rounding in the tree can land past the end or on a zero weight; a
+        # total that is only rounding error never lands anywhere else
+        for _ in range(64 if total > 0 else 0):
+            position = self._find(rng.random() * total)
+            if position < len(self.weights) and self.weights[position] > 0:
+                return position
+        raise ValueError("No positive weights left to draw from")
+
+    def sample(self, k: int, rng: random.Random = random) -> List[int]:
+        """k distinct positions drawn by weight, without replacement."""
+        if k > sum(1 for w in self.weights if w > 0):
+            raise ValueError("Sample larger than the number of positive weights")
+        drawn: List[int] = []
+        saved: List[float] = []
+        try:
+            for _ in range(k):
+                position = self.draw(rng)
+                drawn.append(position)
+                saved.append(self.weights[position])
+                self.update(position, 0.0)
+        finally:
+            for position, weight in zip(drawn, saved):
+                self.update(position, weight)
+        return drawn
+
+
+def column_weights(cards: Sequence[Mapping[str, object]], key: str) -> List[float]:
+    """
+    Weights from a numeric card column such as '% GP' or '# GIH'. Cards
+    without a value get the smallest positive weight, so they stay in play.
+    """
+    values = [card.get(key) for card in cards]
+    values = [v if isinstance(v, (int, float)) and v == v else None for v in values]
+    floor = min((v for v in values if v is not None and v > 0), default=1.0)
+    return [floor if v is None or v <= 0 else float(v) for v in values]
+
+
+def error_weight(answers: int, wrong: int) -> float:
+    """Smoothed error rate: (wrong + 1) / (answers + 2), 0.5 for unseen cards."""
+    return (wrong + 1) / (answers + 2)
+
+
+def error_weights(
+    cards: Sequence[Mapping[str, object]], counts: Dict[str, Sequence[int]]
+) -> List[float]:
+    """Weights from per-card-name (answers, wrong) counts of a learner."""
+    return [error_weight(*counts.get(card[CARD_NAME], (0, 0))) for card in cards]
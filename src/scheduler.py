@@ -0,0 +1,179 @@
+"""
+Spaced-repetition scheduling (SM-2) of quiz cards per learner.
+"""
+
+import random
+import sqlite3
+import time
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Set, Tuple
+
+from config import REVIEW_DB_PATH
+
+SECONDS_PER_DAY = 86400
+# SM-2 starting ease and the floor it never drops below
+INITIAL_EASE = 2.5
+MIN_EASE = 1.3
+# SM-2 quality (0-5) given to a first-round answer of the quiz
+GRADE_CORRECT = 4
+GRADE_WRONG = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    learner TEXT NOT NULL,
+    set_name TEXT NOT NULL,
+    card TEXT NOT NULL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    repetitions INTEGER NOT NULL,
+    lapses INTEGER NOT NULL,
+    due REAL NOT NULL,
+    PRIMARY KEY (learner, set_name, card)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS reviews_due ON reviews (learner, due);
+"""
+
+# A card is identified by its set code and name
+CardKey = Tuple[str, str]
+
+
+@dataclass
+class ReviewState:
+    """SM-2 state of one card for one learner; interval is in days."""
+
+    ease: float = INITIAL_EASE
+    interval: float = 0.0
+    repetitions: int = 0
+    lapses: int = 0
+    due: float = 0.0
+
+    def reviewed(self, quality: int, now: float) -> "ReviewState":
+        """The state after a review graded 0 (blackout) to 5 (perfect)."""
+        if quality >= 3:
+            if self.repetitions == 0:
+                interval = 1.0
+            elif self.repetitions == 1:
+                interval = 6.0
+            else:
+                interval = round(self.interval * self.ease)
+            repetitions, lapses = self.repetitions + 1, self.lapses
+        else:
+            interval, repetitions, lapses = 1.0, 0, self.lapses + 1
+        miss = 5 - quality
+        ease = max(MIN_EASE, self.ease + 0.1 - miss * (0.08 + miss * 0.02))
+        return ReviewState(
+            ease, interval, repetitions, lapses, now + interval * SECONDS_PER_DAY
+        )
+
+
+class ReviewScheduler:
+    """
+    Review states of every learner and card in one SQLite file.
+    Each review is a primary-key upsert and due cards come from the
+    (learner, due) index, so scheduling stays O(log n) however many learners
+    and sets share the file.
+    """
+
+    def __init__(self, path: str = REVIEW_DB_PATH):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "ReviewScheduler":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def state(self, learner: str, key: CardKey) -> Optional[ReviewState]:
+        """Review state of a card, None if the learner never saw it."""
+        row = self.conn.execute(
+            "SELECT ease, interval, repetitions, lapses, due FROM reviews"
+            " WHERE learner = ? AND set_name = ? AND card = ?",
+            (learner, *key),
+        ).fetchone()
+        return None if row is None else ReviewState(*row)
+
+    def review(
+        self,
+        learner: str,
+        key: CardKey,
+        quality: int,
+        now: Optional[float] = None,
+    ) -> ReviewState:
+        """Record one review of a card and schedule its next one."""
+        now = time.time() if now is None else now
+        state = (self.state(learner, key) or ReviewState()).reviewed(quality, now)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reviews VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    learner,
+                    *key,
+                    state.ease,
+                    state.interval,
+                    state.repetitions,
+                    state.lapses,
+                    state.due,
+                ),
+            )
+        return state
+
+    def _seen(self, learner: str, keys: Sequence[CardKey]) -> Set[CardKey]:
+        """Cards of the keys' sets the learner has reviewed, one key range per set."""
+        seen: Set[CardKey] = set()
+        for set_name in {set_name for set_name, _ in keys}:
+            rows = self.conn.execute(
+                "SELECT card FROM reviews WHERE learner = ? AND set_name = ?",
+                (learner, set_name),
+            )
+            seen.update((set_name, card) for card, in rows)
+        return seen
+
+    def _by_due(
+        self, learner: str, now: float, overdue: bool
+    ) -> Iterator[Tuple[str, str]]:
+        """Stream the learner's cards due by now (or not yet due), soonest first."""
+        condition = "due <= ?" if overdue else "due > ?"
+        return self.conn.execute(
+            "SELECT set_name, card FROM reviews"
+            f" WHERE learner = ? AND {condition} ORDER BY due",
+            (learner, now),
+        )
+
+    def select(
+        self,
+        learner: str,
+        keys: Sequence[CardKey],
+        count: int,
+        rng: Optional[random.Random] = None,
+        now: Optional[float] = None,
+    ) -> List[int]:
+        """
+        Choose count positions of keys to quiz on: due cards first (most
+        overdue first), then cards the learner has never seen, then the cards
+        coming due soonest.
+        """
+        rng = rng or random
+        now = time.time() if now is None else now
+        positions = {key: i for i, key in enumerate(keys)}
+        chosen: List[int] = []
+        for key in self._by_due(learner, now, overdue=True):
+            if len(chosen) == count:
+                return chosen
+            if key in positions:
+                chosen.append(positions[key])
+        if len(chosen) == count:
+            return chosen
+        seen = self._seen(learner, keys)
+        unseen = [i for i, key in enumerate(keys) if key not in seen]
+        chosen.extend(rng.sample(unseen, min(count - len(chosen), len(unseen))))
+        for key in self._by_due(learner, now, overdue=False):
+            if len(chosen) == count:
+                break
+            if key in positions:
+                chosen.append(positions[key])
+        return chosen
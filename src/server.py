@@ -0,0 +1,258 @@
+"""
+Asyncio quiz server: many concurrent learners sharing one loaded card table.
+
+Protocol: one JSON object per line in each direction. A connection is one
+learner; requests are {"op": "start", "questions": 14, "difficulty": "medium"},
+{"op": "answer", "choice": 0}, {"op": "retry"} and {"op": "quit"}. Every
+response carries "ok", and failed requests an "error" message.
+
+Ratings can be refreshed while the server runs: before a new session, at
+most once per SERVER_REFRESH_SECONDS, a refresh callback may return newer
+cards. It runs in a worker thread, so loading them never stalls other
+learners, and sessions already in progress keep the cards they started with.
+"""
+
+import asyncio
+import json
+import random
+import time
+from itertools import count
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import (
+    CARD_NAME,
+    CARD_COLOR,
+    CARD_RARITY,
+    CARDS_IN_QUIZ,
+    DIFFICULTY_SEGMENTS,
+    SEGMENT_LABELS,
+    SERVER_REFRESH_SECONDS,
+)
+from .distribution import RatingDistribution
+from .session import QuizSession
+
+
+def _int_field(request: Dict[str, object], name: str, default: int) -> int:
+    """An integer request field; floats, strings and booleans are refused."""
+    value = request.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, int):
+        raise ValueError(f"{name} must be an integer")
+    return value
+
+
+class QuizServer:
+    """
+    Serves the rating quiz over TCP or a Unix socket.
+    The card table, thresholds and question payloads are computed once and
+    shared by every session. refresh, if given, is called before a session
+    starts and returns new (quiz_cards, distribution), or None when the
+    ratings have not changed.
+    """
+
+    def __init__(
+        self,
+        quiz_cards: List[Dict[str, object]],
+        rating_key: str,
+        distribution: RatingDistribution,
+        seed: Optional[int] = None,
+        refresh: Optional[
+            Callable[[], Optional[Tuple[List[Dict[str, object]], RatingDistribution]]]
+        ] = None,
+        refresh_interval: float = SERVER_REFRESH_SECONDS,
+    ):
+        self.rating_key = rating_key
+        self.refresh = refresh
+        self.refresh_interval = refresh_interval
+        self._next_refresh = 0.0
+        self._refreshing = False
+        self.load(quiz_cards, distribution)
+        self.rng = random.Random(seed)
+        self.sessions: Dict[int, QuizSession] = {}
+        self.answers = 0
+        self._ids = count(1)
+
+    def load(
+        self, quiz_cards: List[Dict[str, object]], distribution: RatingDistribution
+    ) -> None:
+        """
+        Replace the shared cards and thresholds. New objects are built rather
+        than updated in place, so running sessions keep their own.
+        """
+        self.ratings = [float(card[self.rating_key]) for card in quiz_cards]
+        self.cards = [
+            {
+                "name": card[CARD_NAME],
+                "color": card.get(CARD_COLOR),
+                "rarity": card.get(CARD_RARITY),
+            }
+            for card in quiz_cards
+        ]
+        self.thresholds = {
+            difficulty: tuple(distribution.thresholds(segments))
+            for difficulty, segments in DIFFICULTY_SEGMENTS.items()
+        }
+        self.ranges = {
+            difficulty: list(
+                zip(
+                    (distribution.min,) + thresholds,
+                    thresholds + (distribution.max,),
+                )
+            )
+            for difficulty, thresholds in self.thresholds.items()
+        }
+
+    async def reload(self) -> bool:
+        """
+        Load newer ratings from the refresh callback, unless it ran less than
+        refresh_interval seconds ago or is still running. True if there were any.
+        """
+        now = time.monotonic()
+        if self.refresh is None or self._refreshing or now < self._next_refresh:
+            return False
+        self._refreshing = True
+        self._next_refresh = now + self.refresh_interval
+        try:
+            update = await asyncio.to_thread(self.refresh)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Keeping current ratings, refresh failed: {e}")
+            return False
+        finally:
+            self._refreshing = False
+        if update is None:
+            return False
+        self.load(*update)
+        return True
+
+    def question(self, session: QuizSession) -> Optional[Dict[str, object]]:
+        """Payload of the session's current question, None once the quiz is over."""
+        prompt = session.next_question()
+        if prompt is None:
+            return None
+        return {
+            "round": prompt.round,
+            "number": prompt.number,
+            "of": prompt.of,
+            "card": prompt.card,
+            "options": [SEGMENT_LABELS[segment] for segment in prompt.options],
+        }
+
+    def start(self, session_id: int, request: Dict[str, object]) -> Dict[str, object]:
+        """Open (or replace) the learner's session with freshly drawn cards."""
+        difficulty = request.get("difficulty", "medium")
+        if difficulty not in DIFFICULTY_SEGMENTS:
+            raise ValueError(f"Unknown difficulty '{difficulty}'")
+        num_questions = _int_field(request, "questions", CARDS_IN_QUIZ)
+        if not 0 < num_questions <= len(self.cards):
+            raise ValueError(f"questions must be between 1 and {len(self.cards)}")
+        session = self.sessions[session_id] = QuizSession(
+            self.cards,
+            self.ratings,
+            self.thresholds[difficulty],
+            num_questions,
+            rng=self.rng,
+        )
+        labels = SEGMENT_LABELS[: DIFFICULTY_SEGMENTS[difficulty]]
+        return {
+            "session": session_id,
+            "difficulty": difficulty,
+            "ranges": [
+                {"label": label, "low": low, "high": high}
+                for label, (low, high) in zip(labels, self.ranges[difficulty])
+            ],
+            "question": self.question(session),
+        }
+
+    def answer(self, session: QuizSession, choice: int) -> Dict[str, object]:
+        """Grade the current question and send the next one."""
+        result = session.answer(choice)
+        self.answers += 1
+        response: Dict[str, object] = {"correct": result.correct}
+        if result.summary is not None:
+            response["summary"] = {
+                "round": result.summary.round,
+                "percent_correct": result.summary.percent_correct,
+            }
+            if session.complete:
+                response["complete"] = True
+                response["offer_retry"] = session.offer_retry
+        response["question"] = self.question(session)
+        return response
+
+    def retry(self, session: QuizSession) -> Dict[str, object]:
+        """Restart the quiz with the original questions in a new order."""
+        session.retry()
+        return {"question": self.question(session)}
+
+    def dispatch(
+        self, session_id: int, request: Dict[str, object]
+    ) -> Dict[str, object]:
+        """Apply one request to a session and return the response fields."""
+        op = request.get("op")
+        if op == "start":
+            return self.start(session_id, request)
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise ValueError("No quiz started; send start first")
+        if op == "answer":
+            return self.answer(session, _int_field(request, "choice", -1))
+        if op == "retry":
+            return self.retry(session)
+        raise ValueError(f"Unknown op '{op}'")
+
+    async def handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        """Serve one learner until they quit or disconnect."""
+        session_id = next(self._ids)
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    # Over the reader's limit; the rest of the line cannot be
+                    # told apart from the next request, so the learner is dropped
+                    response = {"ok": False, "error": "Request line too long"}
+                    writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                    await writer.drain()
+                    break
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if request.get("op") == "quit":
+                        break
+                    if request.get("op") == "start":
+                        await self.reload()
+                    response = {"ok": True, **self.dispatch(session_id, request)}
+                except (ValueError, TypeError, AttributeError) as e:
+                    response = {"ok": False, "error": str(e)}
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.sessions.pop(session_id, None)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start_server(
+        self, host: str = None, port: int = None, path: str = None
+    ) -> asyncio.AbstractServer:
+        """Listen on a Unix socket if path is given, otherwise on host:port."""
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path=path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def serve_forever(
+        self, host: str = None, port: int = None, path: str = None
+    ) -> None:
+        server = await self.start_server(host, port, path)
+        address = path or ", ".join(
+            "%s:%d" % sock.getsockname()[:2] for sock in server.sockets
+        )
+        print(f"Serving {len(self.cards)} cards on {address}")
+        async with server:
+            await server.serve_forever()
@@ -0,0 +1,247 @@
+"""
+Quiz and pick-game state machines, free of terminal I/O.
+
+Front ends (the terminal in main.py, the quiz server, bots) ask a session for
+the next question or pack, pass the learner's answer back and render the
+results however they like.
+"""
+
+import random
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from config import CARDS_IN_QUIZ, CARD_OHWR
+from .cards import PackGenerator, get_winrate_order
+from .game_logic import evaluate_picks
+
+
+def correct_option(
+    value: float, thresholds: Sequence[float], options: Sequence[int]
+) -> int:
+    """
+    Position in options of the segment a rating falls in.
+    options are the segment numbers still offered; each keeps its own upper
+    threshold except the last one, which absorbs everything above.
+    """
+    for position, segment in enumerate(options[:-1]):
+        if value < thresholds[segment]:
+            return position
+    return len(options) - 1
+
+
+@dataclass
+class QuizPrompt:
+    """One question: a card and the rating segments offered as answers."""
+
+    card: Dict[str, object]
+    options: Tuple[int, ...]
+    round: int
+    number: int
+    of: int
+    # Position of the card in the session's cards
+    card_index: int = 0
+
+
+@dataclass
+class RoundSummary:
+    """How many of a round's questions were answered correctly."""
+
+    round: int
+    asked: int
+    correct: int
+
+    @property
+    def percent_correct(self) -> float:
+        return 100 * self.correct / self.asked
+
+
+@dataclass
+class AnswerResult:
+    """
+    Outcome of one answer; expected is the position of the right option and
+    summary is set when the answer closed a round.
+    """
+
+    correct: bool
+    expected: int
+    summary: Optional[RoundSummary] = None
+
+
+class QuizSession:
+    """
+    Rating quiz in rounds: every wrongly answered card is asked again in the
+    next round without the segment that was chosen, until a round is clean.
+    Cards and ratings are shared sequences (only positions are stored), so a
+    server can hold thousands of sessions over one card list. The cards to ask
+    are drawn at random unless selected (positions into cards) is given.
+    """
+
+    __slots__ = (
+        "cards",
+        "ratings",
+        "thresholds",
+        "rng",
+        "questions",
+        "remaining",
+        "wrong",
+        "position",
+        "round",
+        "offer_retry",
+    )
+
+    def __init__(
+        self,
+        cards: Sequence[Dict[str, object]],
+        ratings: Sequence[float],
+        thresholds: Sequence[float],
+        num_questions: int = CARDS_IN_QUIZ,
+        rng: Optional[random.Random] = None,
+        selected: Optional[Sequence[int]] = None,
+    ):
+        self.cards = cards
+        self.ratings = ratings
+        self.thresholds = tuple(thresholds)
+        self.rng = rng or random
+        options = tuple(range(len(self.thresholds) + 1))
+        if selected is None:
+            selected = self.rng.sample(range(len(cards)), num_questions)
+        self.questions = [(card, options) for card in selected]
+        self.offer_retry = False
+        self._restart()
+
+    def _restart(self) -> None:
+        self.remaining = self.questions
+        self.wrong: List[Tuple[int, Tuple[int, ...]]] = []
+        self.position = 0
+        self.round = 1
+
+    @property
+    def complete(self) -> bool:
+        return self.position >= len(self.remaining)
+
+    def next_question(self) -> Optional[QuizPrompt]:
+        """The question to answer now, None once the quiz is complete."""
+        if self.complete:
+            return None
+        card, options = self.remaining[self.position]
+        return QuizPrompt(
+            card=self.cards[card],
+            options=options,
+            round=self.round,
+            number=self.position + 1,
+            of=len(self.remaining),
+            card_index=card,
+        )
+
+    def answer(self, choice: int) -> AnswerResult:
+        """
+        Grade a 0-based choice among the current options and move on.
+        The last answer of a round closes it and starts the next one.
+        """
+        if self.complete:
+            raise ValueError("Quiz is complete")
+        card, options = self.remaining[self.position]
+        if not 0 <= choice < len(options):
+            raise ValueError(f"choice must be between 0 and {len(options) - 1}")
+        expected = correct_option(self.ratings[card], self.thresholds, options)
+        correct = choice == expected
+        if not correct:
+            # remove chosen wrong option for next round
+            self.wrong.append((card, options[:choice] + options[choice + 1 :]))
+        self.position += 1
+        result = AnswerResult(correct, expected)
+        if self.complete:
+            asked = len(self.remaining)
+            result.summary = RoundSummary(self.round, asked, asked - len(self.wrong))
+            if self.wrong:
+                self.offer_retry = True
+                self.rng.shuffle(self.wrong)
+                self.remaining, self.wrong = self.wrong, []
+                self.position = 0
+                self.round += 1
+        return result
+
+    def retry(self, selected: Optional[Sequence[int]] = None) -> None:
+        """
+        Start over from round 1 with the original cards in a new order, or
+        with the selected cards instead.
+        """
+        self.offer_retry = False
+        if selected is None:
+            self.questions = self.rng.sample(self.questions, len(self.questions))
+        else:
+            options = tuple(range(len(self.thresholds) + 1))
+            self.questions = [(card, options) for card in selected]
+        self._restart()
+
+
+@dataclass
+class PickResult:
+    """Score of one pack's picks and per-pick results as from evaluate_picks."""
+
+    pack: int
+    score: int
+    results: List[Tuple]
+    pack_cards: List[Dict[str, object]] = field(repr=False, default_factory=list)
+
+
+class DraftSession:
+    """
+    Pick game over generated packs: for each pack the player picks cards in
+    order and is scored against the pack's best cards by rating.
+    """
+
+    def __init__(
+        self,
+        generator: PackGenerator,
+        num_packs: int = 3,
+        picks_per_pack: int = 5,
+        rating_key: str = CARD_OHWR,
+    ):
+        self.generator = generator
+        self.num_packs = num_packs
+        self.picks_per_pack = picks_per_pack
+        self.rating_key = rating_key
+        self.pack_number = 0
+        self.pack: Optional[List[Dict[str, object]]] = None
+        self.results: List[PickResult] = []
+
+    @property
+    def complete(self) -> bool:
+        return len(self.results) >= self.num_packs
+
+    @property
+    def score(self) -> int:
+        return sum(result.score for result in self.results)
+
+    @property
+    def max_score(self) -> int:
+        return self.num_packs * self.picks_per_pack
+
+    def next_pack(self) -> Optional[List[Dict[str, object]]]:
+        """The pack to pick from now (dealt on first call), None once complete."""
+        if self.complete:
+            return None
+        if self.pack is None:
+            self.pack = self.generator.generate_rows()
+            self.pack_number += 1
+        return self.pack
+
+    def pick(self, positions: Sequence[int]) -> PickResult:
+        """Score picks given as 1-based pack positions, best card first."""
+        pack = self.next_pack()
+        if pack is None:
+            raise ValueError("Draft is complete")
+        if len(positions) != self.picks_per_pack or not all(
+            1 <= p <= len(pack) for p in positions
+        ):
+            raise ValueError(
+                f"Pick exactly {self.picks_per_pack} positions between 1 and {len(pack)}"
+            )
+        lookup = {i + 1: card for i, card in enumerate(pack)}
+        order = get_winrate_order(pack, self.picks_per_pack, self.rating_key)
+        score, results = evaluate_picks(list(positions), lookup, order)
+        result = PickResult(self.pack_number, score, results, pack)
+        self.results.append(result)
+        self.pack = None
+        return result
@@ -0,0 +1,123 @@
+"""
+Aggregate answer logs into accuracy reports by card, color, rarity and more.
+"""
+
+from collections import Counter
+from dataclasses import dataclass
+from itertools import compress, repeat
+from math import floor
+from operator import and_, eq, sub
+from typing import Dict, Iterable, List, Tuple
+
+from .answer_log import iter_rollup_chunks, get_rollup_path, rollup
+from .display import get_color_code
+
+# Groupings a report can be broken down by, and the logged field each reads
+_GROUPING_FIELDS = {
+    "card": "card",
+    "color": "color",
+    "rarity": "rarity",
+    "difficulty": "difficulty",
+    "band": "rating",
+    "set": "set",
+}
+GROUPINGS = tuple(_GROUPING_FIELDS)
+DEFAULT_GROUPINGS = ("color", "rarity", "difficulty", "band")
+
+
+@dataclass
+class GroupStats:
+    """Answers in one group; error sums chosen minus correct segment."""
+
+    answers: int = 0
+    correct: int = 0
+    error: int = 0
+
+    @property
+    def accuracy(self) -> float:
+        return 100 * self.correct / self.answers if self.answers else 0.0
+
+    @property
+    def mean_error(self) -> float:
+        """Positive when cards are rated too high on average, negative too low."""
+        return self.error / self.answers if self.answers else 0.0
+
+
+def _band_label(rating: float, width: float) -> str:
+    """Label of the rating band a rating falls in, e.g. '55.0-57.5'."""
+    band = floor(rating / width)
+    return f"{band * width:.1f}-{(band + 1) * width:.1f}"
+
+
+def answer_stats(
+    log_path: str,
+    groupings: Iterable[str] = DEFAULT_GROUPINGS,
+    kind: str = "quiz",
+    first_round_only: bool = True,
+    band_width: float = 2.5,
+) -> Dict[str, Dict[str, GroupStats]]:
+    """
+    Accuracy of a learner's answers of one kind ('quiz' or 'pick') per group,
+    for each grouping. The log is rolled up first, then each columnar chunk is
+    aggregated with one C-level counting pass per grouping over integer keys
+    (dictionary codes, never strings). Colors are grouped like the terminal
+    colors them (get_color_code); retried quiz rounds are left out unless
+    first_round_only is False.
+    """
+    groupings = list(groupings)
+    for grouping in groupings:
+        if grouping not in GROUPINGS:
+            raise ValueError(f"Unknown grouping '{grouping}'")
+    rollup(log_path)
+    stats: Dict[str, Dict[str, GroupStats]] = {g: {} for g in groupings}
+    fields = [_GROUPING_FIELDS[g] for g in groupings]
+    needed = fields + ["kind", "round", "chosen", "expected", "correct"]
+    for columns, strings in iter_rollup_chunks(get_rollup_path(log_path), needed):
+        if kind not in strings["kind"]:
+            continue
+        mask = list(map(eq, columns["kind"], repeat(strings["kind"].index(kind))))
+        if kind == "quiz" and first_round_only:
+            mask = list(map(and_, mask, map(eq, columns["round"], repeat(1))))
+        if kind == "quiz":
+            chosen = compress(columns["chosen"], mask)
+            errors = map(sub, chosen, compress(columns["expected"], mask))
+        else:
+            errors = repeat(0)
+        # Single pass: count answers per distinct combination of the fields
+        # the groupings need and the answer's error and correctness
+        keys = [compress(columns[field], mask) for field in fields]
+        counts = Counter(zip(*keys, errors, compress(columns["correct"], mask)))
+
+        labels = [strings.get(field) for field in fields]
+        if "color" in groupings:
+            colors = strings["color"]
+            labels[groupings.index("color")] = [get_color_code(c) for c in colors]
+        bands: Dict[float, str] = {}
+        for (*codes, error, right), n in counts.items():
+            for grouping, labels_of, code in zip(groupings, labels, codes):
+                if labels_of is not None:
+                    label = labels_of[code]
+                elif code != code:  # NaN: no rating recorded
+                    continue
+                else:
+                    label = bands.get(code)
+                    if label is None:
+                        label = bands[code] = _band_label(code, band_width)
+                group = stats[grouping].get(label)
+                if group is None:
+                    group = stats[grouping][label] = GroupStats()
+                group.answers += n
+                group.correct += n * right
+                group.error += n * error
+    return stats
+
+
+def worst_groups(
+    groups: Dict[str, GroupStats], min_answers: int = 1, limit: int = None
+) -> List[Tuple[str, GroupStats]]:
+    """Groups with at least min_answers answers, least accurate first."""
+    ranked = sorted(
+        ((label, g) for label, g in groups.items() if g.answers >= min_answers),
+        key=lambda item: (item[1].accuracy, -item[1].answers),
+    )
+    return ranked if limit is None else ranked[:limit]
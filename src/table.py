@@ -0,0 +1,329 @@
+"""
+Columnar card table for parsed 17lands card ratings.
+"""
+
+import json
+import math
+import struct
+import sys
+from array import array
+from collections.abc import Mapping
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_SET
+
+# Columns kept as interned strings; every other column is parsed as a number
+STRING_COLUMNS = (CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_SET)
+
+# Sentinel stored in float columns for empty cells (e.g. cards without GIH data)
+MISSING = float("nan")
+
+# Binary snapshot layout: magic, format version, header length, JSON header with
+# the string columns, then the raw float64/int64 columns aligned to 8 bytes
+BINARY_MAGIC = b"MTGT"
+BINARY_VERSION = 1
+_PREFIX = struct.Struct("<4sII")
+
+# Raw CSV rows converted to typed columns at a time by CardTable.from_rows
+PARSE_BATCH_ROWS = 4096
+
+
+def _align(offset: int) -> int:
+    """Round an offset up to the next multiple of 8 bytes."""
+    return (offset + 7) & ~7
+
+
+def is_count_column(column: str) -> bool:
+    """Return True for 17lands count columns such as '# GIH'."""
+    return column.startswith("#")
+
+
+def parse_rating(value: str) -> float:
+    """Parse a 17lands number like '55.2%' or '3.1pp' into a float, NaN if empty."""
+    try:
+        return float(value.rstrip("%p"))
+    except ValueError:
+        return MISSING
+
+
+def parse_count(value: str) -> int:
+    """Parse a 17lands count like '1234' into an int, 0 if empty."""
+    try:
+        return int(value)
+    except ValueError:
+        try:
+            return int(float(value.replace(",", "")))
+        except ValueError:
+            return 0
+
+
+class CardRow(Mapping):
+    """
+    Read-mostly view of one row of a CardTable.
+    Behaves like the card dicts used elsewhere, so card[CARD_NAME] keeps working.
+    """
+
+    __slots__ = ("table", "id")
+
+    def __init__(self, table: "CardTable", row_id: int):
+        self.table = table
+        self.id = row_id
+
+    def __getitem__(self, key: str):
+        return self.table.value(self.id, key)
+
+    def __setitem__(self, key: str, value) -> None:
+        self.table.set_value(self.id, key, value)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.table.columns)
+
+    def __len__(self) -> int:
+        return len(self.table.columns)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CardRow):
+            return self.table is other.table and self.id == other.id
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((id(self.table), self.id))
+
+    def __repr__(self) -> str:
+        return f"CardRow({self.id}, {self.table.value(self.id, CARD_NAME)!r})"
+
+    def to_dict(self) -> Dict[str, object]:
+        """Copy the row into a plain dict."""
+        return {key: self[key] for key in self.table.columns}
+
+
+class CardTable:
+    """
+    Compact columnar storage for card ratings.
+    Name/Color/Rarity are interned strings, '#' columns are int arrays and every
+    other column is a float array with NaN for missing values.
+    Row ids are stable indexes into the columns.
+    """
+
+    def __init__(
+        self,
+        columns: Sequence[str],
+        strings: Dict[str, List[str]],
+        floats: Dict[str, array],
+        counts: Dict[str, array],
+        source: Optional[str] = None,
+        set_name: Optional[str] = None,
+    ):
+        self.columns = list(columns)
+        self.strings = strings
+        self.floats = floats
+        self.counts = counts
+        self.source = source
+        self.set_name = set_name
+        self._extra: Dict[str, Dict[int, object]] = {}
+        first = self.columns[0] if self.columns else None
+        self._size = len(self.column(first)) if first else 0
+
+    @classmethod
+    def from_rows(
+        cls,
+        header: Sequence[str],
+        rows: Iterable[Sequence[str]],
+        source: Optional[str] = None,
+        set_name: Optional[str] = None,
+    ) -> "CardTable":
+        """
+        Build a table from a CSV header and an iterable of raw string rows.
+        Rows are converted in batches, so a streamed source is never held in
+        memory as strings beyond one batch.
+        """
+        strings, floats, counts = {}, {}, {}
+        parsers = []
+        for column in header:
+            if column in STRING_COLUMNS:
+                parsers.append((strings.setdefault(column, []), sys.intern))
+            elif is_count_column(column):
+                parsers.append((counts.setdefault(column, array("q")), parse_count))
+            else:
+                parsers.append((floats.setdefault(column, array("d")), parse_rating))
+        rows = (row for row in rows if row)
+        while True:
+            batch = list(islice(rows, PARSE_BATCH_ROWS))
+            if not batch:
+                break
+            for (values, parse), cells in zip(parsers, zip(*batch)):
+                values.extend(map(parse, cells))
+        return cls(header, strings, floats, counts, source=source, set_name=set_name)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> Tuple["CardTable", Dict[str, object]]:
+        """Rebuild a table from to_bytes() output. Returns the table and its metadata."""
+        magic, version, header_len = _PREFIX.unpack_from(data)
+        if magic != BINARY_MAGIC or version != BINARY_VERSION:
+            raise ValueError("Not a card table snapshot or unsupported version")
+        offset = _PREFIX.size
+        header = json.loads(data[offset : offset + header_len])
+        offset = _align(offset + header_len)
+        size = header["rows"]
+        numeric_columns = len(header["floats"]) + len(header["counts"])
+        if len(data) < offset + numeric_columns * size * 8 or any(
+            len(values) != size for values in header["strings"].values()
+        ):
+            raise ValueError("Truncated card table snapshot")
+        view = memoryview(data)
+        swap = header["byteorder"] != sys.byteorder
+        numeric = []
+        for typecode, keys in (("d", header["floats"]), ("q", header["counts"])):
+            store = {}
+            for key in keys:
+                column = array(typecode)
+                end = offset + size * column.itemsize
+                column.frombytes(view[offset:end])
+                if swap:
+                    column.byteswap()
+                store[key] = column
+                offset = end
+            numeric.append(store)
+        strings = {
+            key: [sys.intern(v) for v in values]
+            for key, values in header["strings"].items()
+        }
+        table = cls(
+            header["columns"],
+            strings,
+            numeric[0],
+            numeric[1],
+            source=header["source"],
+            set_name=header["set_name"],
+        )
+        return table, header["meta"]
+
+    @classmethod
+    def concat(cls, tables: Sequence["CardTable"]) -> "CardTable":
+        """
+        Merge tables into one, tagging every row with its table's set code in a
+        CARD_SET column. Columns missing from a table are filled as empty.
+        """
+        columns = [CARD_SET]
+        for table in tables:
+            columns.extend(c for c in table.columns if c not in columns)
+        strings, floats, counts = {}, {}, {}
+        for column in columns:
+            if column in STRING_COLUMNS:
+                merged = []
+                for table in tables:
+                    part = table.strings.get(column)
+                    if part is None:
+                        fill = table.set_name if column == CARD_SET else ""
+                        part = [sys.intern(fill or "")] * len(table)
+                    merged.extend(part)
+                strings[column] = merged
+            elif is_count_column(column):
+                counts[column] = array("q")
+                for table in tables:
+                    part = table.counts.get(column)
+                    counts[column].extend(part or array("q", bytes(8 * len(table))))
+            else:
+                floats[column] = array("d")
+                for table in tables:
+                    part = table.floats.get(column)
+                    floats[column].extend(part or array("d", [MISSING] * len(table)))
+        return cls(
+            columns,
+            strings,
+            floats,
+            counts,
+            source=";".join(t.source or "" for t in tables),
+            set_name="+".join(t.set_name or "" for t in tables),
+        )
+
+    def to_bytes(self, meta: Optional[Dict[str, object]] = None) -> bytes:
+        """Serialize the table into a compact binary snapshot."""
+        header = json.dumps(
+            {
+                "rows": self._size,
+                "byteorder": sys.byteorder,
+                "columns": self.columns,
+                "source": self.source,
+                "set_name": self.set_name,
+                "strings": self.strings,
+                "floats": list(self.floats),
+                "counts": list(self.counts),
+                "meta": meta or {},
+            }
+        ).encode("utf-8")
+        prefix = _PREFIX.pack(BINARY_MAGIC, BINARY_VERSION, len(header))
+        padding = b"\0" * (
+            _align(len(prefix) + len(header)) - len(prefix) - len(header)
+        )
+        chunks = [prefix, header, padding]
+        chunks.extend(column.tobytes() for column in self.floats.values())
+        chunks.extend(column.tobytes() for column in self.counts.values())
+        return b"".join(chunks)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, row_id: Union[int, slice]):
+        if isinstance(row_id, slice):
+            return self.rows(range(*row_id.indices(self._size)))
+        if row_id < 0:
+            row_id += self._size
+        if not 0 <= row_id < self._size:
+            raise IndexError("card table index out of range")
+        return CardRow(self, row_id)
+
+    def __iter__(self) -> Iterator[CardRow]:
+        return (CardRow(self, i) for i in range(self._size))
+
+    def __repr__(self) -> str:
+        return f"CardTable({self._size} cards, source={self.source!r})"
+
+    def rows(self, row_ids: Iterable[int]) -> List[CardRow]:
+        """Return row views for the given row ids."""
+        return [CardRow(self, i) for i in row_ids]
+
+    def column(self, key: str) -> Sequence:
+        """Return the underlying column storage for a key."""
+        for store in (self.strings, self.floats, self.counts):
+            if key in store:
+                return store[key]
+        raise KeyError(key)
+
+    def value(self, row_id: int, key: str):
+        """Return one cell, with None for missing float values."""
+        if key in self.floats:
+            val = self.floats[key][row_id]
+            return None if math.isnan(val) else val
+        if key in self.strings:
+            return self.strings[key][row_id]
+        if key in self.counts:
+            return self.counts[key][row_id]
+        try:
+            return self._extra[key][row_id]
+        except KeyError:
+            raise KeyError(key) from None
+
+    def set_value(self, row_id: int, key: str, value) -> None:
+        """Set one cell; unknown keys are kept in a sparse side store."""
+        if key in self.floats:
+            self.floats[key][row_id] = MISSING if value is None else float(value)
+        elif key in self.strings:
+            self.strings[key][row_id] = sys.intern(value)
+        elif key in self.counts:
+            self.counts[key][row_id] = int(value)
+        else:
+            self._extra.setdefault(key, {})[row_id] = value
+
+    def append_row(self, values: Mapping) -> int:
+        """Append a row of typed values (None for missing) and return its row id."""
+        for key, column in self.strings.items():
+            column.append(sys.intern(values.get(key) or ""))
+        for key, column in self.floats.items():
+            value = values.get(key)
+            column.append(MISSING if value is None else float(value))
+        for key, column in self.counts.items():
+            column.append(int(values.get(key) or 0))
+        self._size += 1
+        return self._size - 1
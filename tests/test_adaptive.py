@@ -0,0 +1,79 @@
+import random
+from bisect import bisect_right
+
+from src.adaptive import AdaptiveQuiz, SkillStore, prior_difficulty, success_chance
+from src.distribution import RatingDistribution
+
+
+def make_quiz(difficulties, skill=0.0, **kwargs):
+    kwargs.setdefault("rng", random.Random(0))
+    return AdaptiveQuiz(difficulties, skill, **kwargs)
+
+
+def test_success_chance_and_prior():
+    assert success_chance(0.0, 0.0) == 0.5
+    assert success_chance(1.0, 0.0) > 0.5 > success_chance(0.0, 0.0, offset=0.5)
+    # Cards near a threshold start out harder than cards far from every threshold
+    assert prior_difficulty(55.1, [50.0, 55.0], noise=2.0) > prior_difficulty(
+        58.0, [50.0, 55.0], noise=2.0
+    )
+
+
+def test_next_question_picks_card_nearest_target_difficulty():
+    quiz = make_quiz(
+        [-2.0, -0.1, 1.5, 3.0], target=0.5, segment_offsets={4: 0.0}, spread=1
+    )
+    assert quiz.next_question() == (1, 4)
+    # A strong learner is given the hardest card
+    quiz.skill = 3.0
+    assert quiz.next_question() == (3, 4)
+
+
+def test_next_question_chooses_segments_for_target():
+    offsets = {3: -1.0, 4: 0.0, 5: 1.0}
+    quiz = make_quiz([0.0] * 5, skill=1.0, target=0.5, segment_offsets=offsets)
+    assert quiz.next_question()[1] == 5
+    quiz.skill = -1.0
+    assert quiz.next_question()[1] == 3
+
+
+def test_update_moves_estimates_and_keeps_index_sorted():
+    quiz = make_quiz([0.0, 0.5, 1.0, 1.5], target=0.5, segment_offsets={4: 0.0})
+    chance = quiz.update(1, 4, correct=True)
+    assert 0.0 < chance < 1.0
+    assert quiz.skill > 0.0 and quiz.difficulties[1] < 0.5
+    quiz.update(2, 4, correct=False)
+    assert quiz.difficulties[2] > 1.0
+    assert quiz._index == sorted((d, i) for i, d in enumerate(quiz.difficulties))
+    # Cards just asked are skipped
+    assert quiz.next_question()[0] not in (1, 2)
+
+
+def test_simulated_learner_converges_to_target_rate():
+    rng = random.Random(4)
+    ratings = [rng.uniform(45.0, 65.0) for _ in range(300)]
+    distribution = RatingDistribution(ratings)
+    medium = distribution.thresholds(4)
+    quiz = make_quiz([prior_difficulty(r, medium) for r in ratings], target=0.7)
+    results = []
+    for _ in range(3000):
+        position, segments = quiz.next_question()
+        thresholds = distribution.thresholds(segments)
+        rating = ratings[position]
+        estimate = rating + rng.gauss(0.0, 2.0)
+        correct = bisect_right(thresholds, estimate) == bisect_right(thresholds, rating)
+        quiz.update(position, segments, correct)
+        results.append(correct)
+    assert abs(sum(results[-1000:]) / 1000 - 0.7) < 0.05
+
+
+def test_skill_store_round_trip(tmp_path):
+    with SkillStore(str(tmp_path / "skills.db")) as store:
+        assert store.skill("ann") == 0.0
+        store.save("ann", 0.4, ("fin", "Foo"), 1.2)
+        store.save("ann", 0.6, ("eoe", "Bar"), -0.3)
+        assert store.skill("ann") == 0.6
+        keys = [("fin", "Foo"), ("eoe", "Bar"), ("fin", "Baz")]
+        assert store.difficulties(keys) == {("fin", "Foo"): 1.2, ("eoe", "Bar"): -0.3}
+        answers = store.conn.execute("SELECT answers FROM learners").fetchone()[0]
+        assert answers == 2
@@ -0,0 +1,69 @@
+import math
+
+from config import CARD_OHWR
+from src.answer_log import (
+    AnswerLog,
+    MISSING_INT,
+    get_rollup_path,
+    iter_answers,
+    read_rollup,
+    rollup,
+)
+
+
+def make_card(name="Foo", rating=55.0):
+    return {"Name": name, "Color": "G", "Rarity": "C", CARD_OHWR: rating}
+
+
+def record(log, name, chosen, expected=1):
+    log.record_quiz(
+        make_card(name), "fin", CARD_OHWR, "medium", 4, chosen, expected, 1.5
+    )
+
+
+def test_answer_log_writes_in_batches(tmp_path):
+    path = tmp_path / "answers" / "ann.jsonl"
+    with AnswerLog(str(path), batch_size=2) as log:
+        record(log, "Foo", 1)
+        assert not path.exists()
+        record(log, "Bar", 2)
+        assert len(path.read_text().splitlines()) == 2
+        record(log, "Baz", 1)
+    answers = list(iter_answers(str(path)))
+    assert [a["card"] for a in answers] == ["Foo", "Bar", "Baz"]
+    assert [a["correct"] for a in answers] == [1, 0, 1]
+    assert answers[0]["rating"] == 55.0 and answers[0]["difficulty"] == "medium"
+
+
+def test_pick_records_name_the_best_card(tmp_path):
+    path = tmp_path / "ann.jsonl"
+    pack = [make_card("Foo", 60.0), make_card("Bar", 50.0)]
+    results = [(1, "Foo", True), (2, "Foo", False, "Bar")]
+    with AnswerLog(str(path)) as log:
+        log.record_picks(results, [1, 1], pack, "fin", CARD_OHWR, 3.0)
+    first, second = iter_answers(str(path))
+    assert (first["kind"], first["best"], first["correct"]) == ("pick", "Foo", 1)
+    assert (second["pick"], second["best"], second["rating"]) == (2, "Bar", 60.0)
+
+
+def test_rollup_appends_only_new_complete_lines(tmp_path):
+    path = tmp_path / "ann.jsonl"
+    with AnswerLog(str(path)) as log:
+        record(log, "Foo", 1)
+        record(log, "Bar", 2)
+    assert rollup(str(path)) == 2
+    assert rollup(str(path)) == 0
+    with AnswerLog(str(path)) as log:
+        log.record_picks([(1, "Foo", True)], [3], [make_card()], "fin", CARD_OHWR, 2.0)
+    # A half-written line is left for the next rollup
+    with open(path, "a") as f:
+        f.write('{"kind": "qu')
+    assert rollup(str(path)) == 1
+
+    columns = read_rollup(get_rollup_path(str(path)))
+    assert columns["card"] == ["Foo", "Bar", "Foo"]
+    assert columns["kind"] == ["quiz", "quiz", "pick"]
+    assert list(columns["correct"]) == [1, 0, 1]
+    assert list(columns["segments"]) == [4, 4, MISSING_INT]
+    assert columns["difficulty"][2] == ""
+    assert columns["latency"][2] == 2.0 and not math.isnan(columns["rating"][2])
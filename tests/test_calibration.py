@@ -0,0 +1,62 @@
+import random
+
+from src.calibration import (
+    Calibrator,
+    QuestionCell,
+    SegmentCell,
+    recommend_neighbor_prob,
+    recommend_segments,
+    simulate_segments,
+)
+from src.distribution import RatingDistribution
+from src.quiz import make_question
+
+
+def make_calibrator(seed=0, chunk_size=500):
+    rng = random.Random(7)
+    ratings = [round(rng.uniform(45.0, 65.0), 1) for _ in range(200)]
+    return Calibrator(
+        ratings, RatingDistribution(ratings), seed=seed, chunk_size=chunk_size
+    )
+
+
+def test_noiseless_learner_answers_every_segment_question():
+    ratings = [50.0, 52.0, 54.0, 56.0, 58.0, 60.0]
+    thresholds = RatingDistribution(ratings).thresholds(3)
+    assert simulate_segments(ratings, thresholds, 0.0, 1000, random.Random(1)) == 1000
+
+
+def test_accuracy_falls_with_noise_and_segments():
+    calibrator = make_calibrator()
+    cells = [SegmentCell(3, 1.0), SegmentCell(3, 4.0), SegmentCell(5, 1.0)]
+    accuracy = calibrator.accuracy(cells, 4000)
+    assert accuracy[SegmentCell(3, 1.0)] > accuracy[SegmentCell(3, 4.0)] + 0.1
+    assert accuracy[SegmentCell(3, 1.0)] > accuracy[SegmentCell(5, 1.0)] + 0.05
+
+
+def test_accuracy_does_not_depend_on_worker_count():
+    cells = [SegmentCell(4, 2.0), QuestionCell(1.0, 0.5, 2.0)]
+    serial = make_calibrator().accuracy(cells, 1200)
+    parallel = make_calibrator().accuracy(cells, 1200, workers=2)
+    assert serial == parallel
+
+
+def test_make_question_neighbor_prob_one_always_offers_a_neighbor():
+    rng = random.Random(3)
+    for _ in range(50):
+        q = make_question(
+            {"v": 52.3}, "v", 40.0, 60.0, step=1.0, rng=rng, neighbor_prob=1.0
+        )
+        assert 51.0 in q.options or 53.0 in q.options
+
+
+def test_recommendations():
+    accuracy = {2: 0.9, 3: 0.8, 4: 0.65, 5: 0.55}
+    assert recommend_segments(accuracy, {"easy": 0.78, "hard": 0.5}) == {
+        "easy": 3,
+        "hard": 5,
+    }
+    by_chance = {0.0: 0.7, 0.5: 0.6, 1.0: 0.5}
+    assert abs(recommend_neighbor_prob(by_chance, 0.65) - 0.25) < 1e-9
+    # Out of reach: the nearest simulated chance
+    assert recommend_neighbor_prob(by_chance, 0.9) == 0.0
@@ -1,12 +1,22 @@
+import pytest
+
 from src.cards import (
     filter_cards_by_rarity,
     remove_top_n_by_winrate,
     get_winrate_order,
+    top_k_by_rating,
+    top_k_indices,
+    PackGenerator,
+    PackSlot,
 )
+from src.index import CardIndex
+from src.table import CardTable
 from config import (
     CARD_NAME,
+    CARD_COLOR,
     CARD_RARITY,
     CARD_OHWR,
+    CARD_GIHWR,
 )
 
 
@@ -53,3 +63,97 @@ def test_get_winrate_order():
     ordered = get_winrate_order(cards)
     # Expect descending order: Y(0.8), Z(0.5), X(0.2)
     assert [c[CARD_OHWR] for c in ordered] == [0.8, 0.5, 0.2]
+
+
+def test_card_table_accepted_in_place_of_dicts():
+    table = CardTable.from_rows(
+        [CARD_NAME, CARD_RARITY, CARD_OHWR],
+        [["A", "C", "51.0%"], ["B", "U", "58.5%"], ["C", "C", "55.0%"]],
+    )
+    commons = filter_cards_by_rarity(table, "C")
+    assert [c[CARD_NAME] for c in commons] == ["A", "C"]
+    ordered = get_winrate_order(commons)
+    assert [c[CARD_NAME] for c in ordered] == ["C", "A"]
+
+
+def test_get_winrate_order_parses_percent_strings():
+    # "9.5%" sorts above "10.0%" as text; ratings must compare numerically
+    cards = [make_card("A", "C", "9.5%"), make_card("B", "C", "10.0%")]
+    assert [c[CARD_NAME] for c in get_winrate_order(cards)] == ["B", "A"]
+
+
+def test_top_k_indices_missing_values_last():
+    values = [52.0, None, 60.0, float("nan"), "", 55.0, 60.0]
+    assert top_k_indices(values, 3) == [2, 6, 5]
+    assert top_k_indices(values) == [2, 6, 5, 0, 1, 3, 4]
+
+
+def test_top_k_indices_heap_matches_sort():
+    import random
+
+    rng = random.Random(2)
+    values = [rng.choice([None, 50.0, 51.5, 53.0, 60.0]) for _ in range(2000)]
+    expected = top_k_indices(values)[:10]
+    assert top_k_indices(values, 10) == expected
+
+
+def test_top_k_by_rating_any_column():
+    cards = [
+        {CARD_NAME: "A", CARD_GIHWR: 55.0},
+        {CARD_NAME: "B", CARD_GIHWR: None},
+        {CARD_NAME: "C", CARD_GIHWR: 58.0},
+    ]
+    best = top_k_by_rating(cards, 2, CARD_GIHWR)
+    assert [c[CARD_NAME] for c in best] == ["C", "A"]
+    everything = top_k_by_rating(cards, rating_key=CARD_GIHWR)
+    assert [c[CARD_NAME] for c in everything] == ["C", "A", "B"]
+    rated = top_k_by_rating(cards, rating_key=CARD_GIHWR, drop_missing=True)
+    assert [c[CARD_NAME] for c in rated] == ["C", "A"]
+
+
+def make_pack_index(commons=20, uncommons=6, rares=3, mythics=1):
+    rows = []
+    for rarity, count in (
+        ("C", commons),
+        ("U", uncommons),
+        ("R", rares),
+        ("M", mythics),
+    ):
+        rows.extend([f"{rarity}{i}", "G", rarity, "50%"] for i in range(count))
+    table = CardTable.from_rows([CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR], rows)
+    return CardIndex(table)
+
+
+def test_pack_generator_follows_template():
+    generator = PackGenerator(make_pack_index(), seed=7)
+    pack = generator.generate_rows()
+    rarities = [c[CARD_RARITY] for c in pack]
+    assert len(pack) == generator.pack_size == 15
+    assert rarities[:11] == ["C"] * 11
+    assert rarities[11:14] == ["U"] * 3
+    assert rarities[14] in ("R", "M")
+    # No card repeats within a pack
+    assert len({c[CARD_NAME] for c in pack}) == 15
+
+
+def test_pack_generator_is_seedable_and_streams():
+    first = list(PackGenerator(make_pack_index(), seed=3).packs(5))
+    second = list(PackGenerator(make_pack_index(), seed=3).packs(5))
+    assert first == second
+    assert len(first) == 5
+
+
+def test_pack_generator_upgrade_odds():
+    index = make_pack_index()
+    template = [PackSlot("R", 1, upgrade_rarity="M", upgrade_odds=1.0)]
+    pack = PackGenerator(index, template, seed=1).generate_rows()
+    assert pack[0][CARD_RARITY] == "M"
+    # Without mythics in the selection the rare slot is never upgraded
+    no_mythics = index.select(rarities=["C", "U", "R"])
+    pack = PackGenerator(index, template, seed=1, selection=no_mythics).generate_rows()
+    assert pack[0][CARD_RARITY] == "R"
+
+
+def test_pack_generator_rejects_small_pools():
+    with pytest.raises(ValueError):
+        PackGenerator(make_pack_index(commons=5))
@@ -0,0 +1,33 @@
+from array import array
+
+import pytest
+
+from src.chunks import ChunkFormat
+
+
+def test_chunks_round_trip_with_header_sized_width(tmp_path):
+    path = str(tmp_path / "data.bin")
+    chunks = ChunkFormat("test file", b"TEST", "I", "keys")
+    chunks.append(path, 7, 2, {"keys": ["a"]}, [array("d", [1.5, 2.5])])
+    columns = [array("d", [3.0]), array("q", [-4])]
+    chunks.append(path, 9, 1, {"keys": ["a", "b"]}, columns)
+    read = list(chunks.read(path))
+    assert [(c.tag, c.rows, c.header["keys"]) for c in read] == [
+        (7, 2, ["a"]),
+        (9, 1, ["a", "b"]),
+    ]
+    assert list(read[0].column(0)) == [1.5, 2.5]
+    assert list(read[1].column(1, "q")) == [-4]
+    assert list(chunks.read(str(tmp_path / "missing.bin"))) == []
+
+
+def test_last_tag_seeks_over_fixed_width_chunks(tmp_path):
+    path = str(tmp_path / "data.bin")
+    chunks = ChunkFormat("test file", b"TEST", "Q", 2)
+    assert chunks.last_tag(path) == 0
+    for tag in (10, 2**40):
+        columns = [array("q", [1, 2, 3]), array("d", [0.0, 1.0, 2.0])]
+        chunks.append(path, tag, 3, {"strings": {"x": ["y" * 5]}}, columns)
+    assert chunks.last_tag(path) == 2**40
+    with pytest.raises(ValueError):
+        list(ChunkFormat("other file", b"OTHR", "Q", 2).read(path))
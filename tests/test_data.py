@@ -8,6 +8,7 @@ from src.data import (
     convert_keys_to_float,
     load_card_data,
 )
+from src.table import CardTable
 from config import CARD_OHWR
 
 
@@ -63,7 +64,221 @@ def test_load_card_data(monkeypatch, tmp_path):
     monkeypatch.setattr(data_mod, "find_most_recent_csv", lambda s: str(tmpfile))
 
     cards = load_card_data("fin")
-    assert isinstance(cards, list)
+    assert isinstance(cards, CardTable)
     # Only one card has non-empty OH WR
     assert len(cards) == 1
     assert cards[0]["Name"] == "Foo"
+    # Ratings are parsed to floats at load time
+    assert cards[0][CARD_OHWR] == 23.5
+    assert cards.set_name == "fin"
+
+
+def test_convert_keys_to_float_leaves_table_untouched():
+    table = CardTable.from_rows(["Name", "OH WR"], [["Foo", "50%"]])
+    convert_keys_to_float(table)
+    assert table[0][CARD_OHWR] == 50.0
+
+
+def test_load_card_data_uses_binary_cache(monkeypatch, tmp_path):
+    tmpfile = tmp_path / "card-ratings-2025-06-18.csv"
+    lines = ["Name,Color,Rarity,# GIH,OH WR\n", "Foo,G,C,12,23.5%\n", "Bar,R,U,3,\n"]
+    tmpfile.write_text("".join(lines), encoding="utf-8")
+    import src.data as data_mod
+
+    monkeypatch.setattr(data_mod, "find_most_recent_csv", lambda s: str(tmpfile))
+    first = load_card_data("fin")
+    assert os.path.exists(data_mod.get_cache_path(str(tmpfile)))
+
+    # Second load must come from the snapshot, not the CSV parser
+    def fail(*args, **kwargs):
+        raise AssertionError("CSV was re-parsed")
+
+    monkeypatch.setattr(data_mod, "read_card_csv", fail)
+    cached = load_card_data("fin")
+    assert cached.columns == first.columns
+    assert [c.to_dict() for c in cached] == [c.to_dict() for c in first]
+    assert cached.column("# GIH").typecode == "q"
+
+
+def test_binary_cache_invalidated_when_csv_changes(monkeypatch, tmp_path):
+    tmpfile = tmp_path / "card-ratings-2025-06-18.csv"
+    tmpfile.write_text("Name,OH WR\nFoo,23.5%\n", encoding="utf-8")
+    import src.data as data_mod
+
+    monkeypatch.setattr(data_mod, "find_most_recent_csv", lambda s: str(tmpfile))
+    load_card_data("fin")
+    tmpfile.write_text("Name,OH WR\nFoo,23.5%\nBar,40.0%\n", encoding="utf-8")
+    cards = load_card_data("fin")
+    assert [c["Name"] for c in cards] == ["Foo", "Bar"]
+
+
+def test_truncated_or_garbage_cache_is_reparsed(monkeypatch, tmp_path):
+    tmpfile = tmp_path / "card-ratings-2025-06-18.csv"
+    tmpfile.write_text("Name,# GIH,OH WR\nFoo,12,23.5%\nBar,3,40.0%\n")
+    import src.data as data_mod
+
+    monkeypatch.setattr(data_mod, "find_most_recent_csv", lambda s: str(tmpfile))
+    cache_path = data_mod.get_cache_path(str(tmpfile))
+    load_card_data("fin")
+    with open(cache_path, "rb") as f:
+        snapshot = f.read()
+    # Cut inside the prefix, inside the body, and plain garbage
+    for broken in (snapshot[:2], snapshot[:-8], b"garbage"):
+        with open(cache_path, "wb") as f:
+            f.write(broken)
+        assert data_mod.load_cached_table(str(tmpfile)) is None
+        cards = load_card_data("fin")
+        assert [c["Name"] for c in cards] == ["Foo", "Bar"]
+        assert cards[1]["# GIH"] == 3
+
+
+def test_convert_keys_to_float_multiple_keys():
+    cards = [{"A": "1.5%", "B": "2%"}]
+    convert_keys_to_float(cards, ["A", "B"])
+    assert cards == [{"A": 1.5, "B": 2.0}]
+
+
+def write_set(root, set_name, rows):
+    set_dir = root / "resources" / "sets" / set_name
+    set_dir.mkdir(parents=True)
+    lines = ["Name,Color,Rarity,OH WR\n"] + [f"{r},G,C,50.0%\n" for r in rows]
+    (set_dir / "card-ratings-2025-06-18.csv").write_text("".join(lines))
+
+
+def test_discover_sets_and_load_multi_set(monkeypatch, tmp_path):
+    from src.data import discover_sets, load_multi_set
+    import src.data as data_mod
+
+    write_set(tmp_path, "fin", ["Foo", "Bar"])
+    write_set(tmp_path, "eoe", ["Baz"])
+    (tmp_path / "resources" / "sets" / "empty").mkdir()
+    monkeypatch.chdir(tmp_path)
+    real_find = data_mod.find_most_recent_csv
+    monkeypatch.setattr(
+        data_mod, "find_most_recent_csv", lambda s: real_find(s, testing=True)
+    )
+
+    assert discover_sets() == ["eoe", "fin"]
+    cards = load_multi_set()
+    assert [(c["Set"], c["Name"]) for c in cards] == [
+        ("eoe", "Baz"),
+        ("fin", "Foo"),
+        ("fin", "Bar"),
+    ]
+
+
+def test_import_snapshot_updates_table_index_and_quantiles(tmp_path):
+    from src.data import import_snapshot, read_card_csv
+    from src.distribution import get_rating_distribution, clear_distribution_cache
+    from src.index import CardIndex
+
+    old_csv = tmp_path / "card-ratings-2025-06-18.csv"
+    old_csv.write_text(
+        "Name,Color,Rarity,# GIH,OH WR\n"
+        "Foo,G,C,10,50.0%\nBar,R,C,20,52.0%\nBaz,U,U,30,54.0%\n"
+    )
+    new_csv = tmp_path / "card-ratings-2025-06-19.csv"
+    new_csv.write_text(
+        "Name,Color,Rarity,# GIH,OH WR\n"
+        "Foo,G,C,10,50.0%\nBar,R,U,20,55.5%\nQux,W,C,5,49.0%\n"
+    )
+    clear_distribution_cache()
+    table = read_card_csv(str(old_csv), "fin")
+    index = CardIndex(table)
+    everything = get_rating_distribution(table, CARD_OHWR)
+    assert everything.thresholds(2) == [52.0]
+
+    delta = import_snapshot(table, str(new_csv), index)
+    assert delta.changed == ["Bar"]
+    assert delta.added == ["Qux"]
+    assert delta.removed == ["Baz"]
+    assert delta.cells[1] == {"Rarity": ("C", "U"), CARD_OHWR: (52.0, 55.5)}
+    assert table.source == str(new_csv)
+    assert [c["Name"] for c in table] == ["Foo", "Bar", "Baz", "Qux"]
+    assert table[2][CARD_OHWR] is None and table[2]["# GIH"] == 0
+    # Index reflects the new rarities and the appended card, and drops Baz
+    assert index.rarity_counts(["C", "U"], index.select()) == {"C": 2, "U": 1}
+    assert index.count(index.select(colors=["U"])) == 0
+    # The memoized distribution was patched in place rather than rebuilt
+    patched = get_rating_distribution(table, CARD_OHWR)
+    assert patched is everything
+    assert patched.values == [49.0, 50.0, 55.5]
+    assert import_snapshot(table, str(new_csv), index).changed == []
+    # Baz is selectable again once a snapshot rates it again
+    import_snapshot(table, str(old_csv), index)
+    assert index.count(index.select(colors=["U"])) == 1
+
+
+def test_refresh_snapshot_imports_stale_snapshots_without_exiting(
+    monkeypatch, tmp_path
+):
+    from src.data import read_card_csv, refresh_snapshot
+
+    set_dir = tmp_path / "resources" / "sets" / "fin"
+    set_dir.mkdir(parents=True)
+    # Both snapshots are years past the staleness cutoff
+    old_csv = set_dir / "card-ratings-2020-01-01.csv"
+    old_csv.write_text("Name,Color,Rarity,OH WR\nFoo,G,C,50.0%\n")
+    monkeypatch.chdir(tmp_path)
+    table = read_card_csv("resources/sets/fin/card-ratings-2020-01-01.csv", "fin")
+    assert refresh_snapshot(table) is None
+    (set_dir / "card-ratings-2020-01-02.csv").write_text(
+        "Name,Color,Rarity,OH WR\nFoo,G,C,51.0%\n"
+    )
+    delta = refresh_snapshot(table)
+    assert delta.changed == ["Foo"] and table[0][CARD_OHWR] == 51.0
+    assert table.source.endswith("2020-01-02.csv")
+
+
+def test_import_snapshot_rejects_merged_tables(tmp_path):
+    from src.data import import_snapshot
+
+    csv_file = tmp_path / "card-ratings-2025-06-18.csv"
+    csv_file.write_text("Name,OH WR\nFoo,50.0%\n")
+    merged = CardTable.concat(
+        [
+            CardTable.from_rows(["Name", "OH WR"], [["Foo", "50%"]], set_name="fin"),
+            CardTable.from_rows(["Name", "OH WR"], [["Bar", "52%"]], set_name="eoe"),
+        ]
+    )
+    with pytest.raises(ValueError):
+        import_snapshot(merged, str(csv_file))
+
+
+def test_iter_card_csv_projects_and_filters_while_streaming(tmp_path):
+    from src.data import iter_card_csv
+
+    tmpfile = tmp_path / "card-ratings-2025-06-18.csv"
+    tmpfile.write_text(
+        "Name,Color,Rarity,# GIH,OH WR\n"
+        "Foo,G,C,12,55.0%\n"
+        "Bar,R,U,3,\n"
+        "Baz,U,C,7,51.0%\n"
+        "\n"
+        "Qux,W,R,9,60.0%\n",
+        encoding="utf-8",
+    )
+    rows = iter_card_csv(
+        str(tmpfile), columns=["OH WR", "Name"], rarities=["C", "U"], exclude={"Baz"}
+    )
+    assert next(rows) == ("OH WR", "Name")
+    assert list(rows) == [("55.0%", "Foo")]
+    everything = list(iter_card_csv(str(tmpfile), rating_key=None))
+    assert len(everything) == 5
+    with pytest.raises(ValueError):
+        next(iter_card_csv(str(tmpfile), columns=["GIH WR"]))
+
+
+def test_load_card_data_with_columns_streams_past_cache(monkeypatch, tmp_path):
+    tmpfile = tmp_path / "card-ratings-2025-06-18.csv"
+    tmpfile.write_text(
+        "Name,Color,Rarity,# GIH,OH WR\nFoo,G,C,12,23.5%\nBar,R,U,3,40.0%\n",
+        encoding="utf-8",
+    )
+    import src.data as data_mod
+
+    monkeypatch.setattr(data_mod, "find_most_recent_csv", lambda s: str(tmpfile))
+    cards = load_card_data("fin", columns=["Name", "OH WR"], rarities=["U"])
+    assert cards.columns == ["Name", "OH WR"]
+    assert [c.to_dict() for c in cards] == [{"Name": "Bar", "OH WR": 40.0}]
+    assert not os.path.exists(data_mod.get_cache_path(str(tmpfile)))
@@ -0,0 +1,76 @@
+import random
+
+from config import CARD_GIHWR, CARD_OHWR
+from src.deck import COLOR_PAIRS, DeckEstimator, castable_pairs
+from src.table import CardTable
+
+
+def make_table(rows):
+    return CardTable.from_rows(["Name", "Color", CARD_GIHWR, CARD_OHWR], rows)
+
+
+def brute_force_win_rate(table, pool, size, filler):
+    best = None
+    for pair in COLOR_PAIRS:
+        values = sorted(
+            (
+                table.value(row, CARD_GIHWR) or table.value(row, CARD_OHWR)
+                for row in pool
+                if set(table.value(row, "Color")) <= set(pair)
+                and (table.value(row, CARD_GIHWR) or table.value(row, CARD_OHWR))
+            ),
+            reverse=True,
+        )[:size]
+        score = (sum(values) + (size - len(values)) * filler) / size
+        best = score if best is None else max(best, score)
+    return best
+
+
+def test_castable_pairs():
+    assert len(castable_pairs("")) == len(COLOR_PAIRS) == 10
+    assert [COLOR_PAIRS[i] for i in castable_pairs("W")] == ["WU", "WB", "WR", "WG"]
+    assert [COLOR_PAIRS[i] for i in castable_pairs("UW")] == ["WU"]
+    assert castable_pairs("WUB") == ()
+
+
+def test_estimate_picks_best_pair_and_fills_short_decks():
+    table = make_table(
+        [
+            ["A", "R", "60.0%", "58.0%"],
+            ["B", "G", "57.0%", "56.0%"],
+            ["C", "W", "", "62.0%"],
+            ["D", "", "55.0%", "55.0%"],
+            ["E", "U", "", ""],
+            ["F", "WUB", "70.0%", "70.0%"],
+        ]
+    )
+    estimator = DeckEstimator(table, size=3)
+    assert estimator.filler == 55.0
+    deck = estimator.estimate(range(6))
+    # White falls back to OH WR; three-color and unrated cards never make a deck
+    assert deck.pair == "WR"
+    assert deck.cards == (2, 0, 3)
+    assert abs(deck.win_rate - (62.0 + 60.0 + 55.0) / 3) < 1e-9
+    # One card short: the empty slots count as filler
+    assert abs(estimator.win_rate([1]) - (57.0 + 55.0 + 55.0) / 3) < 1e-9
+
+
+def test_win_rate_matches_brute_force():
+    rng = random.Random(5)
+    colors = ["W", "U", "B", "R", "G", "WU", "BR", "GW", "", "URG"]
+    rows = [
+        [
+            f"C{i}",
+            rng.choice(colors),
+            "" if rng.random() < 0.2 else f"{rng.uniform(45, 65):.1f}%",
+            "" if rng.random() < 0.1 else f"{rng.uniform(45, 65):.1f}%",
+        ]
+        for i in range(120)
+    ]
+    table = make_table(rows)
+    estimator = DeckEstimator(table)
+    for _ in range(50):
+        pool = rng.sample(range(120), 42)
+        expected = brute_force_win_rate(table, pool, 23, estimator.filler)
+        assert abs(estimator.win_rate(pool) - expected) < 1e-9
+        assert abs(estimator.estimate(pool).win_rate - expected) < 1e-9
@@ -5,7 +5,11 @@ from src.display import (
     get_color_code,
     get_card_url,
     format_card_line,
+    render_lines,
+    print_pack,
+    print_pick_summary,
 )
+import src.display as display
 from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR
 
 
@@ -53,3 +57,68 @@ def test_get_card_url_and_format_card_line():
     # Test format with percent
     line_pct = format_card_line(card.copy(), show_percent=True)
     assert "42%" in line_pct
+    # Parsed ratings print as percentages, like the CSV cells they came from
+    card[CARD_OHWR] = 56.5
+    assert format_card_line(card, show_percent=True).endswith(" - 56.5%")
+
+
+def make_pack():
+    return [
+        {CARD_NAME: "Alpha", CARD_RARITY: "C", CARD_COLOR: "G", CARD_OHWR: 55.0},
+        {CARD_NAME: "Beta", CARD_RARITY: "U", CARD_COLOR: "RW", CARD_OHWR: 58.0},
+        {CARD_NAME: "Gamma", CARD_RARITY: "C", CARD_COLOR: "", CARD_OHWR: 51.0},
+    ]
+
+
+class CountingStream:
+    def __init__(self):
+        self.writes = []
+
+    def write(self, text):
+        self.writes.append(text)
+
+    def flush(self):
+        pass
+
+
+def test_render_lines_wraps_colored_lines_once_per_line(monkeypatch):
+    monkeypatch.setattr(display, "_ansi_wrap", lambda color: (f"<{color}>", "</>"))
+    text = render_lines([("plain", None), ("go", "green")])
+    assert text == "plain\n<green>go</>\n"
+
+
+def test_print_pack_writes_whole_pack_at_once(monkeypatch):
+    stream = CountingStream()
+    monkeypatch.setattr(display.sys, "stdout", stream)
+    lookup = print_pack(make_pack())
+    assert len(stream.writes) == 1
+    lines = stream.writes[0].splitlines()
+    assert [line.split(" (")[0] for line in lines] == [
+        "1. Alpha",
+        "2. Beta",
+        "3. Gamma",
+    ]
+    assert lookup[2][CARD_NAME] == "Beta" and lookup[2]["PackIndex"] == 2
+
+
+def test_print_pick_summary_looks_up_cards_by_name(monkeypatch):
+    stream = CountingStream()
+    monkeypatch.setattr(display.sys, "stdout", stream)
+    results = [
+        (1, "Beta", True, "Beta"),
+        (2, "Gamma", False, "Alpha"),
+        (3, "Unknown", False, "Missing"),
+        (4, None, False, "Alpha"),
+    ]
+    print_pick_summary(results, make_pack())
+    assert len(stream.writes) == 1
+    lines = stream.writes[0].splitlines()
+    assert lines[0] == "Pick summary:"
+    assert lines[1].startswith("Pick 1: Beta (U)") and lines[1].endswith("Correct")
+    assert lines[2].startswith("Pick 2: Gamma (C)")
+    assert lines[3].startswith("\t - Wrong, best pick is: Alpha (C)")
+    assert lines[4:] == [
+        "Pick 3: Unknown",
+        "\t - Wrong, best pick is: Missing",
+        "Pick 4: Invalid selection",
+    ]
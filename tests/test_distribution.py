@@ -0,0 +1,58 @@
+from src.distribution import (
+    RatingDistribution,
+    get_rating_distribution,
+    clear_distribution_cache,
+)
+from src.index import CardIndex
+from src.table import CardTable
+from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR, CARD_GIHWR
+
+
+def make_table():
+    rows = [[str(i), "G", "C" if i % 2 else "U", f"{40 + i}%", ""] for i in range(10)]
+    header = [CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR, CARD_GIHWR]
+    return CardTable.from_rows(header, rows, source="a.csv")
+
+
+def test_thresholds_match_index_formula():
+    values = [float(v) for v in range(20)]
+    dist = RatingDistribution(reversed(values))
+    assert dist.min == 0.0 and dist.max == 19.0
+    for segments in (3, 4, 5):
+        n = len(values)
+        expected = [values[(k * n) // segments] for k in range(1, segments)]
+        assert dist.thresholds(segments) == expected
+    assert dist.quantile(0.5) == 10.0
+    assert dist.quantile(1.0) == 19.0
+
+
+def test_from_cards_converts_and_skips_missing():
+    cards = [{CARD_OHWR: "55%"}, {CARD_OHWR: ""}, {CARD_OHWR: "50.5%"}]
+    dist = RatingDistribution.from_cards(cards, CARD_OHWR)
+    assert dist.values == [50.5, 55.0]
+
+
+def test_get_rating_distribution_is_memoized_per_selection():
+    clear_distribution_cache()
+    table = make_table()
+    index = CardIndex(table)
+    commons = index.select(rarities=["C"])
+    dist = get_rating_distribution(table, CARD_OHWR, commons)
+    assert dist.values == [41.0, 43.0, 45.0, 47.0, 49.0]
+    assert get_rating_distribution(table, CARD_OHWR, commons) is dist
+    assert get_rating_distribution(table, CARD_OHWR) is not dist
+    # Missing values are left out
+    assert len(get_rating_distribution(table, CARD_GIHWR)) == 0
+    clear_distribution_cache("a.csv")
+    assert get_rating_distribution(table, CARD_OHWR, commons) is not dist
+
+
+def test_update_replaces_one_value():
+    dist = RatingDistribution([1.0, 2.0, 3.0, 4.0])
+    assert dist.thresholds(2) == [3.0]
+    dist.update(2.0, 5.0)
+    assert dist.values == [1.0, 3.0, 4.0, 5.0]
+    assert dist.thresholds(2) == [4.0]
+    dist.update(None, 0.5)
+    dist.update(3.0, None)
+    assert dist.values == [0.5, 1.0, 4.0, 5.0]
@@ -0,0 +1,96 @@
+import random
+
+import pytest
+
+from config import CARD_OHWR
+from src.cards import PackGenerator, PackSlot
+from src.draft import (
+    POD_SEATS,
+    ColorPolicy,
+    PodDraft,
+    make_policies,
+    pool_score,
+    simulate_pods,
+)
+from src.index import CardIndex
+from src.table import CardTable
+
+
+def make_generator(seed=1):
+    rows = [
+        [f"C{i}", "WUBRG"[i % 5], "C", f"{40 + (i * 7) % 25}.{i % 10}%"]
+        for i in range(60)
+    ]
+    table = CardTable.from_rows(["Name", "Color", "Rarity", CARD_OHWR], rows)
+    return PackGenerator(CardIndex(table), [PackSlot("C", 5)], seed=seed)
+
+
+def test_bot_pod_drafts_every_card():
+    generator = make_generator()
+    policies = make_policies(generator, ["rating", "colors"] * 4, CARD_OHWR)
+    pools = PodDraft(generator, policies, num_packs=3).run()
+    assert [len(pool) for pool in pools] == [15] * POD_SEATS
+
+
+def test_packs_pass_left_then_right():
+    generator = make_generator()
+    draft = PodDraft(generator, make_policies(generator, ["random"] * 4, CARD_OHWR))
+    draft._open_packs()
+    opened = [list(pack) for pack in draft.packs]
+    draft._bots_pick_and_pass()
+    # Pack 1 goes left: seat 1 now holds what is left of seat 0's pack
+    assert set(draft.packs[1]) < set(opened[0])
+    while draft.packs is not None:
+        draft._bots_pick_and_pass()
+    draft._open_packs()
+    opened = [list(pack) for pack in draft.packs]
+    draft._bots_pick_and_pass()
+    assert set(draft.packs[0]) < set(opened[1])
+
+
+def test_human_seat_is_scored_per_pick():
+    generator = make_generator()
+    names = [None] + ["rating"] * (POD_SEATS - 1)
+    draft = PodDraft(generator, make_policies(generator, names, CARD_OHWR))
+    ranks = [generator.table.value(i, CARD_OHWR) for i in range(60)]
+    picks = 0
+    while (pack := draft.next_pack()) is not None:
+        best = max(range(len(pack)), key=lambda i: ranks[pack[i]])
+        # Take the best card in odd picks and another one in even picks
+        position = best + 1 if picks % 2 == 0 else (best + 1) % len(pack) + 1
+        result = draft.pick(position)
+        picks += 1
+        assert result[0] == picks and result[2] == (position == best + 1)
+    assert draft.complete and picks == draft.max_score == 15
+    assert draft.score == sum(result[2] for result in draft.results)
+    assert len(draft.pools[0]) == 15
+    with pytest.raises(ValueError):
+        draft.pick(1)
+
+
+def test_color_policy_follows_its_colors():
+    ranks = [50.0, 60.0, 55.0, 58.0]
+    colors = [frozenset("G"), frozenset("R"), frozenset("G"), frozenset()]
+    policy = ColorPolicy(ranks, colors, bonus=10.0, commit_after=1)
+    # A green pool takes the green card over the better red one
+    assert policy.pick([1, 2], [0], random.Random(0)) == 1
+    # Colorless cards fit any pool
+    assert policy.pick([1, 3], [0], random.Random(0)) == 1
+    # A new, empty pool starts over with the best card
+    assert policy.pick([1, 2], [], random.Random(0)) == 0
+
+
+def test_simulated_pods_do_not_depend_on_workers():
+    names = ["rating", "random"] * 4
+    generator = make_generator()
+    state = generator.rng.getstate()
+    serial = simulate_pods(generator, names, 6, seed=3, chunk_size=2)
+    assert generator.rng.getstate() == state
+    parallel = simulate_pods(
+        make_generator(), names, 6, seed=3, chunk_size=2, workers=2
+    )
+    assert serial == parallel
+    assert serial["rating"].seats == 24
+    assert serial["rating"].mean_score > serial["random"].mean_score
+    assert serial["rating"].mean_win_rate > serial["random"].mean_win_rate
+    assert pool_score([0, 1], [50.0, float("-inf")]) == 50.0
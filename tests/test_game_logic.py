@@ -21,3 +21,31 @@ def test_evaluate_picks_some_incorrect():
     # results should include False entries with correct best name
     assert results[1][2] == False
     assert results[1][3] == "C"
+
+
+def test_evaluate_picks_batch_matches_single_pack():
+    import random
+    from src.game_logic import evaluate_picks_batch
+
+    rng = random.Random(5)
+    ratings = [rng.choice([50.0, 52.5, 55.0, 57.5, 60.0]) for _ in range(40)]
+    pack_size, n_picks, n_packs = 15, 5, 50
+    pack_ids, picks = [], []
+    for _ in range(n_packs):
+        pack_ids.extend(rng.sample(range(40), pack_size))
+        picks.extend(rng.randint(0, pack_size + 1) for _ in range(n_picks))
+
+    scores, correct = evaluate_picks_batch(pack_ids, picks, ratings, pack_size)
+    for p in range(n_packs):
+        pack = [
+            {"Name": str(i), "OH WR": ratings[i]}
+            for i in pack_ids[p * pack_size : (p + 1) * pack_size]
+        ]
+        lookup = {i + 1: card for i, card in enumerate(pack)}
+        order = sorted(pack, key=lambda c: c["OH WR"], reverse=True)
+        user = picks[p * n_picks : (p + 1) * n_picks]
+        score, results = evaluate_picks(user, lookup, order)
+        assert scores[p] == score
+        assert list(correct[p * n_picks : (p + 1) * n_picks]) == [
+            int(r[2]) for r in results
+        ]
@@ -0,0 +1,60 @@
+from datetime import date
+
+import pytest
+
+from src.history import RatingHistory, get_history_path
+from config import CARD_OHWR, CARD_GIHWR, CARD_NGIH
+
+
+def write_snapshot(set_dir, day, rows):
+    lines = ["Name,Color,Rarity,# GIH,GIH WR,OH WR\n"]
+    lines += [f"{name},G,C,{n},{gih},{oh}\n" for name, n, gih, oh in rows]
+    (set_dir / f"card-ratings-{day}.csv").write_text("".join(lines))
+
+
+@pytest.fixture
+def set_dir(tmp_path, monkeypatch):
+    set_dir = tmp_path / "resources" / "sets" / "fin"
+    set_dir.mkdir(parents=True)
+    monkeypatch.chdir(tmp_path)
+    write_snapshot(set_dir, "2025-06-01", [("Foo", 10, "50.0%", "51.0%")])
+    write_snapshot(
+        set_dir,
+        "2025-06-09",
+        [("Foo", 20, "53.5%", "52.0%"), ("Bar", 5, "", "48.0%")],
+    )
+    return set_dir
+
+
+def test_ingest_and_query(set_dir):
+    history = RatingHistory.for_set("fin")
+    assert history.ingest("fin") == [date(2025, 6, 1), date(2025, 6, 9)]
+    assert history.trajectory("Foo") == [
+        (date(2025, 6, 1), 51.0),
+        (date(2025, 6, 9), 52.0),
+    ]
+    # Missing values are left out of trajectories
+    assert history.trajectory("Bar", CARD_GIHWR) == []
+    assert history.value("Foo", date(2025, 6, 9), CARD_NGIH) == 20.0
+    assert history.value("Bar", date(2025, 6, 1)) is None
+    assert history.movers(CARD_GIHWR, threshold=2.0) == [("Foo", 50.0, 53.5)]
+    assert history.movers(CARD_OHWR, threshold=2.0) == []
+
+
+def test_ingest_is_incremental_and_persistent(set_dir):
+    history = RatingHistory.for_set("fin")
+    history.ingest("fin")
+    size = (set_dir / "history.bin").stat().st_size
+    assert history.ingest("fin") == []
+    assert (set_dir / "history.bin").stat().st_size == size
+
+    # A new CSV is appended without touching older chunks
+    write_snapshot(set_dir, "2025-06-05", [("Foo", 15, "51.0%", "51.5%")])
+    reopened = RatingHistory(get_history_path("fin"))
+    assert reopened.ingest("fin") == [date(2025, 6, 5)]
+    again = RatingHistory.for_set("fin")
+    assert again.dates == [date(2025, 6, 1), date(2025, 6, 5), date(2025, 6, 9)]
+    assert [v for _, v in again.trajectory("Foo")] == [51.0, 51.5, 52.0]
+    # The baseline for movers is the newest snapshot at least a week older
+    assert again.movers(CARD_GIHWR, threshold=0.5, days=7) == [("Foo", 50.0, 53.5)]
+    assert again.movers(CARD_GIHWR, threshold=0.5, days=4) == [("Foo", 51.0, 53.5)]
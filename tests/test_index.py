@@ -0,0 +1,63 @@
+from src.index import CardIndex, iter_row_ids
+from src.table import CardTable
+from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR
+
+
+def make_table():
+    rows = [
+        ["A", "W", "C", "50%"],
+        ["B", "WU", "U", "51%"],
+        ["C", "", "C", "52%"],
+        ["D", "R", "R", "53%"],
+        ["E", "G", "U", "54%"],
+    ]
+    return CardTable.from_rows([CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR], rows)
+
+
+def names(index, bitmap):
+    return [c[CARD_NAME] for c in index.rows(bitmap)]
+
+
+def test_iter_row_ids():
+    assert list(iter_row_ids(0)) == []
+    assert list(iter_row_ids(0b10110)) == [1, 2, 4]
+
+
+def test_select_by_rarity_and_exclude():
+    index = CardIndex(make_table(), exclude={"E"})
+    selected = index.select(rarities=["C", "U"])
+    assert names(index, selected) == ["A", "B", "C"]
+    assert index.rarity_counts(["C", "U"], selected) == {"C": 2, "U": 1}
+    everything = index.select(rarities=["C", "U"], include_excluded=True)
+    assert index.count(everything) == 4
+
+
+def test_select_by_color():
+    index = CardIndex(make_table())
+    assert names(index, index.select(colors=["W"])) == ["A", "B"]
+    assert names(index, index.select(colors=["M"])) == ["B"]
+    assert names(index, index.select(colors=["C", "R"])) == ["C", "D"]
+    assert names(index, index.select(rarities=["U"], colors=["U", "G"])) == ["B", "E"]
+
+
+def test_unknown_keys_select_nothing():
+    index = CardIndex(make_table())
+    assert index.select(rarities=["M"]) == 0
+    assert index.rarity_counts(["M"], index.all) == {"M": 0}
+
+
+def test_select_and_exclude_by_set():
+    first = CardTable.from_rows(
+        [CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR],
+        [["A", "W", "C", "50%"], ["B", "U", "C", "51%"]],
+        set_name="fin",
+    )
+    second = CardTable.from_rows(
+        [CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR],
+        [["A", "W", "C", "52%"]],
+        set_name="eoe",
+    )
+    index = CardIndex(CardTable.concat([first, second]))
+    index.exclude({"A"}, set_name="fin")
+    assert names(index, index.select()) == ["B", "A"]
+    assert names(index, index.select(sets=["eoe"])) == ["A"]
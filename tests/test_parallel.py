@@ -0,0 +1,24 @@
+from src.parallel import chunk_rng, chunk_sizes, resolve_seed, run_chunks
+
+
+def draw(job):
+    seed, chunk, count = job
+    rng = chunk_rng(seed, chunk)
+    return [rng.random() for _ in range(count)]
+
+
+def test_chunk_sizes_cover_count():
+    assert chunk_sizes(7, 3) == [(0, 3), (1, 3), (2, 1)]
+    assert chunk_sizes(0, 3) == []
+
+
+def test_chunk_rng_streams_depend_on_seed_and_key():
+    assert chunk_rng(1, 0).random() == chunk_rng(1, 0).random()
+    assert chunk_rng(1, 0).random() != chunk_rng(1, 1).random()
+    assert chunk_rng(1, "a", 0).random() != chunk_rng(2, "a", 0).random()
+    assert isinstance(resolve_seed(None), int) and resolve_seed(5) == 5
+
+
+def test_run_chunks_does_not_depend_on_workers():
+    jobs = [(3, *chunk) for chunk in chunk_sizes(10, 4)]
+    assert list(run_chunks(draw, jobs)) == list(run_chunks(draw, jobs, workers=2))
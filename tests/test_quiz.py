@@ -59,3 +59,31 @@ def test_generate_questions(monkeypatch):
     # Questions should be instances of Question and correspond to first two cards
     assert all(isinstance(item, Question) for item in qs)
     assert [item.card for item in qs] == cards[:2]
+
+
+def test_make_question_with_seeded_rng_is_reproducible():
+    import random
+
+    card = {"v": 52.3}
+    first = make_question(card, "v", 45.0, 60.0, rng=random.Random(9))
+    second = make_question(card, "v", 45.0, 60.0, rng=random.Random(9))
+    assert first.options == second.options
+    assert first.correct_indices == second.correct_indices
+
+
+def test_quiz_engine_output_independent_of_workers():
+    import io
+    import json
+    from src.quiz import QuizEngine
+
+    cards = [{"Name": str(i), "v": 45.0 + i * 0.7} for i in range(20)]
+    engine = QuizEngine(cards, "v", seed=11, chunk_size=7)
+    serial, parallel = io.StringIO(), io.StringIO()
+    engine.write_jsonl(serial, 30)
+    engine.write_jsonl(parallel, 30, workers=2)
+    lines = serial.getvalue().splitlines()
+    assert len(lines) == 30
+    assert serial.getvalue() == parallel.getvalue()
+    record = json.loads(lines[0])
+    assert set(record) == {"card", "rating_key", "rating", "options", "correct_indices"}
+    assert engine.min_val == 45.0
@@ -0,0 +1,79 @@
+import random
+from collections import Counter
+
+import pytest
+
+from config import CARD_NAME, CARD_NGIH
+from src.quiz import QuizEngine, generate_questions
+from src.sampling import (
+    AliasTable,
+    FenwickSampler,
+    column_weights,
+    error_weights,
+)
+
+WEIGHTS = [1.0, 0.0, 3.0, 6.0]
+
+
+def draw_frequencies(draw, n=40000):
+    rng = random.Random(5)
+    counts = Counter(draw(rng) for _ in range(n))
+    return [counts[i] / n for i in range(len(WEIGHTS))]
+
+
+def test_alias_table_draws_in_proportion_to_weights():
+    alias = AliasTable(WEIGHTS)
+    frequencies = draw_frequencies(alias.draw)
+    assert frequencies[1] == 0.0
+    for frequency, weight in zip(frequencies, WEIGHTS):
+        assert abs(frequency - weight / 10) < 0.01
+    with pytest.raises(ValueError):
+        AliasTable([0.0, 0.0])
+
+
+def test_fenwick_sampler_draws_and_updates():
+    sampler = FenwickSampler(WEIGHTS)
+    assert sampler.total() == 10.0
+    frequencies = draw_frequencies(sampler.draw)
+    for frequency, weight in zip(frequencies, WEIGHTS):
+        assert abs(frequency - weight / 10) < 0.01
+    sampler.update(3, 0.0)
+    sampler.update(1, 4.0)
+    assert sampler.total() == 8.0
+    frequencies = draw_frequencies(sampler.draw)
+    assert frequencies[3] == 0.0 and abs(frequencies[1] - 0.5) < 0.01
+
+
+def test_fenwick_sample_without_replacement():
+    sampler = FenwickSampler(WEIGHTS)
+    rng = random.Random(1)
+    for _ in range(100):
+        drawn = sampler.sample(3, rng)
+        assert sorted(drawn) == [0, 2, 3]
+    # Weights are restored after every sample
+    assert sampler.weights == WEIGHTS and sampler.total() == 10.0
+    with pytest.raises(ValueError):
+        sampler.sample(4, rng)
+
+
+def test_weights_from_columns_and_errors():
+    cards = [
+        {CARD_NAME: "A", CARD_NGIH: 100},
+        {CARD_NAME: "B", CARD_NGIH: 0},
+        {CARD_NAME: "C", CARD_NGIH: 40},
+    ]
+    assert column_weights(cards, CARD_NGIH) == [100.0, 40.0, 40.0]
+    weights = error_weights(cards, {"A": (8, 0), "C": (2, 2)})
+    assert weights == [0.1, 0.5, 0.75]
+
+
+def test_weighted_question_generation_skips_zero_weights():
+    cards = [{CARD_NAME: str(i), "v": 45.0 + i} for i in range(10)]
+    weights = [1.0 if i % 2 else 0.0 for i in range(10)]
+    questions = generate_questions(
+        cards, "v", 45.0, 54.0, 5, rng=random.Random(2), weights=weights
+    )
+    assert sorted(int(q.card[CARD_NAME]) for q in questions) == [1, 3, 5, 7, 9]
+    engine = QuizEngine(cards, "v", seed=3, weights=weights)
+    drawn = {q.card[CARD_NAME] for q in engine.questions(200, engine.chunk_rng(0))}
+    assert drawn == {"1", "3", "5", "7", "9"}
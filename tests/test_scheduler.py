@@ -0,0 +1,62 @@
+import random
+
+from src.scheduler import (
+    GRADE_CORRECT,
+    GRADE_WRONG,
+    MIN_EASE,
+    SECONDS_PER_DAY,
+    ReviewScheduler,
+    ReviewState,
+)
+
+
+def make_scheduler(tmp_path):
+    return ReviewScheduler(str(tmp_path / "reviews.db"))
+
+
+def test_review_state_follows_sm2_intervals():
+    state = ReviewState()
+    intervals = []
+    for _ in range(3):
+        state = state.reviewed(GRADE_CORRECT, now=0.0)
+        intervals.append(state.interval)
+    assert intervals == [1.0, 6.0, 15.0]
+    lapsed = state.reviewed(GRADE_WRONG, now=100.0)
+    assert (lapsed.interval, lapsed.repetitions, lapsed.lapses) == (1.0, 0, 1)
+    assert lapsed.due == 100.0 + SECONDS_PER_DAY
+    assert lapsed.ease < state.ease
+    for _ in range(10):
+        lapsed = lapsed.reviewed(0, now=0.0)
+    assert lapsed.ease == MIN_EASE
+
+
+def test_select_prefers_due_then_unseen_then_soonest(tmp_path):
+    keys = [("fin", f"Card {i}") for i in range(6)]
+    with make_scheduler(tmp_path) as scheduler:
+        # Card 0 and 1 are due (1 most overdue), 2 and 3 are scheduled later
+        scheduler.review("ann", keys[0], GRADE_WRONG, now=0.0)
+        scheduler.review("ann", keys[1], GRADE_WRONG, now=-SECONDS_PER_DAY)
+        scheduler.review("ann", keys[2], GRADE_CORRECT, now=9 * SECONDS_PER_DAY)
+        scheduler.review("ann", keys[3], GRADE_CORRECT, now=5 * SECONDS_PER_DAY)
+        # Another learner's reviews and other sets never leak in
+        scheduler.review("bob", keys[4], GRADE_WRONG, now=0.0)
+        scheduler.review("ann", ("eoe", "Card 4"), GRADE_WRONG, now=0.0)
+
+        now = 2 * SECONDS_PER_DAY
+        rng = random.Random(0)
+        assert scheduler.select("ann", keys, 2, rng, now) == [1, 0]
+        assert sorted(scheduler.select("ann", keys, 4, rng, now)[2:]) == [4, 5]
+        assert scheduler.select("ann", keys, 6, rng, now)[4:] == [3, 2]
+        assert scheduler.state("bob", keys[0]) is None
+
+
+def test_select_queries_do_not_grow_with_cards(tmp_path):
+    keys = [("fin", f"Card {i}") for i in range(500)]
+    with make_scheduler(tmp_path) as scheduler:
+        for key in keys[:490]:
+            scheduler.review("ann", key, GRADE_CORRECT, now=0.0)
+        statements = []
+        scheduler.conn.set_trace_callback(statements.append)
+        chosen = scheduler.select("ann", keys, 10, random.Random(0), now=0.0)
+        assert sorted(chosen) == list(range(490, 500))
+        assert len(statements) <= 3
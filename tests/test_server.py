@@ -0,0 +1,127 @@
+import asyncio
+import json
+
+import pytest
+
+from config import CARD_OHWR
+from src.distribution import RatingDistribution
+from src.server import QuizServer
+from src.session import correct_option
+
+
+def make_server(seed=0):
+    cards = [
+        {"Name": f"Card {i}", "Color": "G", "Rarity": "C", CARD_OHWR: 50.0 + i}
+        for i in range(8)
+    ]
+    distribution = RatingDistribution.from_cards(cards, CARD_OHWR)
+    return QuizServer(cards, CARD_OHWR, distribution, seed=seed)
+
+
+def test_dispatch_reports_rounds_and_completion():
+    server = make_server()
+    response = server.dispatch(1, {"op": "start", "questions": 2})
+    assert [r["label"] for r in response["ranges"]] == ["bad", "okay", "good", "great"]
+    session = server.sessions[1]
+    while response["question"] is not None:
+        card, options = session.remaining[session.position]
+        right = correct_option(server.ratings[card], session.thresholds, options)
+        response = server.dispatch(1, {"op": "answer", "choice": right})
+    assert response["summary"] == {"round": 1, "percent_correct": 100.0}
+    assert response["complete"] and not response["offer_retry"]
+    assert server.dispatch(1, {"op": "retry"})["question"]["round"] == 1
+    with pytest.raises(ValueError):
+        server.dispatch(2, {"op": "answer", "choice": 0})
+    # Non-integer numbers are refused rather than converted
+    for bad in (1e999, 1.5, True, "1"):
+        with pytest.raises(ValueError):
+            server.dispatch(1, {"op": "start", "questions": bad})
+        with pytest.raises(ValueError):
+            server.dispatch(1, {"op": "answer", "choice": bad})
+
+
+def test_refresh_between_sessions_keeps_running_sessions():
+    updates = []
+    server = make_server()
+    server.refresh = lambda: updates.pop() if updates else None
+    server.refresh_interval = 0.0
+    server.dispatch(1, {"op": "start", "questions": 2})
+    old_cards = server.sessions[1].cards
+    new_cards = [
+        {"Name": f"New {i}", "Color": "R", "Rarity": "U", CARD_OHWR: 40.0 + i}
+        for i in range(4)
+    ]
+    updates.append((new_cards, RatingDistribution.from_cards(new_cards, CARD_OHWR)))
+    assert asyncio.run(server.reload()) is True
+    response = server.dispatch(2, {"op": "start", "questions": 2})
+    assert response["question"]["card"]["name"].startswith("New")
+    assert response["ranges"][0]["low"] == 40.0
+    # The session started before the refresh still answers from its own cards
+    assert server.sessions[1].cards is old_cards
+    assert server.dispatch(1, {"op": "answer", "choice": 0})["question"] is not None
+    # Nothing new: the current cards stay
+    assert asyncio.run(server.reload()) is False
+    assert server.cards[0]["name"] == "New 0"
+
+
+def test_refresh_is_throttled_and_failures_keep_serving():
+    calls = []
+
+    def refresh():
+        calls.append(1)
+        raise OSError("disk gone")
+
+    server = make_server()
+    server.refresh = refresh
+    assert asyncio.run(server.reload()) is False
+    assert asyncio.run(server.reload()) is False
+    assert len(calls) == 1 and server.cards[0]["name"] == "Card 0"
+
+
+def test_server_round_trip_over_tcp():
+    async def play():
+        server = make_server()
+        listener = await server.start_server("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+        async def request(message):
+            writer.write(json.dumps(message).encode() + b"\n")
+            return json.loads(await reader.readline())
+
+        started = await request({"op": "start", "questions": 2, "difficulty": "easy"})
+        answered = await request({"op": "answer", "choice": 0})
+        error = await request({"op": "bogus"})
+        overflow = await request({"op": "answer", "choice": 1e999})
+        writer.write(b'{"op": "quit"}\n')
+        await reader.read()
+        listener.close()
+        await listener.wait_closed()
+        return server, started, answered, error, overflow
+
+    server, started, answered, error, overflow = asyncio.run(play())
+    assert started["ok"] and len(started["question"]["options"]) == 3
+    assert answered["ok"] and "correct" in answered
+    assert not error["ok"] and "bogus" in error["error"]
+    assert not overflow["ok"] and "integer" in overflow["error"]
+    # Sessions are dropped when the learner disconnects
+    assert server.sessions == {}
+
+
+def test_overlong_request_line_is_answered_and_closed():
+    async def play():
+        server = make_server()
+        listener = await server.start_server("127.0.0.1", 0)
+        port = listener.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b'{"op": "start", "pad": "' + b"x" * 100_000 + b'"}\n')
+        response = json.loads(await reader.readline())
+        closed = await reader.read() == b""
+        writer.close()
+        listener.close()
+        await listener.wait_closed()
+        return server, response, closed
+
+    server, response, closed = asyncio.run(play())
+    assert not response["ok"] and "too long" in response["error"]
+    assert closed and server.sessions == {}
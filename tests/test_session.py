@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+from config import CARD_OHWR
+from src.cards import PackGenerator, PackSlot
+from src.index import CardIndex
+from src.session import DraftSession, QuizSession, correct_option
+from src.table import CardTable
+
+
+def make_session(num_questions=3, seed=0):
+    cards = [{"Name": f"Card {i}", CARD_OHWR: 50.0 + i} for i in range(8)]
+    ratings = [card[CARD_OHWR] for card in cards]
+    thresholds = [52.0, 54.0, 56.0]
+    return QuizSession(cards, ratings, thresholds, num_questions, random.Random(seed))
+
+
+def right_choice(session, prompt):
+    value = prompt.card[CARD_OHWR]
+    return correct_option(value, session.thresholds, prompt.options)
+
+
+def test_correct_option_merges_removed_segments():
+    thresholds = [52.0, 54.0, 56.0]
+    assert correct_option(53.0, thresholds, (0, 1, 2, 3)) == 1
+    # Without "okay" its range belongs to the next offered segment
+    assert correct_option(53.0, thresholds, (0, 2, 3)) == 1
+    # Without the top segment the last offered one takes everything above
+    assert correct_option(57.0, thresholds, (0, 1, 2)) == 2
+
+
+def test_quiz_session_repeats_wrong_answers_without_chosen_option():
+    session = make_session()
+    first_round = []
+    for _ in range(3):
+        prompt = session.next_question()
+        first_round.append(prompt.card["Name"])
+        wrong = (right_choice(session, prompt) + 1) % len(prompt.options)
+        result = session.answer(wrong)
+        assert not result.correct
+    assert result.summary.round == 1 and result.summary.percent_correct == 0
+
+    prompt = session.next_question()
+    assert (prompt.round, prompt.number, prompt.of) == (2, 1, 3)
+    assert len(prompt.options) == 3
+    while (prompt := session.next_question()) is not None:
+        result = session.answer(right_choice(session, prompt))
+    assert result.summary.round == 2 and result.summary.correct == 3
+    assert session.complete and session.offer_retry
+
+    session.retry()
+    assert not session.offer_retry
+    retried = {session.cards[card]["Name"] for card, _ in session.remaining}
+    assert retried == set(first_round)
+    with pytest.raises(ValueError):
+        session.answer(4)
+
+    session.retry(selected=[7, 0])
+    assert [card for card, _ in session.remaining] == [7, 0]
+    assert session.next_question().options == (0, 1, 2, 3)
+
+
+def test_draft_session_scores_each_pack():
+    rows = [[f"C{i}", "G", "C", f"{40 + i}%"] for i in range(6)]
+    table = CardTable.from_rows(["Name", "Color", "Rarity", CARD_OHWR], rows)
+    generator = PackGenerator(CardIndex(table), [PackSlot("C", 6)], seed=1)
+    session = DraftSession(generator, num_packs=2, picks_per_pack=2)
+
+    def best_positions():
+        pack = session.next_pack()
+        order = sorted(range(6), key=lambda i: pack[i][CARD_OHWR], reverse=True)
+        return [order[0] + 1, order[1] + 1]
+
+    assert session.next_pack() is session.next_pack()
+    result = session.pick(best_positions())
+    assert result.score == 2 and result.pack == 1
+    # Right cards in the wrong order score nothing
+    session.pick(best_positions()[::-1])
+    assert session.complete and session.next_pack() is None
+    assert (session.score, session.max_score) == (2, 4)
+    with pytest.raises(ValueError):
+        session.pick([1, 2])
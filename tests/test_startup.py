@@ -0,0 +1,68 @@
+import os
+import subprocess
+import sys
+import time
+from datetime import date
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+# Wall-clock budget from launch to the first question, generous for slow CI
+STARTUP_BUDGET_SECONDS = 2.0
+# Modules only subcommands need; importing any of them on the quiz path is a regression
+DEFERRED_MODULES = {
+    "asyncio",
+    "sqlite3",
+    "concurrent.futures",
+    "multiprocessing",
+    "src.server",
+    "src.scheduler",
+    "src.quiz",
+    "src.history",
+    "src.stats",
+}
+
+
+def write_today_set(root, count=300):
+    set_dir = root / "resources" / "sets" / "om1"
+    set_dir.mkdir(parents=True)
+    lines = ["Name,Color,Rarity,OH WR\n"]
+    lines += [
+        f"Card {i},{'WUBRG'[i % 5]},{'CU'[i % 2]},{45 + i % 20}.5%\n"
+        for i in range(count)
+    ]
+    (set_dir / f"card-ratings-{date.today()}.csv").write_text("".join(lines))
+    return set_dir
+
+
+def run_quiz_until_first_question(cwd):
+    """Run the quiz with -X importtime and no input; it exits at the first prompt."""
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "main.py")],
+        cwd=cwd,
+        env={**os.environ, "PYTHONPATH": str(ROOT)},
+        stdin=subprocess.DEVNULL,
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+    elapsed = time.perf_counter() - started
+    imported = {
+        line.split("|")[-1].strip()
+        for line in proc.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    return proc.stdout, imported, elapsed
+
+
+def test_quiz_startup_defers_subcommand_imports_and_stays_in_budget(tmp_path):
+    set_dir = write_today_set(tmp_path)
+    # First run parses the CSV and writes the cache the measured run loads
+    run_quiz_until_first_question(tmp_path)
+    assert list(set_dir.glob("*.cache"))
+
+    stdout, imported, elapsed = run_quiz_until_first_question(tmp_path)
+    assert "\n1. " in stdout
+    assert "src.session" in imported
+    assert not DEFERRED_MODULES & imported
+    assert elapsed < STARTUP_BUDGET_SECONDS
@@ -0,0 +1,69 @@
+import pytest
+
+from config import CARD_OHWR
+from src.answer_log import AnswerLog
+from src.stats import answer_stats, worst_groups
+
+
+def make_log(tmp_path):
+    path = tmp_path / "ann.jsonl"
+    answers = [
+        # name, color, rarity, rating, difficulty, chosen, expected, round
+        ("Foo", "G", "C", 51.0, "medium", 1, 1, 1),
+        ("Foo", "G", "C", 51.0, "easy", 2, 1, 1),
+        ("Bar", "WU", "U", 58.0, "medium", 0, 3, 1),
+        ("Bar", "WU", "U", 58.0, "medium", 3, 3, 2),
+        ("Baz", "R", "C", 56.0, "hard", 4, 4, 1),
+    ]
+    with AnswerLog(str(path), batch_size=2) as log:
+        for name, color, rarity, rating, difficulty, chosen, expected, rnd in answers:
+            card = {"Name": name, "Color": color, "Rarity": rarity, CARD_OHWR: rating}
+            log.record_quiz(
+                card, "fin", CARD_OHWR, difficulty, 4, chosen, expected, 1.0, rnd
+            )
+        log.record_picks([(1, "Baz", True)], [2], [card], "fin", CARD_OHWR, 2.0)
+    return str(path)
+
+
+def test_answer_stats_groups_first_round_answers(tmp_path):
+    path = make_log(tmp_path)
+    stats = answer_stats(path, ["card", "color", "rarity", "difficulty", "band"])
+    assert (stats["card"]["Foo"].answers, stats["card"]["Foo"].correct) == (2, 1)
+    # The retried round of Bar is left out
+    assert stats["card"]["Bar"].answers == 1
+    assert stats["card"]["Bar"].mean_error == -3
+    # Colors are grouped the way the terminal prints them
+    assert set(stats["color"]) == {"green", "yellow", "red"}
+    assert stats["rarity"]["C"].accuracy == pytest.approx(200 / 3)
+    assert stats["difficulty"]["easy"].error == 1
+    assert set(stats["band"]) == {"50.0-52.5", "57.5-60.0", "55.0-57.5"}
+
+    everything = answer_stats(path, ["card"], first_round_only=False)
+    assert everything["card"]["Bar"].answers == 2
+    picks = answer_stats(path, ["rarity"], kind="pick")
+    assert (picks["rarity"]["C"].answers, picks["rarity"]["C"].correct) == (1, 1)
+
+
+def test_answer_stats_reads_new_answers_after_rollup(tmp_path):
+    path = make_log(tmp_path)
+    answer_stats(path, ["card"])
+    with AnswerLog(path) as log:
+        card = {"Name": "Qux", "Color": "", "Rarity": "M", CARD_OHWR: 60.0}
+        log.record_quiz(card, "fin", CARD_OHWR, "medium", 4, 3, 2, 1.0)
+    stats = answer_stats(path, ["color", "card"])
+    assert stats["color"]["magenta"].answers == 1
+    assert stats["card"]["Foo"].answers == 2
+
+
+def test_worst_groups_orders_by_accuracy():
+    from src.stats import GroupStats
+
+    groups = {
+        "a": GroupStats(10, 9, 0),
+        "b": GroupStats(10, 2, 0),
+        "c": GroupStats(1, 0, 0),
+    }
+    assert [label for label, _ in worst_groups(groups, min_answers=2)] == ["b", "a"]
+    assert worst_groups(groups, limit=1)[0][0] == "c"
+    with pytest.raises(ValueError):
+        answer_stats("missing.jsonl", ["colour"])
@@ -0,0 +1,93 @@
+import math
+import sys
+import pytest
+
+from src.table import CardTable, CardRow, parse_rating, parse_count
+from config import CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_OHWR, CARD_GIHWR, CARD_NGIH
+
+
+def make_table():
+    header = [CARD_NAME, CARD_COLOR, CARD_RARITY, CARD_NGIH, CARD_GIHWR, CARD_OHWR]
+    rows = [
+        ["Foo", "G", "C", "1200", "55.5%", "54.0%"],
+        ["Bar", "WU", "U", "", "", "60.1%"],
+    ]
+    return CardTable.from_rows(header, rows, source="x.csv", set_name="fin")
+
+
+def test_parse_rating_and_count():
+    assert parse_rating("55.2%") == 55.2
+    assert parse_rating("3.1pp") == 3.1
+    assert math.isnan(parse_rating(""))
+    assert parse_count("1234") == 1234
+    assert parse_count("") == 0
+
+
+def test_columns_are_typed():
+    table = make_table()
+    assert len(table) == 2
+    assert table.column(CARD_OHWR).typecode == "d"
+    assert table.column(CARD_NGIH).typecode == "q"
+    assert table.column(CARD_NAME) == ["Foo", "Bar"]
+    # Rarity strings are interned so repeated values share storage
+    assert table.column(CARD_RARITY)[0] is sys.intern("C")
+
+
+def test_row_behaves_like_card_dict():
+    table = make_table()
+    row = table[1]
+    assert isinstance(row, CardRow)
+    assert row[CARD_NAME] == "Bar"
+    assert row[CARD_OHWR] == 60.1
+    # Missing float cells read as None
+    assert row[CARD_GIHWR] is None
+    assert row.get("Nope", "default") == "default"
+    with pytest.raises(KeyError):
+        row["Nope"]
+    assert row.to_dict()[CARD_COLOR] == "WU"
+
+
+def test_row_identity_and_extra_values():
+    table = make_table()
+    assert table[0] == table[0]
+    assert table[0] != table[1]
+    assert len({table[0], table[0], table[1]}) == 2
+    table[0]["PackIndex"] = 3
+    assert table[0]["PackIndex"] == 3
+    assert "PackIndex" not in table[1]
+
+
+def test_empty_table():
+    table = CardTable.from_rows([CARD_NAME, CARD_OHWR], [])
+    assert len(table) == 0
+    assert list(table) == []
+
+
+def test_binary_round_trip():
+    table = make_table()
+    restored, meta = CardTable.from_bytes(table.to_bytes({"size": 10}))
+    assert meta == {"size": 10}
+    assert restored.source == "x.csv" and restored.set_name == "fin"
+    assert [r.to_dict() for r in restored] == [r.to_dict() for r in table]
+    assert restored[1][CARD_GIHWR] is None
+
+
+def test_from_bytes_rejects_other_data():
+    with pytest.raises(ValueError):
+        CardTable.from_bytes(b"NOPE" + bytes(8))
+
+
+def test_concat_tags_rows_with_set_code():
+    first = make_table()
+    second = CardTable.from_rows(
+        [CARD_NAME, CARD_RARITY, CARD_OHWR], [["Baz", "C", "50%"]], set_name="eoe"
+    )
+    merged = CardTable.concat([first, second])
+    assert len(merged) == 3
+    assert [r["Set"] for r in merged] == ["fin", "fin", "eoe"]
+    assert merged[2][CARD_NAME] == "Baz"
+    # Columns the second table lacks are filled as missing
+    assert merged[2][CARD_COLOR] == ""
+    assert merged[2][CARD_GIHWR] is None
+    assert merged[2][CARD_NGIH] == 0
+    assert merged.set_name == "fin+eoe"